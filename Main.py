@@ -1,18 +1,48 @@
 import os
+import asyncio
 from fastapi import FastAPI
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from starlette.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
+from config.detection import DETECT_JOB_WORKERS, INFERENCE_WARMUP_BACKGROUND
+from inference.InferenceExecutor import shutdown_executor
+from ingest.Downloader import close_client
+from ingest.UploadSizeLimit import UploadSizeLimitMiddleware
+from starlette.concurrency import run_in_threadpool
+from services.impl.DetectServiceImpl import warm_up_model
+from workers.DetectionWorker import start_workers, stop_workers
 from routers import UserRouter, AuthRouter, MailClickRouter, VideoRouter, DetectRouter, PredictionRouter
 
 load_dotenv(".env")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_up_task = None
+    if INFERENCE_WARMUP_BACKGROUND:
+        # Serve right away, detections arriving before the model is loaded wait for it
+        warm_up_task = asyncio.create_task(run_in_threadpool(warm_up_model))
+    else:
+        # Startup only completes, and the server only accepts connections, once the model is warm
+        await run_in_threadpool(warm_up_model)
+    job_workers = start_workers(DETECT_JOB_WORKERS)
+    yield
+    if warm_up_task is not None:
+        # A warm-up thread cannot be interrupted, let it finish before the process exits under it
+        await warm_up_task
+    await stop_workers(job_workers)
+    await close_client()
+    shutdown_executor()
+
+
 app = FastAPI(
     title="Deepfake Detection API",
     description="Meet Rajpal",
     docs_url=os.getenv("DOCS"),
     redoc_url=os.getenv("REDOC"),
     openapi_url=os.getenv("OPENAPI"),
+    lifespan=lifespan,
     middleware=[
         Middleware(
             CORSMiddleware,
@@ -20,7 +50,8 @@ app = FastAPI(
             allow_credentials=True,
             allow_methods=["*"],
             allow_headers=["*"],
-        )
+        ),
+        Middleware(UploadSizeLimitMiddleware),
     ],
 )
 
@@ -0,0 +1,118 @@
+"""
+Per-frame PIL transforms vs the vectorized clip preprocessing, with an output parity check.
+
+Turns the same crops into the model input both ways: the transforms pipeline preprocess_frames used before
+(ToPILImage -> Resize -> ToTensor -> Normalize per frame, then stack and permute) and face_pixels + clip_tensor
+writing into a pooled buffer. Crops are the MTCNN faces of the given videos (frames without a face fall back to the
+resized frame, as in a detection) plus --random-clips seeded clips of float faces in [-1, 1] with some frames
+missing a face. Reports the median time of both paths, excluding face detection, and the largest difference
+between their outputs; the run fails when that is above --max-diff.
+
+Usage: python -m benchmarks.ClipPreprocessingBenchmark [video.mp4 ...] [--random-clips 8] [--repeats 20]
+                                                       [--max-diff 1e-6]
+"""
+import sys
+import cv2
+import time
+import torch
+import argparse
+import statistics
+import numpy as np
+from torchvision import transforms
+from inference.FrameSampler import sample_frames
+from inference.FaceExtractor import extract_faces
+from inference.DeepfakeModel import INPUT_SIZE, CLIP_LENGTH
+from inference.impl.MtcnnFaceDetector import MtcnnFaceDetector
+from inference.ClipTensor import ClipBufferPool, face_pixels, clip_tensor
+
+MEAN = [0.45, 0.45, 0.45]
+STD = [0.225, 0.225, 0.225]
+
+transform = transforms.Compose([
+    transforms.ToPILImage(),
+    transforms.Resize(INPUT_SIZE),
+    transforms.ToTensor(),
+    transforms.Normalize(mean=MEAN, std=STD)
+])
+
+
+def per_frame(frames, faces):
+    processed = [transform(cv2.resize(frame, INPUT_SIZE) if face is None else face)
+                 for frame, face in zip(frames, faces)]
+    return torch.stack(processed).permute(1, 0, 2, 3).unsqueeze(0)
+
+
+def vectorized(frames, faces, pool):
+    detected = [i for i, face in enumerate(faces) if face is not None]
+    crops = np.empty((len(frames), *INPUT_SIZE, 3), dtype=np.uint8)
+    crops[detected] = face_pixels(np.stack([faces[i] for i in detected]))
+    for i, (frame, face) in enumerate(zip(frames, faces)):
+        if face is None:
+            crops[i] = cv2.resize(frame, INPUT_SIZE)
+    return clip_tensor(crops, pool.acquire(), MEAN, STD)
+
+
+def random_clip(generator):
+    frames = [generator.integers(0, 256, (360, 640, 3), dtype=np.uint8) for _ in range(CLIP_LENGTH)]
+    faces = [None if generator.random() < 0.25 else
+             generator.uniform(-1, 1, (*INPUT_SIZE, 3)).astype(np.float32) for _ in range(CLIP_LENGTH)]
+    faces[0] = generator.uniform(-1, 1, (*INPUT_SIZE, 3)).astype(np.float32)
+    return frames, faces
+
+
+def video_clips(videos):
+    face_detector = MtcnnFaceDetector(INPUT_SIZE[0], 20, "cpu")
+    for video in videos:
+        frames = sample_frames(video, CLIP_LENGTH)
+        faces = extract_faces(face_detector, frames)
+        if any(face is not None for face in faces):
+            yield frames, faces
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="*")
+    parser.add_argument("--random-clips", type=int, default=8)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--max-diff", type=float, default=1e-6, help="largest output difference allowed")
+    args = parser.parse_args()
+
+    generator = np.random.default_rng(0)
+    clips = list(video_clips(args.videos)) + [random_clip(generator) for _ in range(args.random_clips)]
+    pool = ClipBufferPool((1, 3, CLIP_LENGTH, *INPUT_SIZE), 1, "cpu")
+
+    max_diff = 0.0
+    per_frame_times, vectorized_times = [], []
+    for frames, faces in clips:
+        reference = per_frame(frames, faces)
+        clip = vectorized(frames, faces, pool)
+        max_diff = max(max_diff, (reference - clip).abs().max().item())
+        pool.release(clip)
+
+        per_frame_times.append(median_ms(lambda: per_frame(frames, faces), args.repeats))
+
+        def run_vectorized():
+            pool.release(vectorized(frames, faces, pool))
+        vectorized_times.append(median_ms(run_vectorized, args.repeats))
+
+    per_frame_ms, vectorized_ms = statistics.median(per_frame_times), statistics.median(vectorized_times)
+    print(f"{len(clips)} clips ({len(clips) - args.random_clips} from videos), {torch.get_num_threads()} threads")
+    print(f"per-frame transforms {per_frame_ms:8.2f} ms per clip")
+    print(f"vectorized           {vectorized_ms:8.2f} ms per clip ({per_frame_ms / vectorized_ms:.1f}x)")
+    print(f"max output difference {max_diff:.3g}")
+    if max_diff > args.max_diff:
+        print(f"output differs by more than {args.max_diff}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
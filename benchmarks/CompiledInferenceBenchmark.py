@@ -0,0 +1,83 @@
+"""
+Eager vs traced vs torch.compile'd MViT-v2-S forward latency on CPU.
+
+Builds the detector architecture with random weights (latency does not depend on them), optimises it with each
+--modes entry through inference.CompiledModel and times --iterations forward passes per batch size after --warmup
+passes. The first call is reported on its own: that is what the first request pays without a startup warm-up.
+Outputs are compared with the eager model's on the same batch.
+
+Usage: python -m benchmarks.CompiledInferenceBenchmark [--modes eager,trace,compile] [--batch-sizes 1,4]
+                                                       [--iterations 20] [--warmup 2] [--threads 0]
+"""
+import time
+import torch
+import argparse
+import statistics
+from torchvision.models.video import mvit_v2_s
+from inference.CompiledModel import compile_model
+
+CLIP_SHAPE = (3, 16, 224, 224)
+
+
+def build_model():
+    torch.manual_seed(0)
+    model = mvit_v2_s(weights=None)
+    model.head = torch.nn.Sequential(torch.nn.Dropout(0.5), torch.nn.Linear(model.head[-1].in_features, 2))
+    return model.eval()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--modes", default="eager,trace,compile")
+    parser.add_argument("--batch-sizes", default="1,4")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads, 0 keeps the default")
+    args = parser.parse_args()
+
+    if args.threads > 0:
+        torch.set_num_threads(args.threads)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    model = build_model()
+    batches = {size: torch.randn(size, *CLIP_SHAPE) for size in batch_sizes}
+    with torch.no_grad():
+        references = {size: model(batch) for size, batch in batches.items()}
+
+    print(f"torch {torch.__version__}, {torch.get_num_threads()} threads")
+    print(f"{'mode':<8} {'batch':>5} {'build s':>8} {'first ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'clips/s':>8} "
+          f"{'max diff':>9}")
+    for mode in args.modes.split(","):
+        eager_model = build_model()
+        started = time.perf_counter()
+        forward_model = compile_model(eager_model, mode, batches[batch_sizes[0]][:1])
+        build_seconds = time.perf_counter() - started
+        if mode != "eager" and forward_model is eager_model:
+            print(f"{mode:<8} unavailable here, fell back to eager")
+            continue
+
+        for size, batch in batches.items():
+            with torch.no_grad():
+                started = time.perf_counter()
+                output = forward_model(batch)
+                first = time.perf_counter() - started
+                for _ in range(args.warmup):
+                    forward_model(batch)
+                timings = []
+                for _ in range(args.iterations):
+                    started = time.perf_counter()
+                    forward_model(batch)
+                    timings.append(time.perf_counter() - started)
+
+            p50 = statistics.median(timings)
+            difference = (output - references[size]).abs().max().item()
+            print(f"{mode:<8} {size:>5} {build_seconds:>8.1f} {first * 1000:>9.0f} {p50 * 1000:>9.0f} "
+                  f"{percentile(timings, 0.99) * 1000:>9.0f} {size / p50:>8.2f} {difference:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
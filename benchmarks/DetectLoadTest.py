@@ -0,0 +1,83 @@
+"""
+Checks that the rest of the API stays responsive while detections are running.
+
+Fires --detections concurrent direct uploads and, at the same time, keeps hitting a light endpoint (login and the
+prediction list). Latency of the light endpoint is reported idle and under detection load; with inference on the
+event loop the loaded numbers grow to the length of a whole detection.
+
+Usage: python -m benchmarks.DetectLoadTest --base-url http://localhost:9999 --username u --password p video.mp4
+"""
+import time
+import httpx
+import asyncio
+import argparse
+import statistics
+
+
+def summary(latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return f"n={len(latencies):<4} p50={statistics.median(latencies) * 1000:8.1f} ms " \
+           f"p95={p95 * 1000:8.1f} ms max={latencies[-1] * 1000:8.1f} ms"
+
+
+async def login(client, username, password):
+    response = await client.post("/api/v1/auth/login", data={"username": username, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def probe(client, username, password, token, stop, interval):
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await login(client, username, password)
+        await client.get("/api/v1/predictions", headers={"Authorization": f"Bearer {token}"})
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def detect(client, token, video, index):
+    with open(video, "rb") as file:
+        files = {"file": (f"loadtest_{index}_{time.time_ns()}.mp4", file.read(), "video/mp4")}
+    start = time.perf_counter()
+    response = await client.post("/api/v1/detect/direct-upload", files=files,
+                                 headers={"Authorization": f"Bearer {token}"})
+    return response.status_code, time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("video")
+    parser.add_argument("--base-url", default="http://localhost:9999")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--detections", type=int, default=4)
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    parser.add_argument("--interval", type=float, default=0.1)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=None) as client:
+        token = await login(client, args.username, args.password)
+
+        stop = asyncio.Event()
+        idle_probe = asyncio.create_task(probe(client, args.username, args.password, token, stop, args.interval))
+        await asyncio.sleep(args.idle_seconds)
+        stop.set()
+        idle = await idle_probe
+
+        stop = asyncio.Event()
+        loaded_probe = asyncio.create_task(probe(client, args.username, args.password, token, stop, args.interval))
+        detections = await asyncio.gather(*(detect(client, token, args.video, i) for i in range(args.detections)))
+        stop.set()
+        loaded = await loaded_probe
+
+    print(f"idle      {summary(idle)}")
+    print(f"detecting {summary(loaded)}")
+    for status, elapsed in detections:
+        print(f"detection status={status} took {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Face detection on full resolution frames vs on downscaled copies (FACE_DETECTION_MAX_SIDE), with a parity check.
+
+For every video runs MTCNN on the 16 sampled frames at full resolution (frame by frame) and then, batched, with
+each --max-sides value, the boxes mapped back and the faces cropped from the full frames either way. Reports the
+median detection time, faces missed or added by downscaling, the smallest box IoU against full resolution and the
+largest and mean difference of the face crops (float MTCNN output, range [-1, 1]). The run fails when a face is
+missed or added, or when a box IoU falls under --min-iou. For scale: re-encoding the frames as JPEG at quality 95
+already moves full resolution boxes to about 0.97 IoU and crops by about 0.04 on average.
+
+Usage: python -m benchmarks.DownscaledDetectionBenchmark video.mp4 [video.mp4 ...] [--max-sides 480,640,960]
+                                                         [--repeats 3] [--min-iou 0.8]
+"""
+import sys
+import time
+import argparse
+import statistics
+import numpy as np
+from inference.FrameSampler import sample_frames
+from inference.DeepfakeModel import INPUT_SIZE, CLIP_LENGTH
+from inference.impl.MtcnnFaceDetector import MtcnnFaceDetector
+from inference.FaceExtractor import box_iou, detect_boxes, crop_faces
+
+
+def timed_boxes(face_detector, frames, max_side, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        if max_side:
+            boxes = detect_boxes(face_detector, frames, max_side)
+        else:
+            # Frame by frame: a batch of 16 full resolution 4K frames takes more memory than most nodes have
+            boxes = [box for frame in frames for box in detect_boxes(face_detector, [frame])]
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), boxes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--max-sides", default="480,640,960")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-iou", type=float, default=0.8, help="smallest box IoU against full resolution allowed")
+    args = parser.parse_args()
+
+    face_detector = MtcnnFaceDetector(INPUT_SIZE[0], 20, "cpu")
+    failed = False
+    for video in args.videos:
+        frames = sample_frames(video, CLIP_LENGTH)
+        if not frames:
+            continue
+        full_time, full_boxes = timed_boxes(face_detector, frames, 0, args.repeats)
+        full_faces = crop_faces(face_detector, frames, full_boxes)
+        height, width = frames[0].shape[:2]
+        print(f"{video} {width}x{height}: full resolution {full_time * 1000:7.1f} ms, "
+              f"{sum(box is not None for box in full_boxes)}/{len(frames)} faces")
+
+        for max_side in (int(side) for side in args.max_sides.split(",")):
+            if max_side >= max(width, height):
+                continue
+            elapsed, boxes = timed_boxes(face_detector, frames, max_side, args.repeats)
+            faces = crop_faces(face_detector, frames, boxes)
+            missed = sum(box is None and full is not None for box, full in zip(boxes, full_boxes))
+            added = sum(box is not None and full is None for box, full in zip(boxes, full_boxes))
+            ious = [box_iou(box[0], full[0]) for box, full in zip(boxes, full_boxes)
+                    if box is not None and full is not None]
+            differences = [np.abs(face - full) for face, full in zip(faces, full_faces)
+                           if face is not None and full is not None]
+            min_iou = min(ious, default=1.0)
+            print(f"  max side {max_side:<5} {elapsed * 1000:7.1f} ms ({full_time / elapsed:4.1f}x), missed {missed}, "
+                  f"added {added}, min IoU {min_iou:.3f}, crop diff max "
+                  f"{max((d.max() for d in differences), default=0.0):.3f} mean "
+                  f"{statistics.mean(d.mean() for d in differences) if differences else 0.0:.4f}")
+            failed |= missed > 0 or added > 0 or min_iou < args.min_iou
+
+    if failed:
+        print(f"downscaled detection missed or added faces, or a box IoU fell under {args.min_iou}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Per-frame vs batched MTCNN latency on CPU.
+
+Usage: python -m benchmarks.FaceDetectionBenchmark video.mp4 [video.mp4 ...] [--repeats 5]
+"""
+import time
+import argparse
+import statistics
+from inference.FrameSampler import sample_frames
+from inference.FaceExtractor import extract_faces
+from inference.DeepfakeModel import INPUT_SIZE, CLIP_LENGTH
+from inference.impl.MtcnnFaceDetector import MtcnnFaceDetector
+
+
+def time_call(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    face_detector = MtcnnFaceDetector(INPUT_SIZE[0], 20, "cpu")
+
+    print(f"{'video':<40} {'frames':>6} {'per-frame ms':>13} {'batched ms':>11} {'speedup':>8} {'hits':>5}")
+    for video in args.videos:
+        frames = sample_frames(video, CLIP_LENGTH)
+        if not frames:
+            print(f"{video:<40} could not be decoded")
+            continue
+
+        per_frame, _ = time_call(lambda: [extract_faces(face_detector, [frame]) for frame in frames], args.repeats)
+        batched, faces = time_call(lambda: extract_faces(face_detector, frames), args.repeats)
+        hits = sum(face is not None for face in faces)
+
+        print(f"{video[-40:]:<40} {len(frames):>6} {per_frame * 1000:>13.1f} {batched * 1000:>11.1f} "
+              f"{per_frame / batched:>7.2f}x {hits:>5}")
+
+
+if __name__ == "__main__":
+    main()
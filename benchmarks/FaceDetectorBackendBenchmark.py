@@ -0,0 +1,90 @@
+"""
+Latency and face hit rate of the FACE_DETECTOR backends on CPU.
+
+For every video detects the face in the 16 sampled frames with each of --detectors (as configured by the FACE_*,
+MTCNN_*, HAAR_* and FACE_DNN_* environment variables, like the API) and reports the median detection time of the
+clip, the frames with a face, the frames where MTCNN found a face and the detector did not (missed) or the other
+way round (extra), and the smallest and mean box IoU against MTCNN. "dnn" needs FACE_DNN_MODEL (and
+FACE_DNN_CONFIG), it is skipped when they are not set. With --max-missed, the run fails when a detector misses more
+of MTCNN's faces than that over all videos, to check a cheaper configuration before deploying it.
+
+Usage: python -m benchmarks.FaceDetectorBackendBenchmark video.mp4 [video.mp4 ...]
+                                                        [--detectors mtcnn,haar,dnn,cascade] [--repeats 3]
+                                                        [--max-missed -1]
+"""
+import sys
+import time
+import argparse
+import statistics
+from config.detection import FACE_DNN_MODEL
+from inference.FrameSampler import sample_frames
+from inference.DeepfakeModel import CLIP_LENGTH
+from inference.FaceExtractor import box_iou, detect_boxes
+from services.impl.DetectServiceImpl import create_face_detector
+
+
+def timed_boxes(face_detector, frames, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        boxes = detect_boxes(face_detector, frames)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), boxes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--detectors", default="mtcnn,haar,dnn,cascade")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-missed", type=int, default=-1, help="faces a detector may miss, -1 does not check")
+    args = parser.parse_args()
+
+    names = [name for name in args.detectors.split(",") if name != "dnn" or FACE_DNN_MODEL]
+    detectors = {name: create_face_detector(name) for name in names}
+    reference = detectors.get("mtcnn") or create_face_detector("mtcnn")
+    totals = {name: {"ms": [], "hits": 0, "missed": 0, "extra": 0, "ious": []} for name in names}
+    frame_count = 0
+
+    for video in args.videos:
+        frames = sample_frames(video, CLIP_LENGTH)
+        if not frames:
+            print(f"{video} could not be decoded")
+            continue
+        frame_count += len(frames)
+        reference_boxes = detect_boxes(reference, frames)
+        print(video)
+
+        for name, face_detector in detectors.items():
+            elapsed, boxes = timed_boxes(face_detector, frames, args.repeats)
+            hits = sum(box is not None for box in boxes)
+            missed = sum(box is None and full is not None for box, full in zip(boxes, reference_boxes))
+            extra = sum(box is not None and full is None for box, full in zip(boxes, reference_boxes))
+            ious = [box_iou(box[0], full[0]) for box, full in zip(boxes, reference_boxes)
+                    if box is not None and full is not None]
+            total = totals[name]
+            total["ms"].append(elapsed * 1000)
+            total["hits"] += hits
+            total["missed"] += missed
+            total["extra"] += extra
+            total["ious"] += ious
+            print(f"  {name:<8} {elapsed * 1000:8.1f} ms, faces {hits:>2}/{len(frames)}, missed {missed}, "
+                  f"extra {extra}, min IoU {min(ious, default=1.0):.3f}")
+
+    print(f"{'detector':<10} {'p50 ms':>8} {'hit rate':>9} {'missed':>7} {'extra':>6} {'min IoU':>8} {'mean IoU':>9}")
+    failed = False
+    for name, total in totals.items():
+        if not total["ms"]:
+            continue
+        print(f"{name:<10} {statistics.median(total['ms']):>8.1f} {total['hits'] / frame_count:>9.1%} "
+              f"{total['missed']:>7} {total['extra']:>6} {min(total['ious'], default=1.0):>8.3f} "
+              f"{statistics.mean(total['ious']) if total['ious'] else 1.0:>9.3f}")
+        failed |= 0 <= args.max_missed < total["missed"]
+
+    if failed:
+        print(f"a detector missed more than {args.max_missed} of MTCNN's faces")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Face detection on every sampled frame vs detection on keyframes with tracked boxes in between (track_faces).
+
+For every video, and for two harder variants of it (a scene cut half way to the next video, and a face vanishing
+for a few frames in the middle), runs MTCNN on all 16 sampled frames and then track_faces for each
+--intervals value. Reports how many frames the detector ran on, the face detection time, the frames where tracking
+found a face and full detection did not (or the other way round), the smallest IoU between the two boxes and
+whether the model's label agrees with the full-detection label, with the largest softmax difference. The model is
+the INFERENCE_BACKEND one, as configured for the API. Run it from the API's working directory.
+
+Usage: python -m benchmarks.FaceTrackingBenchmark video.mp4 [video.mp4 ...] [--intervals 2,4,8] [--min-iou 0.5]
+"""
+import time
+import argparse
+import statistics
+import numpy as np
+from inference.FrameSampler import sample_frames
+from inference.DeepfakeModel import INPUT_SIZE, CLIP_LENGTH
+from inference.impl.MtcnnFaceDetector import MtcnnFaceDetector
+from services.impl.DetectServiceImpl import face_clip, forward_clips
+from inference.FaceExtractor import box_iou, detect_boxes, crop_faces, track_faces
+
+
+class CountingMtcnnFaceDetector(MtcnnFaceDetector):
+    """
+    MTCNN counting the frames it runs detection on and recording the boxes it crops.
+    """
+    detected_frames = 0
+    boxes = None
+
+    def detect(self, frames):
+        self.detected_frames += len(frames)
+        return super().detect(frames)
+
+    def extract(self, frames, boxes):
+        self.boxes = list(boxes)
+        return super().extract(frames, boxes)
+
+
+def variants(videos):
+    clips = {video: sample_frames(video, CLIP_LENGTH) for video in videos}
+    for i, (video, frames) in enumerate(clips.items()):
+        if len(frames) < CLIP_LENGTH:
+            continue
+        yield video, frames
+        following = clips[videos[(i + 1) % len(videos)]]
+        if len(following) == CLIP_LENGTH and following[0].shape == frames[0].shape:
+            yield f"{video} (cut)", frames[:CLIP_LENGTH // 2] + following[CLIP_LENGTH // 2:]
+        blank = np.zeros_like(frames[0])
+        yield f"{video} (gap)", [blank if 6 <= j < 10 else frame for j, frame in enumerate(frames)]
+
+
+def probabilities(frames, faces):
+    clip = face_clip(frames, faces)
+    return None if clip is None else forward_clips(clip)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("videos", nargs="+")
+    parser.add_argument("--intervals", default="2,4,8")
+    parser.add_argument("--min-iou", type=float, default=0.5)
+    args = parser.parse_args()
+
+    face_detector = CountingMtcnnFaceDetector(INPUT_SIZE[0], 20, "cpu")
+    intervals = [int(interval) for interval in args.intervals.split(",")]
+    timings = {interval: [] for interval in [1] + intervals}
+    detected_frames = {interval: 0 for interval in [1] + intervals}
+    agreements = {interval: 0 for interval in intervals}
+    drifts = {interval: 0.0 for interval in intervals}
+    clips = 0
+
+    for name, frames in variants(args.videos):
+        clips += 1
+        face_detector.detected_frames = 0
+        start = time.perf_counter()
+        full_boxes = detect_boxes(face_detector, frames)
+        full_faces = crop_faces(face_detector, frames, full_boxes)
+        timings[1].append(time.perf_counter() - start)
+        detected_frames[1] += face_detector.detected_frames
+        reference = probabilities(frames, full_faces)
+        print(name)
+
+        for interval in intervals:
+            face_detector.detected_frames = 0
+            start = time.perf_counter()
+            faces = track_faces(face_detector, frames, interval, args.min_iou)
+            timings[interval].append(time.perf_counter() - start)
+            detected_frames[interval] += face_detector.detected_frames
+
+            missed = sum(box is None and full is not None for box, full in zip(face_detector.boxes, full_boxes))
+            extra = sum(box is not None and full is None for box, full in zip(face_detector.boxes, full_boxes))
+            ious = [box_iou(box[0], full[0]) for box, full in zip(face_detector.boxes, full_boxes)
+                    if box is not None and full is not None]
+            tracked = probabilities(frames, faces)
+            if reference is None or tracked is None:
+                agree = reference is None and tracked is None
+                drift = 0.0
+            else:
+                agree = reference.argmax().item() == tracked.argmax().item()
+                drift = (reference - tracked).abs().max().item()
+            agreements[interval] += agree
+            drifts[interval] = max(drifts[interval], drift)
+            print(f"  every {interval:<2} detected {face_detector.detected_frames:>2}/{len(frames)} frames, "
+                  f"missed {missed}, extra {extra}, min IoU {min(ious, default=1.0):.3f}, "
+                  f"label {'agrees' if agree else 'DIFFERS'}, max drift {drift:.4f}")
+
+    print(f"{clips} clips")
+    full_ms = statistics.median(timings[1]) * 1000
+    print(f"every 1   detected {detected_frames[1]:>4} frames, p50 {full_ms:7.1f} ms")
+    for interval in intervals:
+        interval_ms = statistics.median(timings[interval]) * 1000
+        print(f"every {interval:<3} detected {detected_frames[interval]:>4} frames, p50 {interval_ms:7.1f} ms "
+              f"({full_ms / interval_ms:.1f}x), label agreement {agreements[interval] / clips:.0%}, "
+              f"max drift {drifts[interval]:.4f}")
+
+
+if __name__ == "__main__":
+    main()
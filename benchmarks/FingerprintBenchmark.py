@@ -0,0 +1,109 @@
+"""
+Near-duplicate recall, false matches and lookup latency of the perceptual fingerprint index.
+
+Generates --videos synthetic clips, re-encodes each of them in several ways (downscale, heavy JPEG compression,
+head trim, border crop, brightness shift), indexes the originals and queries the re-encodings plus a set of
+unrelated clips. The index is padded with random fingerprints up to --index-size to measure lookup latency.
+
+Usage: python -m benchmarks.FingerprintBenchmark [--videos 30] [--index-size 100000] [--max-distance 6]
+"""
+import os
+import cv2
+import time
+import argparse
+import tempfile
+import statistics
+import numpy as np
+from inference.FrameSampler import sample_frames
+from inference.Fingerprint import FingerprintIndex, video_fingerprint
+
+CLIP_LENGTH = 16
+FRAMES = 120
+SIZE = (640, 360)
+
+
+def synthetic_frames(seed):
+    rng = np.random.default_rng(seed)
+    background = cv2.resize(rng.integers(0, 255, (9, 16, 3), dtype=np.uint8), SIZE, interpolation=cv2.INTER_CUBIC)
+    shapes = [(rng.integers(0, SIZE[0]), rng.integers(0, SIZE[1]), rng.integers(20, 80),
+               tuple(int(c) for c in rng.integers(0, 255, 3)), rng.integers(-6, 6, 2)) for _ in range(8)]
+    for i in range(FRAMES):
+        frame = background.copy()
+        for x, y, radius, colour, (dx, dy) in shapes:
+            cv2.circle(frame, (int(x + dx * i) % SIZE[0], int(y + dy * i) % SIZE[1]), int(radius), colour, -1)
+        yield frame
+
+
+def jpeg(frame, quality):
+    return cv2.imdecode(cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])[1], cv2.IMREAD_COLOR)
+
+
+TRANSFORMS = {
+    "downscale": lambda i, f: cv2.resize(f, (SIZE[0] // 2, SIZE[1] // 2)),
+    "jpeg_q20": lambda i, f: jpeg(f, 20),
+    "trim_15pct": lambda i, f: f if i >= FRAMES * 0.15 else None,
+    "crop_5pct": lambda i, f: cv2.resize(f[SIZE[1] // 20:-SIZE[1] // 20, SIZE[0] // 20:-SIZE[0] // 20], SIZE),
+    "brightness": lambda i, f: cv2.convertScaleAbs(f, alpha=1.0, beta=30),
+}
+
+
+def write_video(path, frames):
+    writer = None
+    for frame in frames:
+        if frame is None:
+            continue
+        if writer is None:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), 25, (frame.shape[1], frame.shape[0]))
+        writer.write(frame)
+    writer.release()
+
+
+def fingerprint_of(path):
+    return video_fingerprint(sample_frames(path, CLIP_LENGTH))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--videos", type=int, default=30)
+    parser.add_argument("--index-size", type=int, default=100000)
+    parser.add_argument("--max-distance", type=int, default=6)
+    args = parser.parse_args()
+
+    index = FingerprintIndex(args.max_distance, CLIP_LENGTH)
+    rng = np.random.default_rng(0)
+    padding = args.index_size - args.videos
+    index.add_many([(-i - 1, rng.integers(0, 2 ** 63, CLIP_LENGTH, dtype=np.uint64), None) for i in range(padding)])
+
+    hits = {name: 0 for name in TRANSFORMS}
+    false_matches = 0
+    latencies = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for video in range(args.videos):
+            original = os.path.join(tmp, f"{video}.mp4")
+            write_video(original, synthetic_frames(video))
+            index.add(video, fingerprint_of(original), video)
+
+        for video in range(args.videos):
+            for name, transform in TRANSFORMS.items():
+                path = os.path.join(tmp, f"{video}_{name}.mp4")
+                write_video(path, (transform(i, f) for i, f in enumerate(synthetic_frames(video))))
+                start = time.perf_counter()
+                match = index.lookup(fingerprint_of(path))
+                latencies.append(time.perf_counter() - start)
+                hits[name] += match is not None and match[0] == video
+
+            unrelated = os.path.join(tmp, f"unrelated_{video}.mp4")
+            write_video(unrelated, synthetic_frames(10_000 + video))
+            false_matches += index.lookup(fingerprint_of(unrelated)) is not None
+
+    print(f"index size {len(index)}, max distance {args.max_distance}")
+    for name, count in hits.items():
+        print(f"recall {name:<12} {count / args.videos:6.1%}")
+    print(f"false matches on unrelated clips {false_matches / args.videos:6.1%}")
+    print(f"lookup (incl. fingerprinting) p50 {statistics.median(latencies) * 1000:.1f} ms, "
+          f"max {max(latencies) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Latency and memory of the inference backends on this node, to pick INFERENCE_BACKEND / INFERENCE_COMPILE /
+INFERENCE_QUANTIZATION per node type.
+
+Every backend is built in its own freshly spawned process, so its RSS is not mixed up with the others', from the
+real checkpoint (and ONNX_MODEL_PATH for onnxruntime, see python -m inference.OnnxExport). Each then runs
+--iterations forward passes per batch size on the same seeded random batch after one warm-up pass. Logits are
+compared with the first backend's.
+
+Backends: torch (eager), torch-trace, torch-compile, torch-int8 (dynamic quantization), onnxruntime
+
+Usage: python -m benchmarks.InferenceBackendBenchmark [--backends torch,onnxruntime] [--batch-sizes 1,4]
+                                                      [--iterations 10] [--threads 0]
+"""
+import time
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+
+BACKENDS = ("torch", "torch-trace", "torch-compile", "torch-int8", "onnxruntime")
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def build_backend(name: str, threads: int, cache_dir: str):
+    from config.detection import ONNX_MODEL_PATH
+    from ingest.UploadIngest import file_sha256
+    from inference.impl.TorchBackend import TorchBackend
+    from inference.impl.OnnxRuntimeBackend import OnnxRuntimeBackend
+    from inference.Quantization import quantized_model_path
+    from inference.DeepfakeModel import MODEL_PATH, INPUT_SIZE, CLIP_LENGTH, load_model
+
+    if name == "onnxruntime":
+        return OnnxRuntimeBackend(ONNX_MODEL_PATH, threads, 1, file_sha256(MODEL_PATH))
+    compile_mode = {"torch-trace": "trace", "torch-compile": "compile"}.get(name, "eager")
+    quantization = "dynamic" if name == "torch-int8" else "none"
+    cache_path = quantized_model_path(cache_dir, "benchmark", quantization)
+    return TorchBackend(load_model(MODEL_PATH, "cpu"), "cpu", (3, CLIP_LENGTH, *INPUT_SIZE), compile_mode,
+                        quantization, cache_path)
+
+
+def run_backend(name: str, batch_sizes: list, iterations: int, threads: int):
+    import torch
+    from inference.DeepfakeModel import INPUT_SIZE, CLIP_LENGTH
+
+    if threads > 0:
+        torch.set_num_threads(threads)
+    before = rss_mb()
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        backend = build_backend(name, threads, cache_dir)
+    build_seconds = time.perf_counter() - started
+    loaded_rss = rss_mb() - before
+
+    results = {}
+    generator = torch.Generator().manual_seed(0)
+    for batch_size in batch_sizes:
+        batch = torch.randn(batch_size, 3, CLIP_LENGTH, *INPUT_SIZE, generator=generator)
+        logits = backend.forward(batch).float()
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            backend.forward(batch)
+            timings.append(time.perf_counter() - started)
+        results[batch_size] = (timings, logits)
+    return build_seconds, loaded_rss, rss_mb() - before, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="torch,torch-trace,torch-int8,onnxruntime")
+    parser.add_argument("--batch-sizes", default="1,4")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads, 0 keeps each runtime's default")
+    args = parser.parse_args()
+
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    context = multiprocessing.get_context("spawn")
+    reference = None
+    print(f"{'backend':<14} {'batch':>5} {'build s':>8} {'p50 ms':>9} {'p99 ms':>9} {'clips/s':>8} {'load MB':>8} "
+          f"{'peak MB':>8} {'max diff':>9}")
+    for name in args.backends.split(","):
+        if name not in BACKENDS:
+            print(f"{name:<14} unknown, expected one of {', '.join(BACKENDS)}")
+            continue
+        with context.Pool(1) as pool:
+            try:
+                build_seconds, loaded_rss, peak_rss, results = pool.apply(
+                    run_backend, (name, batch_sizes, args.iterations, args.threads))
+            except Exception as e:
+                print(f"{name:<14} failed: {e}")
+                continue
+        if reference is None:
+            reference = results
+        for batch_size, (timings, logits) in results.items():
+            timings = sorted(timings)
+            p50 = statistics.median(timings)
+            difference = (logits - reference[batch_size][1]).abs().max().item()
+            print(f"{name:<14} {batch_size:>5} {build_seconds:>8.1f} {p50 * 1000:>9.0f} "
+                  f"{timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000:>9.0f} {batch_size / p50:>8.2f} "
+                  f"{loaded_rss:>8.0f} {peak_rss:>8.0f} {difference:>9.1e}")
+
+
+if __name__ == "__main__":
+    main()
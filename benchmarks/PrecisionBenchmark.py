@@ -0,0 +1,87 @@
+"""
+fp32 vs bf16 vs fp16 (and channels-last-3d) forward passes of the detector on this node, with a softmax parity check.
+
+Builds a TorchBackend from the real checkpoint for every --precisions x --channels-last combination and scores the
+same clips with each: the face clips of the videos under --clips-dir when given (preprocessed like a detection),
+seeded random clips otherwise. Reports p50/p99 latency, speedup over fp32 and, against fp32, the largest softmax
+difference and the share of clips whose label stays the same. --max-drift makes the run fail when a variant drifts
+further than that.
+
+Usage: python -m benchmarks.PrecisionBenchmark [--precisions fp32,bf16] [--channels-last 0,1] [--clips-dir dir]
+                                               [--iterations 5] [--device cpu] [--max-drift 0.02]
+"""
+import os
+import sys
+import time
+import torch
+import argparse
+import statistics
+from inference.Precision import PrecisionPolicy
+from inference.impl.TorchBackend import TorchBackend
+from inference.DeepfakeModel import MODEL_PATH, INPUT_SIZE, CLIP_LENGTH, load_model
+
+
+def load_clips(clips_dir, count):
+    if clips_dir:
+        from services.impl.DetectServiceImpl import preprocess_video
+        clips = [preprocess_video(os.path.join(clips_dir, name)) for name in sorted(os.listdir(clips_dir))]
+        return [clip.cpu() for clip in clips if clip is not None]
+    generator = torch.Generator().manual_seed(0)
+    return [torch.randn(1, 3, CLIP_LENGTH, *INPUT_SIZE, generator=generator) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--precisions", default="fp32,bf16")
+    parser.add_argument("--channels-last", default="0,1")
+    parser.add_argument("--clips-dir")
+    parser.add_argument("--random-clips", type=int, default=4)
+    parser.add_argument("--iterations", type=int, default=5, help="timed forward passes per clip")
+    parser.add_argument("--device", default="cuda" if torch.cuda.is_available() else "cpu")
+    parser.add_argument("--max-drift", type=float, help="largest softmax difference from fp32 allowed")
+    args = parser.parse_args()
+
+    clips = [clip.to(args.device) for clip in load_clips(args.clips_dir, args.random_clips)]
+    if not clips:
+        print("No clip to score")
+        return
+    print(f"{len(clips)} clips on {args.device}, {torch.get_num_threads()} threads, "
+          f"CPU bf16 support {torch.ops.mkldnn._is_mkldnn_bf16_supported()}")
+    print(f"{'precision':<10} {'cl3d':>4} {'p50 ms':>9} {'p99 ms':>9} {'speedup':>8} {'max drift':>10} {'agreement':>10}")
+
+    reference, reference_p50, failed = None, None, False
+    for precision in args.precisions.split(","):
+        for channels_last in (bool(int(flag)) for flag in args.channels_last.split(",")):
+            policy = PrecisionPolicy(precision, args.device, channels_last)
+            if policy.precision != precision:
+                print(f"{precision:<10} {int(channels_last):>4} not supported on {args.device}")
+                continue
+            # A fresh model every time, prepare_model converts the weights in place
+            backend = TorchBackend(load_model(MODEL_PATH, args.device), args.device, (3, CLIP_LENGTH, *INPUT_SIZE),
+                                   precision=policy)
+            probabilities = torch.cat([torch.softmax(backend.forward(clip).float(), dim=1).cpu() for clip in clips])
+            timings = []
+            for clip in clips:
+                for _ in range(args.iterations):
+                    started = time.perf_counter()
+                    backend.forward(clip)
+                    timings.append(time.perf_counter() - started)
+            timings.sort()
+            p50 = statistics.median(timings)
+            if reference is None:
+                reference, reference_p50 = probabilities, p50
+            drift = (probabilities - reference).abs().max().item()
+            agreement = (probabilities.argmax(dim=1) == reference.argmax(dim=1)).float().mean().item()
+            failed |= args.max_drift is not None and drift > args.max_drift
+            print(f"{precision:<10} {int(channels_last):>4} {p50 * 1000:>9.0f} "
+                  f"{timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1000:>9.0f} "
+                  f"{reference_p50 / p50:>7.2f}x {drift:>10.4f} {agreement:>10.1%}")
+            del backend
+
+    if failed:
+        print(f"Softmax drift above {args.max_drift}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
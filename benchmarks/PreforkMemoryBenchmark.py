@@ -0,0 +1,66 @@
+"""
+Per-worker memory of workers.PreforkServer with and without the preloaded, shared model.
+
+Starts the server with --workers workers, once with --no-preload (every worker loads its own model, like separate
+uvicorn workers) and once preloading in the master, waits until every worker finished its startup (model loaded
+and warmed up) and reads rss, pss and private memory of the master and each worker. Summed pss is the memory the
+whole server really takes on the node. Run it from the API's working directory (.env, trained_model).
+
+Usage: python -m benchmarks.PreforkMemoryBenchmark [--workers 3] [--port 8765]
+"""
+import sys
+import time
+import argparse
+import subprocess
+from workers.PreforkServer import process_memory
+
+READY_LINE = "Application startup complete."
+
+
+def worker_pids(master_pid: int):
+    with open(f"/proc/{master_pid}/task/{master_pid}/children") as children:
+        return [int(pid) for pid in children.read().split()]
+
+
+def measure(workers: int, port: int, preload: bool, timeout: float):
+    command = [sys.executable, "-m", "workers.PreforkServer", "--workers", str(workers), "--port", str(port),
+               "--host", "127.0.0.1"]
+    if not preload:
+        command.append("--no-preload")
+    started = time.perf_counter()
+    server = subprocess.Popen(command, stderr=subprocess.PIPE, stdout=subprocess.DEVNULL, text=True)
+    try:
+        ready = 0
+        for line in server.stderr:
+            ready += READY_LINE in line
+            if ready == workers or time.perf_counter() - started > timeout:
+                break
+        if ready < workers:
+            raise RuntimeError(f"only {ready} of {workers} workers started")
+        elapsed = time.perf_counter() - started
+        return elapsed, process_memory(server.pid), [process_memory(pid) for pid in worker_pids(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=600)
+    args = parser.parse_args()
+
+    for preload in (False, True):
+        elapsed, master, workers = measure(args.workers, args.port, preload, args.timeout)
+        print(f"{'preload' if preload else 'no preload'}: {args.workers} workers ready in {elapsed:.1f} s")
+        print(f"  master   rss {master['rss'] / 2 ** 20:7.0f} MB  pss {master['pss'] / 2 ** 20:7.0f} MB")
+        for memory in workers:
+            print(f"  worker   rss {memory['rss'] / 2 ** 20:7.0f} MB  pss {memory['pss'] / 2 ** 20:7.0f} MB  "
+                  f"private {memory['private'] / 2 ** 20:7.0f} MB")
+        total = master["pss"] + sum(memory["pss"] for memory in workers)
+        print(f"  total pss {total / 2 ** 20:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Accuracy parity, latency and memory of the int8 quantized detector against the fp32 checkpoint, on CPU.
+
+Preprocesses every video under clips_dir (a held-out set, not the calibration videos) exactly like a detection does,
+then scores each clip with the fp32 model and with each quantized variant. Reports how often the quantized label
+agrees with fp32, the largest change of the FAKE probability and, when the videos sit in real/ and fake/
+subdirectories, the accuracy of both. Latency is per clip, memory is the serialized model size and the RSS growth
+while loading it.
+
+Quantized models are written to a temporary directory, the QUANTIZATION_CACHE_DIR cache is left alone.
+
+Usage: python -m benchmarks.QuantizedModelBenchmark clips_dir [--modes dynamic,static] [--calibration-dir dir]
+                                                    [--calibration-clips 16] [--iterations 5]
+"""
+import os
+import time
+import torch
+import argparse
+import tempfile
+import statistics
+from services.impl import DetectServiceImpl
+from inference.DeepfakeModel import MODEL_PATH, load_model
+from inference.Quantization import load_quantized_model, quantized_model_path
+
+LABELS = {"real": 0, "fake": 1}
+
+
+def rss_mb():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def load_clips(directory):
+    clips = []
+    for root, _, files in os.walk(directory):
+        label = LABELS.get(os.path.basename(root).lower())
+        for name in sorted(files):
+            clip = DetectServiceImpl.preprocess_video(os.path.join(root, name))
+            if clip is not None:
+                clips.append((name, clip, label))
+    return clips
+
+
+def score(forward_model, clips, iterations):
+    probabilities, timings = [], []
+    with torch.no_grad():
+        for _, clip, _ in clips:
+            probabilities.append(torch.softmax(forward_model(clip).float(), dim=1)[0, 1].item())
+            for _ in range(iterations):
+                started = time.perf_counter()
+                forward_model(clip)
+                timings.append(time.perf_counter() - started)
+    return probabilities, timings
+
+
+def report(name, probabilities, reference, timings, clips, size_mb, rss_growth_mb):
+    labels = [int(p >= 0.5) for p in probabilities]
+    reference_labels = [int(p >= 0.5) for p in reference]
+    agreement = sum(a == b for a, b in zip(labels, reference_labels)) / len(clips)
+    drift = max(abs(a - b) for a, b in zip(probabilities, reference))
+    truth = [(label, clip_label) for label, (_, _, clip_label) in zip(labels, clips) if clip_label is not None]
+    accuracy = f"{sum(a == b for a, b in truth) / len(truth):7.1%}" if truth else "      -"
+    p50 = statistics.median(timings)
+    print(f"{name:<8} {agreement:>9.1%} {drift:>9.4f} {accuracy} {p50 * 1000:>8.0f} "
+          f"{sorted(timings)[int(len(timings) * 0.99)] * 1000:>8.0f} {1 / p50:>8.2f} {size_mb:>8.1f} {rss_growth_mb:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("clips_dir")
+    parser.add_argument("--modes", default="dynamic")
+    parser.add_argument("--calibration-dir", help="videos for static quantization, kept apart from clips_dir")
+    parser.add_argument("--calibration-clips", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=5, help="timed forward passes per clip")
+    args = parser.parse_args()
+
+    clips = load_clips(args.clips_dir)
+    if not clips:
+        print("No video with a face found in", args.clips_dir)
+        return
+    calibration = load_clips(args.calibration_dir)[:args.calibration_clips] if args.calibration_dir else []
+    example_input = clips[0][1]
+    fp32 = load_model(MODEL_PATH, "cpu")
+
+    print(f"{len(clips)} held-out clips, {len(calibration)} calibration clips, {torch.get_num_threads()} threads, "
+          f"engine {torch.backends.quantized.engine}")
+    print(f"{'model':<8} {'agreement':>9} {'max drift':>9} {'acc':>7} {'p50 ms':>8} {'p99 ms':>8} {'clips/s':>8} "
+          f"{'size MB':>8} {'RSS +MB':>8}")
+    reference, timings = score(fp32, clips, args.iterations)
+    fp32_size = os.path.getsize(MODEL_PATH) / 1e6
+    report("fp32", reference, reference, timings, clips, fp32_size, 0.0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes.split(","):
+            if mode == "static" and not calibration:
+                print(f"{mode:<8} needs --calibration-dir")
+                continue
+            cache_path = quantized_model_path(tmp, DetectServiceImpl.model_version(), mode)
+            started = time.perf_counter()
+            load_quantized_model(fp32, mode, example_input, cache_path, lambda: (clip for _, clip, _ in calibration))
+            build_seconds = time.perf_counter() - started
+
+            before = rss_mb()
+            started = time.perf_counter()
+            quantized = torch.jit.load(cache_path, map_location="cpu")
+            load_seconds = time.perf_counter() - started
+            rss_growth = rss_mb() - before
+
+            probabilities, timings = score(quantized, clips, args.iterations)
+            report(mode, probabilities, reference, timings, clips, os.path.getsize(cache_path) / 1e6, rss_growth)
+            print(f"{'':<8} quantize + trace {build_seconds:.1f} s, cached load {load_seconds:.2f} s")
+            del quantized
+
+
+if __name__ == "__main__":
+    main()
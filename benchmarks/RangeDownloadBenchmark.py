@@ -0,0 +1,116 @@
+"""
+Single stream vs parallel range downloads against a local stub CDN.
+
+Serves --size-mb of random bytes from a local HTTP server that throttles every connection to --connection-mbps,
+like a CDN capping per-connection throughput, and downloads it through ingest.Downloader in each server mode:
+  ranges         Accept-Ranges + 206 answers, the parallel path
+  no-ranges      no Accept-Ranges header, single stream
+  ignore-ranges  advertises ranges but answers Range requests with the whole file, falls back to single stream
+  flaky          drops every range connection half way on its first attempt, exercises the per-range retry
+Each download is checked against the SHA-256 of the served bytes.
+
+Usage: python -m benchmarks.RangeDownloadBenchmark [--size-mb 64] [--connection-mbps 40]
+"""
+import os
+import time
+import asyncio
+import hashlib
+import argparse
+import tempfile
+import threading
+from ingest import Downloader
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+MODES = ("ranges", "no-ranges", "ignore-ranges", "flaky")
+
+
+def stub_server(payload: bytes, connection_bytes_per_second: float):
+    attempts = {}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            mode = self.path.strip("/")
+            start, end = 0, len(payload) - 1
+            ranged = False
+            range_header = self.headers.get("Range")
+            if range_header and mode in ("ranges", "flaky"):
+                first, last = range_header.removeprefix("bytes=").split("-")
+                start, end = int(first), int(last) if last else len(payload) - 1
+                ranged = True
+
+            self.send_response(206 if ranged else 200)
+            if mode != "no-ranges":
+                self.send_header("Accept-Ranges", "bytes")
+            if ranged:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+
+            cut = None
+            if mode == "flaky" and ranged:
+                with lock:
+                    attempts[start] = attempts.get(start, 0) + 1
+                    if attempts[start] == 1:
+                        cut = start + (end - start) // 2
+
+            position = start
+            chunk_size = 64 * 1024
+            while position <= end:
+                if cut is not None and position >= cut:
+                    self.close_connection = True
+                    return
+                chunk = payload[position:min(position + chunk_size, end + 1)]
+                try:
+                    self.wfile.write(chunk)
+                except (BrokenPipeError, ConnectionResetError):
+                    return
+                position += len(chunk)
+                time.sleep(len(chunk) / connection_bytes_per_second)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(base_url: str, expected: str, tmp: str):
+    for mode in MODES:
+        file_path = os.path.join(tmp, f"{mode}.bin")
+        before = Downloader.download_stats.metrics()
+        started = time.perf_counter()
+        content_hash = await Downloader.download_to_file(f"{base_url}/{mode}", file_path)
+        elapsed = time.perf_counter() - started
+        after = Downloader.download_stats.metrics()
+        size = os.path.getsize(file_path)
+        os.remove(file_path)
+        path = "ranged" if after["ranged"] > before["ranged"] else "single stream"
+        if after["range_fallbacks"] > before["range_fallbacks"]:
+            path += " (fell back)"
+        print(f"{mode:<14} {elapsed:6.2f}s {size / elapsed / 1e6:7.1f} MB/s  {path:<26} "
+              f"hash {'ok' if content_hash == expected else 'MISMATCH'}")
+    await Downloader.close_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--connection-mbps", type=float, default=40, help="per connection cap, megabits per second")
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    server = stub_server(payload, args.connection_mbps * 1e6 / 8)
+    print(f"{args.size_mb} MB, {args.connection_mbps:.0f} Mbit/s per connection, "
+          f"{Downloader.DOWNLOAD_RANGE_PARTS} ranges from {Downloader.DOWNLOAD_RANGE_MIN_BYTES // (1024 * 1024)} MB")
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"http://127.0.0.1:{server.server_port}", hashlib.sha256(payload).hexdigest(), tmp))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Time from a cold interpreter to an importable app and to a ready app, offline.
+
+Each run starts a fresh interpreter that imports Main and enters the app lifespan (what uvicorn waits for before
+accepting connections: INFERENCE_WARMUP_* and INFERENCE_WARMUP_BACKGROUND apply). Runs are offline: TORCH_HOME
+points to an empty directory and HTTP(S) proxies to a closed port, so startup fails, or the directory fills, if
+anything tries to download weights. Run it from the API's working directory (.env, trained_model).
+
+--max-import-seconds / --max-ready-seconds make it exit non-zero when the median exceeds them, as a regression
+guard.
+
+Usage: python -m benchmarks.StartupBenchmark [--runs 3] [--max-import-seconds 10] [--max-ready-seconds 30]
+"""
+import os
+import sys
+import json
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+CHILD = """
+import time
+started = time.perf_counter()
+import json
+import Main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(Main.app):
+    ready = time.perf_counter()
+    print(json.dumps({"import": imported - started, "ready": ready - started}))
+"""
+
+
+def run_once(torch_home: str):
+    environment = dict(os.environ, TORCH_HOME=torch_home, HTTP_PROXY="http://127.0.0.1:9",
+                       HTTPS_PROXY="http://127.0.0.1:9", http_proxy="http://127.0.0.1:9",
+                       https_proxy="http://127.0.0.1:9", PYTHONWARNINGS="ignore")
+    completed = subprocess.run([sys.executable, "-c", CHILD], env=environment, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "startup failed")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--max-import-seconds", type=float)
+    parser.add_argument("--max-ready-seconds", type=float)
+    args = parser.parse_args()
+
+    imports, readies = [], []
+    with tempfile.TemporaryDirectory() as torch_home:
+        for run in range(args.runs):
+            try:
+                timings = run_once(torch_home)
+            except RuntimeError as e:
+                print(f"run {run + 1}: startup failed offline: {e}")
+                sys.exit(1)
+            imports.append(timings["import"])
+            readies.append(timings["ready"])
+            print(f"run {run + 1}: import {timings['import']:.2f} s, ready {timings['ready']:.2f} s")
+        downloaded = [name for _, _, files in os.walk(torch_home) for name in files]
+
+    import_median, ready_median = statistics.median(imports), statistics.median(readies)
+    print(f"median: import {import_median:.2f} s, ready {ready_median:.2f} s")
+    failures = []
+    if downloaded:
+        failures.append(f"startup downloaded {', '.join(downloaded)}")
+    if args.max_import_seconds is not None and import_median > args.max_import_seconds:
+        failures.append(f"import took {import_median:.2f} s, more than {args.max_import_seconds} s")
+    if args.max_ready_seconds is not None and ready_median > args.max_ready_seconds:
+        failures.append(f"ready took {ready_median:.2f} s, more than {args.max_ready_seconds} s")
+    for failure in failures:
+        print(failure)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
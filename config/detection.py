@@ -0,0 +1,135 @@
+import os
+from dotenv import load_dotenv
+
+
+load_dotenv(".env")
+
+# Pool running decoding and face detection (preprocessing): "thread" in the API process, "process" in spawned
+# processes, each loading its own face detector. The forward pass always runs in the API process, on the batch
+# scheduler's thread.
+INFERENCE_EXECUTOR = os.getenv("INFERENCE_EXECUTOR", "thread")
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "1"))
+# torch intra-op threads of the pool workers, 0 keeps torch's default (one per core). With "thread" this is set for
+# the whole API process, the forward pass included.
+TORCH_NUM_THREADS = int(os.getenv("TORCH_NUM_THREADS", "0"))
+# "eager" runs the model as is, "trace" a frozen TorchScript trace of it, "compile" a torch.compile'd model
+INFERENCE_COMPILE = os.getenv("INFERENCE_COMPILE", "eager")
+# Forward passes per batch size run at startup, before the API takes requests, so the first detection does not pay
+# for lazy initialisation (allocator, kernels, compilation). 0 skips the warm-up.
+INFERENCE_WARMUP_PASSES = int(os.getenv("INFERENCE_WARMUP_PASSES", "1"))
+INFERENCE_WARMUP_BATCH_SIZES = [int(size) for size in os.getenv("INFERENCE_WARMUP_BATCH_SIZES", "1").split(",") if size]
+# 1 serves requests while the model loads and warms up in the background, detections arriving meanwhile wait for it
+INFERENCE_WARMUP_BACKGROUND = int(os.getenv("INFERENCE_WARMUP_BACKGROUND", "0"))
+# CPU only: "dynamic" quantizes the Linear layers to int8, "static" also the convolutions, calibrated on the videos
+# of QUANTIZATION_CALIBRATION_DIR. The quantized model is traced and cached in QUANTIZATION_CACHE_DIR per checkpoint,
+# it takes the place of INFERENCE_COMPILE.
+INFERENCE_QUANTIZATION = os.getenv("INFERENCE_QUANTIZATION", "none")
+QUANTIZATION_CACHE_DIR = os.getenv("QUANTIZATION_CACHE_DIR", "trained_model")
+QUANTIZATION_CALIBRATION_DIR = os.getenv("QUANTIZATION_CALIBRATION_DIR", "")
+QUANTIZATION_CALIBRATION_CLIPS = int(os.getenv("QUANTIZATION_CALIBRATION_CLIPS", "32"))
+# "torch" runs the PyTorch model (INFERENCE_COMPILE and INFERENCE_QUANTIZATION apply), "onnxruntime" the ONNX export
+# at ONNX_MODEL_PATH (python -m inference.OnnxExport, pip install -r requirements-onnx.txt) on CPU. An export of
+# another checkpoint than MODEL_PATH is refused. ORT_*_THREADS=0 keeps onnxruntime's defaults.
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch")
+ONNX_MODEL_PATH = os.getenv("ONNX_MODEL_PATH", os.path.join("trained_model", "mvit_deepfakes.onnx"))
+ORT_INTRA_OP_THREADS = int(os.getenv("ORT_INTRA_OP_THREADS", "0"))
+ORT_INTER_OP_THREADS = int(os.getenv("ORT_INTER_OP_THREADS", "1"))
+# Forward pass format of the torch backend: "fp32", "bf16" (CPUs with AVX512-BF16/AMX, recent GPUs), "fp16" (GPU only)
+# or "auto", fp16 on CUDA and fp32 on CPU. INFERENCE_CHANNELS_LAST=1 keeps weights and clips channels-last-3d.
+INFERENCE_PRECISION = os.getenv("INFERENCE_PRECISION", "auto")
+INFERENCE_CHANNELS_LAST = int(os.getenv("INFERENCE_CHANNELS_LAST", "0"))
+
+# Micro-batching of concurrent forward passes, BATCH_MAX_SIZE=1 turns it off
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "8"))
+BATCH_MAX_WAIT_MS = float(os.getenv("BATCH_MAX_WAIT_MS", "10"))
+# Face detector: "mtcnn", "haar" (OpenCV's Haar cascade), "dnn" (an OpenCV DNN SSD such as res10_300x300_ssd, read
+# from FACE_DNN_MODEL/FACE_DNN_CONFIG) or "cascade", FACE_CASCADE_DETECTOR ("haar" or "dnn") first and MTCNN only on
+# the frames where it found nothing. FACE_MIN_SIZE is the smallest face in pixels any of them looks for.
+# Use Haar through "cascade" only: on its own it crops false positives (min IoU 0 against MTCNN in
+# FaceDetectorBackendBenchmark) and is hardly faster than MTCNN. "haar" alone is kept for that benchmark.
+FACE_DETECTOR = os.getenv("FACE_DETECTOR", "mtcnn")
+FACE_CASCADE_DETECTOR = os.getenv("FACE_CASCADE_DETECTOR", "haar")
+FACE_MIN_SIZE = int(os.getenv("FACE_MIN_SIZE", "20"))
+# Thresholds of MTCNN's three stages and the scale step of its image pyramid (smaller is faster, coarser)
+MTCNN_THRESHOLDS = [float(threshold) for threshold in os.getenv("MTCNN_THRESHOLDS", "0.6,0.7,0.7").split(",")]
+MTCNN_FACTOR = float(os.getenv("MTCNN_FACTOR", "0.709"))
+# Cascade file (a path, or a file name in OpenCV's bundled haarcascades) and detectMultiScale's parameters
+HAAR_CASCADE = os.getenv("HAAR_CASCADE", "haarcascade_frontalface_default.xml")
+HAAR_SCALE_FACTOR = float(os.getenv("HAAR_SCALE_FACTOR", "1.1"))
+HAAR_MIN_NEIGHBORS = int(os.getenv("HAAR_MIN_NEIGHBORS", "5"))
+FACE_DNN_MODEL = os.getenv("FACE_DNN_MODEL", "")
+FACE_DNN_CONFIG = os.getenv("FACE_DNN_CONFIG", "")
+FACE_DNN_CONFIDENCE = float(os.getenv("FACE_DNN_CONFIDENCE", "0.5"))
+# Face detection on every FACE_KEYFRAME_INTERVAL-th sampled frame only (1 detects on all of them). Boxes in between
+# are interpolated and tracked onto the face, and re-detected when the tracked box moved by more than
+# FACE_TRACK_MIN_IOU allows or lost the face
+FACE_KEYFRAME_INTERVAL = int(os.getenv("FACE_KEYFRAME_INTERVAL", "1"))
+FACE_TRACK_MIN_IOU = float(os.getenv("FACE_TRACK_MIN_IOU", "0.5"))
+# Longer side frames are downscaled to for face detection, 0 detects on the full frames. Faces are still cropped from
+# the full frames, but ones smaller than about 20 pixels at that size are missed
+FACE_DETECTION_MAX_SIDE = int(os.getenv("FACE_DETECTION_MAX_SIDE", "0"))
+# Preprocessed clip tensors kept for reuse, about the number of clips between face detection and the model at once
+CLIP_BUFFER_POOL_SIZE = int(os.getenv("CLIP_BUFFER_POOL_SIZE", "8"))
+
+# Background workers draining the detection_job table inside the API process, 0 leaves it to workers.DetectionWorker
+DETECT_JOB_WORKERS = int(os.getenv("DETECT_JOB_WORKERS", "1"))
+DETECT_JOB_POLL_SECONDS = float(os.getenv("DETECT_JOB_POLL_SECONDS", "1"))
+# A job in progress whose lease was not renewed for this long is queued again (its worker crashed or was killed).
+# Workers renew the lease of their running job every third of this
+DETECT_JOB_LEASE_SECONDS = float(os.getenv("DETECT_JOB_LEASE_SECONDS", "900"))
+
+# Near-duplicate lookup: max median per-frame dHash distance (out of 64 bits) to reuse a result, -1 turns it off.
+# Off by default: the hash is of whole frames, so a face-swapped copy of an already scored video matches its source
+# and would get the source's label. Only turn it on where re-uploads of the same video are far more common.
+FINGERPRINT_MAX_DISTANCE = int(os.getenv("FINGERPRINT_MAX_DISTANCE", "-1"))
+FINGERPRINT_REFRESH_SECONDS = float(os.getenv("FINGERPRINT_REFRESH_SECONDS", "30"))
+
+# Results of social media detections are reused for the same reel/tweet/video id for this long, 0 turns it off
+SOURCE_CACHE_TTL_SECONDS = float(os.getenv("SOURCE_CACHE_TTL_SECONDS", "86400"))
+
+# Direct uploads larger than this are rejected with a 413, they are written to UPLOAD_DIR in chunks of this size
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+
+# Shared connection pool for resolver calls and video downloads
+DOWNLOAD_MAX_CONNECTIONS = int(os.getenv("DOWNLOAD_MAX_CONNECTIONS", "20"))
+DOWNLOAD_MAX_BYTES = int(os.getenv("DOWNLOAD_MAX_BYTES", str(200 * 1024 * 1024)))
+DOWNLOAD_CHUNK_BYTES = int(os.getenv("DOWNLOAD_CHUNK_BYTES", str(256 * 1024)))
+DOWNLOAD_CONNECT_TIMEOUT_SECONDS = float(os.getenv("DOWNLOAD_CONNECT_TIMEOUT_SECONDS", "10"))
+# Longest pause between two chunks, and longest a whole download may take
+DOWNLOAD_READ_TIMEOUT_SECONDS = float(os.getenv("DOWNLOAD_READ_TIMEOUT_SECONDS", "30"))
+DOWNLOAD_TIMEOUT_SECONDS = float(os.getenv("DOWNLOAD_TIMEOUT_SECONDS", "120"))
+
+# Social media renditions: smallest one with at least this shorter side (pixels) is downloaded first, 0 takes the
+# resolver's first one. Larger ones, up to MEDIA_MAX_RENDITIONS in total, are only tried when no face is found.
+MEDIA_MIN_SHORT_SIDE = int(os.getenv("MEDIA_MIN_SHORT_SIDE", "360"))
+MEDIA_MAX_RENDITIONS = int(os.getenv("MEDIA_MAX_RENDITIONS", "3"))
+
+# 1 decodes faststart MP4 downloads through a FIFO while they are still arriving (POSIX only), in an analyse stage
+# slot held from the first chunk on. Off by default: the analysis is dropped when the exact cache answers, and the
+# slot is held for as long as the download takes. Ranged downloads (below) arrive out of order and are never
+# pipelined, so this only applies to files under DOWNLOAD_RANGE_MIN_BYTES or from servers without range support.
+PIPELINED_DOWNLOADS = int(os.getenv("PIPELINED_DOWNLOADS", "0"))
+
+# Files of at least DOWNLOAD_RANGE_MIN_BYTES from servers advertising Accept-Ranges are fetched as this many
+# concurrent byte ranges, each retried on its own. DOWNLOAD_RANGE_PARTS=1 keeps single stream downloads, which
+# PIPELINED_DOWNLOADS needs: a ranged download is only analysed once it is complete.
+DOWNLOAD_RANGE_PARTS = int(os.getenv("DOWNLOAD_RANGE_PARTS", "4"))
+DOWNLOAD_RANGE_MIN_BYTES = int(os.getenv("DOWNLOAD_RANGE_MIN_BYTES", str(8 * 1024 * 1024)))
+DOWNLOAD_RANGE_RETRIES = int(os.getenv("DOWNLOAD_RANGE_RETRIES", "2"))
+
+# Resolver (RapidAPI) answers are cached per canonical URL, failures for a shorter time
+RESOLVER_TIMEOUT_SECONDS = float(os.getenv("RESOLVER_TIMEOUT_SECONDS", "60"))
+RESOLVER_CACHE_TTL_SECONDS = float(os.getenv("RESOLVER_CACHE_TTL_SECONDS", "600"))
+RESOLVER_NEGATIVE_TTL_SECONDS = float(os.getenv("RESOLVER_NEGATIVE_TTL_SECONDS", "60"))
+RESOLVER_CACHE_SIZE = int(os.getenv("RESOLVER_CACHE_SIZE", "1024"))
+# A provider failing this many times in a row is skipped for RESOLVER_RESET_SECONDS, then probed with one call
+RESOLVER_FAILURE_THRESHOLD = int(os.getenv("RESOLVER_FAILURE_THRESHOLD", "5"))
+RESOLVER_RESET_SECONDS = float(os.getenv("RESOLVER_RESET_SECONDS", "30"))
+
+# Detections allowed in each stage of the shared pipeline at once, more wait their turn. Analysis and inference
+# are also bounded by the executor and the batch scheduler, these limits keep queued work from piling up on disk.
+STAGE_RESOLVE_CONCURRENCY = int(os.getenv("STAGE_RESOLVE_CONCURRENCY", "16"))
+STAGE_DOWNLOAD_CONCURRENCY = int(os.getenv("STAGE_DOWNLOAD_CONCURRENCY", "8"))
+STAGE_ANALYSE_CONCURRENCY = int(os.getenv("STAGE_ANALYSE_CONCURRENCY", "8"))
+STAGE_INFER_CONCURRENCY = int(os.getenv("STAGE_INFER_CONCURRENCY", "32"))
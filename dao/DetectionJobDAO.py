@@ -0,0 +1,94 @@
+from models.Video import Video
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from models.DetectionJob import DetectionJob
+
+
+class DetectionJobDAO:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_job_by_id(self, job_id: int):
+        return self.db.query(DetectionJob).filter(DetectionJob.job_id == job_id).first()
+
+    def create_job(self, job: DetectionJob):
+        self.db.add(job)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def claim_next_job(self):
+        # SKIP LOCKED lets any number of worker processes drain the table without handing out a job twice
+        job = (
+            self.db.query(DetectionJob)
+            .filter(DetectionJob.state == "queued")
+            .order_by(DetectionJob.job_id)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            self.db.rollback()
+            return None
+        job.state = "downloading" if job.filepath is None else "preprocessing"
+        job.updated_at = datetime.now(timezone.utc)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def requeue_stale_jobs(self, stale_before: datetime, requeue):
+        """
+        Jobs in progress that no worker moved on since stale_before, each updated with the fields requeue(job)
+        returns (see requeue_job). Returns how many there were.
+        """
+        jobs = (
+            self.db.query(DetectionJob)
+            .filter(DetectionJob.state.notin_(("queued", "done", "failed")))
+            .filter(DetectionJob.updated_at < stale_before)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        now = datetime.now(timezone.utc)
+        for job in jobs:
+            self.delete_unscored_video(job)
+            for key, value in requeue(job).items():
+                setattr(job, key, value)
+            job.updated_at = now
+        self.db.commit()
+        return len(jobs)
+
+    def renew_lease(self, job_id: int):
+        """
+        Moves updated_at of a job still in progress to now, so that requeue_stale_jobs leaves it to its worker.
+        """
+        (
+            self.db.query(DetectionJob)
+            .filter(DetectionJob.job_id == job_id)
+            .filter(DetectionJob.state.notin_(("queued", "done", "failed")))
+            .update({DetectionJob.updated_at: datetime.now(timezone.utc)}, synchronize_session=False)
+        )
+        self.db.commit()
+
+    def requeue_job(self, job: DetectionJob, **fields):
+        """
+        update_job for an interrupted job. The video its run registered without a prediction is dropped, so that
+        the next run can register it again.
+        """
+        self.delete_unscored_video(job)
+        return self.update_job(job, **fields)
+
+    def delete_unscored_video(self, job: DetectionJob):
+        if job.filepath:
+            (
+                self.db.query(Video)
+                .filter(Video.user_id == job.user_id, Video.filepath == job.filepath)
+                .filter(~Video.prediction.any())
+                .delete(synchronize_session=False)
+            )
+
+    def update_job(self, job: DetectionJob, **fields):
+        for key, value in fields.items():
+            setattr(job, key, value)
+        job.updated_at = datetime.now(timezone.utc)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
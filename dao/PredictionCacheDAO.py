@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Session
+from models.PredictionCache import PredictionCache
+
+
+class PredictionCacheDAO:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_hash(self, content_hash: str):
+        return self.db.query(PredictionCache).filter(PredictionCache.content_hash == content_hash).first()
+
+    def save(self, entry: PredictionCache):
+        entry = self.db.merge(entry)
+        self.db.commit()
+        return entry
+
+    def delete(self, entry: PredictionCache):
+        self.db.delete(entry)
+        self.db.commit()
@@ -0,0 +1,19 @@
+from sqlalchemy.orm import Session
+from models.SourceCache import SourceCache
+
+
+class SourceCacheDAO:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_by_key(self, source_key: str):
+        return self.db.query(SourceCache).filter(SourceCache.source_key == source_key).first()
+
+    def save(self, entry: SourceCache):
+        entry = self.db.merge(entry)
+        self.db.commit()
+        return entry
+
+    def delete(self, entry: SourceCache):
+        self.db.delete(entry)
+        self.db.commit()
@@ -0,0 +1,22 @@
+from sqlalchemy.orm import Session
+from models.VideoFingerprint import VideoFingerprint
+
+
+class VideoFingerprintDAO:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_fingerprints_after(self, fp_id: int, model_version: str):
+        return (
+            self.db.query(VideoFingerprint)
+            .filter(VideoFingerprint.fp_id > fp_id)
+            .filter(VideoFingerprint.model_version == model_version)
+            .order_by(VideoFingerprint.fp_id)
+            .all()
+        )
+
+    def create_fingerprint(self, fingerprint: VideoFingerprint):
+        self.db.add(fingerprint)
+        self.db.commit()
+        self.db.refresh(fingerprint)
+        return fingerprint
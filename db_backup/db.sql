@@ -521,6 +521,136 @@ ALTER TABLE ONLY public.video
     ADD CONSTRAINT video_fkey FOREIGN KEY (user_id) REFERENCES public."user"(user_id) ON DELETE CASCADE;
 
 
+--
+-- Name: detection_job; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.detection_job (
+    job_id bigint NOT NULL,
+    user_id bigint NOT NULL,
+    username character varying NOT NULL,
+    source character varying NOT NULL,
+    url character varying,
+    filename character varying,
+    filepath character varying,
+    content_hash character varying(64),
+    state character varying NOT NULL,
+    pred_id bigint,
+    pred_label character varying(5),
+    confidence character varying,
+    error character varying,
+    created_at timestamp with time zone NOT NULL,
+    updated_at timestamp with time zone NOT NULL
+);
+
+
+ALTER TABLE public.detection_job OWNER TO postgres;
+
+--
+-- Name: detection_job_job_id_seq; Type: SEQUENCE; Schema: public; Owner: postgres
+--
+
+CREATE SEQUENCE public.detection_job_job_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.detection_job_job_id_seq OWNER TO postgres;
+
+ALTER SEQUENCE public.detection_job_job_id_seq OWNED BY public.detection_job.job_id;
+
+ALTER TABLE ONLY public.detection_job ALTER COLUMN job_id SET DEFAULT nextval('public.detection_job_job_id_seq'::regclass);
+
+ALTER TABLE ONLY public.detection_job
+    ADD CONSTRAINT detection_job_pkey PRIMARY KEY (job_id);
+
+CREATE INDEX detection_job_state_idx ON public.detection_job USING btree (state, job_id);
+
+ALTER TABLE ONLY public.detection_job
+    ADD CONSTRAINT detection_job_fkey_user FOREIGN KEY (user_id) REFERENCES public."user"(user_id) ON DELETE CASCADE;
+
+ALTER TABLE ONLY public.detection_job
+    ADD CONSTRAINT detection_job_fkey_pred FOREIGN KEY (pred_id) REFERENCES public.prediction(pred_id) ON DELETE SET NULL;
+
+
+--
+-- Name: prediction_cache; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.prediction_cache (
+    content_hash character varying(64) NOT NULL,
+    model_version character varying NOT NULL,
+    pred_label character varying(5) NOT NULL,
+    confidence character varying NOT NULL,
+    created_at timestamp with time zone NOT NULL
+);
+
+
+ALTER TABLE public.prediction_cache OWNER TO postgres;
+
+ALTER TABLE ONLY public.prediction_cache
+    ADD CONSTRAINT prediction_cache_pkey PRIMARY KEY (content_hash);
+
+
+--
+-- Name: video_fingerprint; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.video_fingerprint (
+    fp_id bigint NOT NULL,
+    fingerprint character varying NOT NULL,
+    model_version character varying NOT NULL,
+    pred_label character varying(5) NOT NULL,
+    confidence character varying NOT NULL,
+    created_at timestamp with time zone NOT NULL
+);
+
+
+ALTER TABLE public.video_fingerprint OWNER TO postgres;
+
+CREATE SEQUENCE public.video_fingerprint_fp_id_seq
+    START WITH 1
+    INCREMENT BY 1
+    NO MINVALUE
+    NO MAXVALUE
+    CACHE 1;
+
+
+ALTER SEQUENCE public.video_fingerprint_fp_id_seq OWNER TO postgres;
+
+ALTER SEQUENCE public.video_fingerprint_fp_id_seq OWNED BY public.video_fingerprint.fp_id;
+
+ALTER TABLE ONLY public.video_fingerprint ALTER COLUMN fp_id SET DEFAULT nextval('public.video_fingerprint_fp_id_seq'::regclass);
+
+ALTER TABLE ONLY public.video_fingerprint
+    ADD CONSTRAINT video_fingerprint_pkey PRIMARY KEY (fp_id);
+
+CREATE INDEX video_fingerprint_model_version_idx ON public.video_fingerprint USING btree (model_version, fp_id);
+
+
+--
+-- Name: source_cache; Type: TABLE; Schema: public; Owner: postgres
+--
+
+CREATE TABLE public.source_cache (
+    source_key character varying NOT NULL,
+    model_version character varying NOT NULL,
+    extension character varying NOT NULL,
+    pred_label character varying(5) NOT NULL,
+    confidence character varying NOT NULL,
+    created_at timestamp with time zone NOT NULL
+);
+
+
+ALTER TABLE public.source_cache OWNER TO postgres;
+
+ALTER TABLE ONLY public.source_cache
+    ADD CONSTRAINT source_cache_pkey PRIMARY KEY (source_key);
+
+
 -- Completed on 2025-04-04 21:42:46
 
 --
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+
+
+class BatchMetricsResDto(BaseModel):
+    batches: int
+    clips: int
+    avg_batch_size: float
+    batch_size_histogram: dict[int, int]
+    queue_wait_ms_avg: float
+    queue_wait_ms_p95: float
+    queue_wait_ms_max: float
+    forward_ms_avg: float
+    max_batch_size: int
+    max_wait_ms: float
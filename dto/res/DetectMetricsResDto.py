@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from .StageMetricsResDto import StageMetricsResDto
+from .BatchMetricsResDto import BatchMetricsResDto
+from .DownloadMetricsResDto import DownloadMetricsResDto
+from .ResolverMetricsResDto import ResolverMetricsResDto
+
+
+class DetectMetricsResDto(BaseModel):
+    stages: dict[str, StageMetricsResDto]
+    batching: BatchMetricsResDto
+    downloads: DownloadMetricsResDto
+    resolvers: dict[str, ResolverMetricsResDto]
@@ -0,0 +1,15 @@
+from datetime import datetime
+from pydantic import BaseModel
+from .PredictionResDto import PredictionResDto
+
+
+class DetectionJobResDto(BaseModel):
+    job_id: int
+    source: str
+    url: str | None = None
+    state: str
+    message: str | None = None
+    error: str | None = None
+    prediction: PredictionResDto | None = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class DownloadMetricsResDto(BaseModel):
+    downloads: int
+    failures: int
+    too_large: int
+    ranged: int
+    range_fallbacks: int
+    bytes: int
+    avg_bytes_per_second: float
+    p50_bytes_per_second: float
+    p5_bytes_per_second: float
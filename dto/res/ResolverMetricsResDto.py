@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+
+
+class ResolverMetricsResDto(BaseModel):
+    state: str
+    consecutive_failures: int
+    calls: int
+    cache_hits: int
+    negative_hits: int
+    short_circuited: int
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+
+
+class StageMetricsResDto(BaseModel):
+    concurrency: int
+    running: int
+    waiting: int
+    completed: int
+    failed: int
+    avg_wait_ms: float
+    p50_ms: float
+    p95_ms: float
@@ -0,0 +1,101 @@
+import time
+import queue
+import torch
+import asyncio
+import threading
+from collections import deque, Counter
+from concurrent.futures import Future
+
+
+class BatchScheduler:
+    """
+    Collects clips from concurrent detections and runs them through the model in one forward pass.
+
+    A batch is closed when it reaches max_batch_size or when its oldest clip has waited max_wait_ms, whichever
+    comes first. forward_fn takes a [B, C, T, H, W] tensor and returns one row of class probabilities per clip.
+    """
+
+    def __init__(self, forward_fn, max_batch_size: int, max_wait_ms: float):
+        self.forward_fn = forward_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.batch_sizes = Counter()
+        self.queue_waits = deque(maxlen=1024)
+        self.forward_times = deque(maxlen=1024)
+
+    def submit(self, clip) -> Future:
+        self.ensure_started()
+        future = Future()
+        self.queue.put((clip, future, time.perf_counter()))
+        return future
+
+    async def infer(self, clip):
+        return await asyncio.wrap_future(self.submit(clip))
+
+    def ensure_started(self):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="batch-scheduler", daemon=True)
+                self.thread.start()
+
+    def next_batch(self):
+        batch = [self.queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = []
+            try:
+                # Futures of callers cancelled while queued are dropped, setting their result would raise
+                batch = [entry for entry in self.next_batch() if entry[1].set_running_or_notify_cancel()]
+                if batch:
+                    self.run_batch(batch)
+            except Exception as e:
+                # Nothing may end this thread: every detection after it would wait forever
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def run_batch(self, batch):
+        started = time.perf_counter()
+        probabilities = self.forward_fn(torch.cat([clip for clip, _, _ in batch]))
+        finished = time.perf_counter()
+
+        with self.lock:
+            self.batch_sizes[len(batch)] += 1
+            self.forward_times.append(finished - started)
+            self.queue_waits.extend(started - enqueued for _, _, enqueued in batch)
+
+        for i, (_, future, _) in enumerate(batch):
+            future.set_result(probabilities[i])
+
+    def metrics(self) -> dict:
+        with self.lock:
+            waits = sorted(self.queue_waits)
+            forward_times = list(self.forward_times)
+            batch_sizes = dict(self.batch_sizes)
+
+        batches = sum(batch_sizes.values())
+        clips = sum(size * count for size, count in batch_sizes.items())
+        return {
+            "batches": batches,
+            "clips": clips,
+            "avg_batch_size": round(clips / batches, 2) if batches else 0.0,
+            "batch_size_histogram": batch_sizes,
+            "queue_wait_ms_avg": round(sum(waits) / len(waits) * 1000, 2) if waits else 0.0,
+            "queue_wait_ms_p95": round(waits[int(len(waits) * 0.95)] * 1000, 2) if waits else 0.0,
+            "queue_wait_ms_max": round(waits[-1] * 1000, 2) if waits else 0.0,
+            "forward_ms_avg": round(sum(forward_times) / len(forward_times) * 1000, 2) if forward_times else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -0,0 +1,57 @@
+import torch
+import threading
+import numpy as np
+from torchvision.transforms.functional import resize
+
+
+class ClipBufferPool:
+    """
+    Reusable [1, C, T, H, W] model inputs, so that preprocessing a clip does not allocate a new one every time.
+
+    acquire() hands a buffer out and release() gives it back once nothing reads it anymore (the batch scheduler
+    copies clips into its batch, so once its answer is in). A buffer that is never released is garbage collected
+    like any tensor, and so are released ones beyond max_size.
+    """
+
+    def __init__(self, shape: tuple, max_size: int, device: str):
+        self.shape = tuple(shape)
+        self.max_size = max_size
+        self.device = torch.device(device)
+        self.free = []
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            if self.free:
+                return self.free.pop()
+        return torch.empty(self.shape, device=self.device)
+
+    def release(self, buffer):
+        if tuple(buffer.shape) != self.shape or buffer.device != self.device:
+            return
+        with self.lock:
+            if len(self.free) < self.max_size:
+                self.free.append(buffer)
+
+
+def face_pixels(faces):
+    """
+    uint8 pixels of float MTCNN faces ([N, H, W, C], in [-1, 1]) the way transforms.ToPILImage converts float
+    images, which is what the model was trained on: scaled by 255 and cast, so negative values wrap around.
+    """
+    return (faces * 255).astype(np.uint8)
+
+
+def clip_tensor(crops, out, mean, std):
+    """
+    Writes the clip of crops, a [T, H, W, C] uint8 array, into out, a [1, C, T, H, W] float tensor, normalised with
+    the per-channel mean and std, and returns out. Matches ToPILImage -> Resize -> ToTensor -> Normalize applied
+    frame by frame. Crops of another size than out are resized first, bilinear with antialiasing.
+    """
+    pixels = torch.from_numpy(crops).to(out.device).permute(3, 0, 1, 2)
+    if pixels.shape[-2:] != out.shape[-2:]:
+        pixels = resize(pixels, list(out.shape[-2:]), antialias=True)
+    out[0].copy_(pixels)
+    mean = torch.tensor(mean, dtype=out.dtype, device=out.device).view(1, -1, 1, 1, 1)
+    std = torch.tensor(std, dtype=out.dtype, device=out.device).view(1, -1, 1, 1, 1)
+    return out.div_(255).sub_(mean).div_(std)
@@ -0,0 +1,52 @@
+import time
+import torch
+import warnings
+
+COMPILE_MODES = ("eager", "trace", "compile")
+
+
+def compile_model(model: torch.nn.Module, mode: str, example_input: torch.Tensor):
+    """
+    Optimised callable for model (in eval mode) on inputs shaped like example_input.
+
+    "trace" records a TorchScript trace and freezes it, folding the weights into the graph as constants. MViT
+    only branches on the clip size, which is fixed, so the trace holds for any batch size.
+    "compile" wraps the model in torch.compile. It compiles lazily, on the first call per input shape, and needs a
+    Python version Dynamo supports: elsewhere the model is run eagerly with a warning.
+    Tracing records the autocast state active at the time, so trace under the same autocast as inference runs in.
+    """
+    if mode not in COMPILE_MODES:
+        raise ValueError(f"Unknown compile mode {mode}, expected one of {COMPILE_MODES}")
+    if mode == "eager":
+        return model
+    if isinstance(model, torch.nn.DataParallel):
+        warnings.warn(f"INFERENCE_COMPILE={mode} is not supported with DataParallel, running the model eagerly")
+        return model
+
+    if mode == "trace":
+        with torch.no_grad():
+            # No trace check: under autocast the cast weights are captured as constants and never compare equal,
+            # outputs are compared with the eager model by the benchmarks instead
+            traced = torch.jit.trace(model, example_input, check_trace=False)
+        return torch.jit.freeze(traced)
+
+    try:
+        return torch.compile(model)
+    except RuntimeError as e:
+        warnings.warn(f"torch.compile is unavailable ({e}), running the model eagerly")
+        return model
+
+
+def warm_up(forward_fn, clip_shape: tuple, batch_sizes, passes: int, device: str):
+    """
+    Runs forward_fn passes times on a zero batch of each size. Returns the seconds each pass took, per batch size.
+    """
+    timings = {}
+    for batch_size in batch_sizes:
+        batch = torch.zeros(batch_size, *clip_shape, device=device)
+        timings[batch_size] = []
+        for _ in range(passes):
+            started = time.perf_counter()
+            forward_fn(batch)
+            timings[batch_size].append(time.perf_counter() - started)
+    return timings
@@ -0,0 +1,63 @@
+import os
+import torch
+from torchvision.models.video import mvit_v2_s
+
+MODEL_PATH = os.path.join("trained_model", "best_multi_6k_allaugs_mvit_mtcnn.pth")
+INPUT_SIZE = (224, 224)
+CLIP_LENGTH = 16
+
+
+# Model class consistent with training
+class MViTForDeepfakes(torch.nn.Module):
+    def __init__(self, num_classes=2):
+        super().__init__()
+        # Same architecture as training, whose Kinetics pretrained weights the checkpoint overwrites anyway: building
+        # without them keeps startup offline
+        self.backbone = mvit_v2_s(weights=None)
+        self.backbone.head = torch.nn.Sequential(
+            torch.nn.Dropout(0.5),
+            torch.nn.Linear(self.backbone.head[-1].in_features, num_classes)
+        )
+
+    def forward(self, x):
+        return self.backbone(x)
+
+
+def load_checkpoint(model_path: str, device: str):
+    # Memory-mapped: tensors are paged in from the file on use, not read and copied up front
+    try:
+        return torch.load(model_path, map_location=device, mmap=True)
+    except RuntimeError:
+        # Checkpoints in the legacy (pre zip) format cannot be memory-mapped
+        return torch.load(model_path, map_location=device)
+
+
+def load_model(model_path: str, device: str):
+    # Load model with proper checkpoint handling
+    checkpoint = load_checkpoint(model_path, device)
+
+    # Extract state_dict from checkpoint (training saved it as a dict with 'model_state_dict')
+    if 'model_state_dict' in checkpoint:
+        state_dict = checkpoint['model_state_dict']
+    else:
+        state_dict = checkpoint
+
+    # Remove 'module.' prefix if present (due to DataParallel in training)
+    if list(state_dict.keys())[0].startswith("module."):
+        state_dict = {k.replace("module.", ""): v for k, v in state_dict.items()}
+
+    # Built on the meta device, skipping the random initialisation, when the checkpoint has every weight: the
+    # module then takes the checkpoint tensors as they are, memory-mapped ones included, instead of copying them
+    with torch.device("meta"):
+        model = MViTForDeepfakes()
+    if set(model.state_dict()) <= set(state_dict):
+        model.load_state_dict(state_dict, strict=False, assign=True)
+    else:
+        model = MViTForDeepfakes()
+        model.load_state_dict(state_dict, strict=False)  # Use strict=False to handle potential mismatches
+
+    if torch.cuda.device_count() > 1:
+        model = torch.nn.DataParallel(model)
+
+    model.to(device).eval()
+    return model
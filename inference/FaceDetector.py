@@ -0,0 +1,54 @@
+import numpy as np
+from abc import ABC, abstractmethod
+from facenet_pytorch import fixed_image_standardization
+from facenet_pytorch.models.utils.detect_face import extract_face
+
+
+class FaceDetector(ABC):
+    """
+    Finds the face to crop in each frame of a clip. DetectServiceImpl only talks to the face stage through this,
+    FACE_DETECTOR picks the implementation. Boxes are [1, 4] float arrays (x1, y1, x2, y2) in frame pixels, None
+    where there is no face. Faces are cropped the way MTCNN crops them, whichever detector found the box.
+    """
+
+    name: str
+
+    def __init__(self, image_size: int, margin: int):
+        self.image_size = image_size
+        self.margin = margin
+
+    @abstractmethod
+    def detect(self, frames: list) -> list:
+        """
+        Box of the face to crop (the largest one) in each RGB frame, or None.
+        """
+        pass
+
+    def refine(self, frames: list, boxes: list) -> list:
+        """
+        Each box moved onto the face around it, None where there is no face there anymore (used for tracking).
+        Runs detect on the area around each box, twice its size.
+        """
+        refined = []
+        for frame, box in zip(frames, boxes):
+            x1, y1, x2, y2 = box[0, :4]
+            width, height = x2 - x1, y2 - y1
+            left, top = int(max(x1 - width / 2, 0)), int(max(y1 - height / 2, 0))
+            right, bottom = int(min(x2 + width / 2, frame.shape[1])), int(min(y2 + height / 2, frame.shape[0]))
+            found = self.detect([frame[top:bottom, left:right]])[0] if right > left and bottom > top else None
+            refined.append(None if found is None else found + np.array([left, top, left, top], dtype=np.float32))
+        return refined
+
+    def extract(self, frames: list, boxes: list) -> list:
+        """
+        image_size x image_size face crops as HWC float arrays, standardised like MTCNN's output (about [-1, 1]),
+        with margin pixels (of the crop) of context around the box. None where there is no box.
+        """
+        faces = []
+        for frame, box in zip(frames, boxes):
+            if box is None:
+                faces.append(None)
+                continue
+            face = fixed_image_standardization(extract_face(frame, box[0, :4], self.image_size, self.margin))
+            faces.append(face.permute(1, 2, 0).numpy())
+        return faces
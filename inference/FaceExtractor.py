@@ -0,0 +1,145 @@
+import cv2
+import numpy as np
+
+
+def box_iou(a, b):
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    return intersection / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - intersection)
+
+
+def downscale(frame, max_side: int):
+    """
+    frame shrunk so that its longer side is max_side at most (unchanged when max_side is 0), for face detection.
+    """
+    scale = max_side / max(frame.shape[:2]) if max_side > 0 else 1.0
+    if scale >= 1.0:
+        return frame
+    size = (max(1, round(frame.shape[1] * scale)), max(1, round(frame.shape[0] * scale)))
+    return cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+
+
+def detect_boxes(face_detector, frames, max_side: int = 0):
+    """
+    Box of the face the detector picks in each frame, as a [1, 4] array, or None where it found none. With max_side,
+    detection runs on copies of the frames downscaled to it; the boxes are mapped back to the frames' own
+    coordinates and refined there, so faces are still cropped from the full resolution frames.
+    """
+    inputs = [downscale(frame, max_side) for frame in frames]
+    boxes, scaled = [], []
+    for i, (frame, image, box) in enumerate(zip(frames, inputs, face_detector.detect(inputs))):
+        if box is not None and image is not frame:
+            scale_x, scale_y = frame.shape[1] / image.shape[1], frame.shape[0] / image.shape[0]
+            box = box[:, :4].astype(np.float32) * np.array([scale_x, scale_y, scale_x, scale_y], dtype=np.float32)
+            scaled.append(i)
+        boxes.append(box)
+
+    if scaled:
+        # Refined again on the full frames: a box found at low resolution is off by a few pixels there
+        refined = face_detector.refine([frames[i] for i in scaled], [boxes[i] for i in scaled])
+        for i, box in zip(scaled, refined):
+            if box is not None:
+                boxes[i] = box
+    return boxes
+
+
+def crop_faces(face_detector, frames, boxes):
+    return face_detector.extract(list(frames), boxes)
+
+
+def extract_faces(face_detector, frames, max_side: int = 0):
+    """
+    Run the face detector over the whole clip in one batched call.
+
+    Returns one entry per frame: the cropped face as an HWC numpy array, or None where no face was found.
+    """
+    if not frames:
+        return []
+
+    return crop_faces(face_detector, frames, detect_boxes(face_detector, frames, max_side))
+
+
+def track_faces(face_detector, frames, keyframe_interval: int, min_iou: float, max_side: int = 0):
+    """
+    extract_faces for the frames of one video, running the full detector on keyframes only: every
+    keyframe_interval-th frame and the last one. When both keyframes around a frame found a face, the box
+    interpolated between theirs is tracked onto the face by the detector's refine. The tracked box is kept when the
+    detector still finds a face there and it overlaps the interpolated one by min_iou, otherwise the frame is
+    detected again (the face moved too far, or there is none). When neither keyframe found a face, the
+    frames in between have none either; when only one did, they are detected again.
+    """
+    if not frames:
+        return []
+    if keyframe_interval <= 1 or any(frame.shape != frames[0].shape for frame in frames):
+        return extract_faces(face_detector, frames, max_side)
+
+    keyframes = sorted(set(range(0, len(frames), keyframe_interval)) | {len(frames) - 1})
+    boxes = [None] * len(frames)
+    for i, box in zip(keyframes, detect_boxes(face_detector, [frames[i] for i in keyframes], max_side)):
+        boxes[i] = box
+
+    track_between(face_detector, frames, boxes, zip(keyframes, keyframes[1:]), min_iou, max_side)
+    return crop_faces(face_detector, frames, boxes)
+
+
+def track_stream(face_detector, frames, length: int, keyframe_interval: int, min_iou: float, max_side: int = 0):
+    """
+    track_faces on an iterable of length frames that are still being decoded: each keyframe is detected, and the
+    frames since the previous one tracked, as soon as it arrives, so detection overlaps with decoding.
+    Returns (frames, faces), or None when the iterable did not hold length frames.
+    """
+    keyframe_interval = max(keyframe_interval, 1)
+    received, boxes = [], []
+    previous = None
+    mixed = False
+    for i, frame in enumerate(frames):
+        received.append(frame)
+        boxes.append(None)
+        # Frames of different sizes are left to track_faces once they are all there
+        mixed = mixed or frame.shape != received[0].shape
+        if mixed or (i % keyframe_interval and i != length - 1):
+            continue
+        boxes[i] = detect_boxes(face_detector, [frame], max_side)[0]
+        if previous is not None:
+            track_between(face_detector, received, boxes, [(previous, i)], min_iou, max_side)
+        previous = i
+
+    if len(received) != length:
+        return None
+    if mixed:
+        return received, track_faces(face_detector, received, keyframe_interval, min_iou, max_side)
+    return received, crop_faces(face_detector, received, boxes)
+
+
+def track_between(face_detector, frames, boxes, segments, min_iou: float, max_side: int = 0):
+    """
+    Fills in boxes between the (start, end) keyframes of each segment, whose boxes are already detected, the way
+    track_faces describes.
+    """
+    tracked, redetect = [], []
+    for start, end in segments:
+        if boxes[start] is None and boxes[end] is None:
+            continue
+        if boxes[start] is None or boxes[end] is None:
+            redetect.extend(range(start + 1, end))
+            continue
+        for i in range(start + 1, end):
+            weight = (i - start) / (end - start)
+            boxes[i] = (1 - weight) * boxes[start][:, :4] + weight * boxes[end][:, :4]
+            tracked.append(i)
+
+    if tracked:
+        refined = face_detector.refine([frames[i] for i in tracked], [boxes[i] for i in tracked])
+        for i, box in zip(tracked, refined):
+            if box is not None and box_iou(boxes[i][0], box[0]) >= min_iou:
+                boxes[i] = box
+            else:
+                boxes[i] = None
+                redetect.append(i)
+
+    if redetect:
+        for i, box in zip(redetect, detect_boxes(face_detector, [frames[i] for i in redetect], max_side)):
+            boxes[i] = box
@@ -0,0 +1,168 @@
+import cv2
+import threading
+import numpy as np
+
+# Frames this flat (grey-level std) hash to ~0 whatever the video is, so they are left out of fingerprints
+MIN_FRAME_STD = 4.0
+MIN_FINGERPRINT_FRAMES = 4
+SCAN_CHUNK = 2048
+# Rows the index arrays are first allocated with, they double whenever they are full
+INITIAL_CAPACITY = 1024
+# Rows added since the last band index rebuild are scanned exhaustively, the band index is rebuilt past this many
+UNINDEXED_LIMIT = 4096
+BANDS = 4
+POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def dhash(frame):
+    """
+    64-bit difference hash of an RGB frame: sign of the horizontal gradient on a 9x8 grey thumbnail.
+    """
+    grey = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    if grey.std() < MIN_FRAME_STD:
+        return None
+    thumbnail = cv2.resize(grey, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (thumbnail[:, 1:] > thumbnail[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def video_fingerprint(frames):
+    """
+    Per-frame dHashes of the sampled frames, or None when too few frames carry enough detail to be compared.
+    """
+    hashes = [h for h in (dhash(frame) for frame in frames) if h is not None]
+    if len(hashes) < MIN_FINGERPRINT_FRAMES:
+        return None
+    return np.array(hashes, dtype=np.uint64)
+
+
+def encode_fingerprint(fingerprint):
+    return "".join(f"{int(h):016x}" for h in fingerprint)
+
+
+def decode_fingerprint(value: str):
+    return np.array([int(value[i:i + 16], 16) for i in range(0, len(value), 16)], dtype=np.uint64)
+
+
+class FingerprintIndex:
+    """
+    In-memory index of scored videos for near-duplicate lookup.
+
+    The distance between two videos is the median, over the query frames, of the Hamming distance to the closest
+    frame of the candidate. Matching frames to their nearest neighbour instead of by position keeps trimmed
+    re-uploads, whose sampled frames shift, within reach.
+
+    Candidates are pre-selected multi-index style: every frame hash is split into four 16-bit bands, kept in sorted
+    arrays, and only videos sharing at least one exact band with a query frame are scored. Near-duplicates share
+    bands on almost every frame, so this trades a negligible recall loss for lookups that do not grow with the
+    index. Rows added since the last rebuild are always scored.
+    """
+
+    def __init__(self, max_distance: int, frames_per_video: int):
+        self.max_distance = max_distance
+        self.frames_per_video = frames_per_video
+        self.lock = threading.Lock()
+        self.ids = []
+        self.known_ids = set()
+        self.results = []
+        # Rows [:row_count] are in use, the rest is spare capacity
+        self.hashes = np.zeros((0, frames_per_video), dtype=np.uint64)
+        self.valid = np.zeros((0, frames_per_video), dtype=bool)
+        self.row_count = 0
+        self.bands = []
+        self.indexed_rows = 0
+        self.last_loaded_id = 0
+        self.loaded_at = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, entry_id: int, fingerprint, result):
+        self.add_many([(entry_id, fingerprint, result)])
+
+    def add_many(self, entries):
+        with self.lock:
+            entries = [entry for entry in entries if entry[0] not in self.known_ids]
+            if not entries:
+                return
+            self.reserve(self.row_count + len(entries))
+            for row, (entry_id, fingerprint, result) in enumerate(entries, start=self.row_count):
+                fingerprint = fingerprint[:self.frames_per_video]
+                self.hashes[row, :len(fingerprint)] = fingerprint
+                self.valid[row, :len(fingerprint)] = True
+                self.ids.append(entry_id)
+                self.known_ids.add(entry_id)
+                self.results.append(result)
+            self.row_count += len(entries)
+            if self.row_count - self.indexed_rows > UNINDEXED_LIMIT:
+                self.build_bands()
+
+    def reserve(self, rows: int):
+        """
+        Grows the arrays to hold at least rows rows, doubling them so that adding one video at a time stays
+        amortised O(1). Lookups keep reading the arrays they took before a grow, rows past row_count are never
+        part of what they read.
+        """
+        capacity = len(self.hashes)
+        if rows <= capacity:
+            return
+        capacity = max(rows, 2 * capacity, INITIAL_CAPACITY)
+        hashes = np.zeros((capacity, self.frames_per_video), dtype=np.uint64)
+        valid = np.zeros((capacity, self.frames_per_video), dtype=bool)
+        hashes[:self.row_count] = self.hashes[:self.row_count]
+        valid[:self.row_count] = self.valid[:self.row_count]
+        self.hashes, self.valid = hashes, valid
+
+    def build_bands(self):
+        hashes, valid = self.hashes[:self.row_count], self.valid[:self.row_count]
+        rows = np.broadcast_to(np.arange(self.row_count)[:, None], hashes.shape)[valid]
+        values = hashes[valid]
+        self.bands = []
+        for band in range(BANDS):
+            band_values = ((values >> np.uint64(16 * band)) & np.uint64(0xFFFF)).astype(np.uint16)
+            order = np.argsort(band_values, kind="stable")
+            self.bands.append((band_values[order], rows[order]))
+        self.indexed_rows = self.row_count
+
+    def candidates(self, query, bands, indexed_rows, total_rows):
+        found = [np.arange(indexed_rows, total_rows)]
+        for band, (band_values, band_rows) in enumerate(bands):
+            keys = ((query >> np.uint64(16 * band)) & np.uint64(0xFFFF)).astype(np.uint16)
+            starts = np.searchsorted(band_values, keys, side="left")
+            ends = np.searchsorted(band_values, keys, side="right")
+            found.extend(band_rows[start:end] for start, end in zip(starts, ends) if end > start)
+        return np.unique(np.concatenate(found))
+
+    def distances(self, query, hashes, valid):
+        distances = np.empty(len(hashes))
+        # Chunked so the [chunk, Q, F] intermediate stays a few MB whatever the candidate count
+        for start in range(0, len(hashes), SCAN_CHUNK):
+            chunk, chunk_valid = hashes[start:start + SCAN_CHUNK], valid[start:start + SCAN_CHUNK]
+            xor = chunk[:, None, :] ^ query[None, :, None]
+            bits = POPCOUNT[xor.view(np.uint8)].reshape(*xor.shape, 8).sum(axis=-1, dtype=np.uint16)
+            bits[~np.broadcast_to(chunk_valid[:, None, :], bits.shape)] = 64
+            distances[start:start + SCAN_CHUNK] = np.median(bits.min(axis=2), axis=1)
+        return distances
+
+    def lookup(self, fingerprint):
+        """
+        Returns (result, distance) of the closest indexed video within max_distance, or None.
+        """
+        if fingerprint is None or self.max_distance < 0:
+            return None
+        with self.lock:
+            hashes, valid = self.hashes[:self.row_count], self.valid[:self.row_count]
+            bands, indexed_rows = self.bands, self.indexed_rows
+        if len(hashes) == 0:
+            return None
+
+        query = fingerprint[:self.frames_per_video]
+        rows = self.candidates(query, bands, indexed_rows, len(hashes))
+        if len(rows) == 0:
+            return None
+        distances = self.distances(query, hashes[rows], valid[rows])
+        best = int(np.argmin(distances))
+        if distances[best] > self.max_distance:
+            return None
+        with self.lock:
+            return self.results[rows[best]], float(distances[best])
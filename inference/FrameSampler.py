@@ -0,0 +1,106 @@
+import cv2
+import numpy as np
+
+# Past this many frames between two targets it is cheaper to seek than to grab through the gap
+SEEK_THRESHOLD = 48
+
+
+def sample_frames(video_path, clip_length, seekable=True):
+    """
+    Decode only the frames that end up in the clip.
+
+    Returns at most clip_length RGB frames evenly spread over the video. Containers that report a frame count
+    are sampled by seeking / grabbing to the target indices, the rest go through a bounded streaming pass.
+    seekable=False is for pipes: frames are only ever grabbed in order and the source is never reopened.
+    """
+    if not seekable:
+        return list(stream_frames(video_path, clip_length))
+
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return []
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if frame_count > 0 and fps > 0:
+            frames = list(_sample_by_index(cap, frame_count, clip_length, SEEK_THRESHOLD))
+            if frames:
+                return frames
+            # The reported frame count was wrong (broken index), start over with a streaming pass
+            cap.release()
+            cap = cv2.VideoCapture(video_path)
+        return _sample_streaming(cap, clip_length)
+    finally:
+        cap.release()
+
+
+def stream_frames(video_path, clip_length):
+    """
+    sample_frames for pipes, as a generator: when the container reports a frame count, each frame is yielded as
+    soon as it is decoded, so that the caller can work on it while the rest of the video is still arriving.
+    The streaming pass only knows its frames once the whole video went through.
+    """
+    cap = cv2.VideoCapture(video_path)
+    try:
+        if not cap.isOpened():
+            return
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if frame_count > 0 and fps > 0:
+            yield from _sample_by_index(cap, frame_count, clip_length, None)
+        else:
+            yield from _sample_streaming(cap, clip_length)
+    finally:
+        cap.release()
+
+
+def _sample_by_index(cap, frame_count, clip_length, seek_threshold):
+    targets = np.unique(np.linspace(0, frame_count - 1, clip_length, dtype=int))
+    position = 0
+
+    for target in targets:
+        if seek_threshold is not None and target - position > seek_threshold:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, int(target))
+            position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
+        # grab() demuxes and decodes without the colour conversion / copy done by retrieve()
+        while position < target:
+            if not cap.grab():
+                return
+            position += 1
+        ret, frame = cap.read()
+        if not ret:
+            # Frame count is only an estimate for some containers, keep what we have
+            return
+        position += 1
+        yield cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+
+def _sample_streaming(cap, clip_length):
+    """
+    Single pass for containers without a usable frame count.
+
+    Keeps every stride-th frame in a buffer of at most 2 * clip_length entries. When the buffer fills up every
+    other frame is dropped and the stride doubles, so the kept frames stay evenly spaced and memory stays bounded.
+    """
+    capacity = 2 * clip_length
+    buffer = []
+    stride = 1
+    index = 0
+
+    while True:
+        if not cap.grab():
+            break
+        if index % stride == 0:
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            buffer.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if len(buffer) >= capacity:
+                buffer = buffer[::2]
+                stride *= 2
+        index += 1
+
+    if len(buffer) > clip_length:
+        idxs = np.linspace(0, len(buffer) - 1, clip_length, dtype=int)
+        buffer = [buffer[i] for i in idxs]
+    return buffer
@@ -0,0 +1,18 @@
+import torch
+from abc import ABC, abstractmethod
+
+
+class InferenceBackend(ABC):
+    """
+    Runs the deepfake classifier on a batch of preprocessed clips. DetectServiceImpl only talks to the model through
+    this, INFERENCE_BACKEND picks the implementation.
+    """
+
+    name: str
+
+    @abstractmethod
+    def forward(self, batch: torch.Tensor) -> torch.Tensor:
+        """
+        Class logits [B, 2] for a [B, C, T, H, W] batch.
+        """
+        pass
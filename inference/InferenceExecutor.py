@@ -0,0 +1,46 @@
+import asyncio
+import functools
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from config.detection import INFERENCE_EXECUTOR, INFERENCE_WORKERS, TORCH_NUM_THREADS
+
+_executor = None
+
+
+def init_worker(num_threads: int):
+    import torch
+    if num_threads > 0:
+        torch.set_num_threads(num_threads)
+
+
+def get_executor():
+    """
+    Pool that runs decoding and face detection away from the event loop (the forward pass goes to the batch
+    scheduler).
+    """
+    global _executor
+    if _executor is None:
+        if INFERENCE_EXECUTOR == "process":
+            # spawn instead of fork: forking a process that already started torch's thread pools can deadlock
+            _executor = ProcessPoolExecutor(
+                max_workers=INFERENCE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=init_worker,
+                initargs=(TORCH_NUM_THREADS,),
+            )
+        else:
+            init_worker(TORCH_NUM_THREADS)
+            _executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix="inference")
+    return _executor
+
+
+async def run_inference(fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), functools.partial(fn, *args))
+
+
+def shutdown_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
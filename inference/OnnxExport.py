@@ -0,0 +1,80 @@
+"""
+Exports the deepfake classifier to ONNX for INFERENCE_BACKEND=onnxruntime. Run once per checkpoint, offline:
+
+python -m inference.OnnxExport [--checkpoint trained_model/best_multi_6k_allaugs_mvit_mtcnn.pth] [--output path]
+                               [--opset 17]
+
+The clip shape is fixed and the batch dimension dynamic (MViT's pooling only exports correctly that way). The
+checkpoint's SHA-256 is recorded in the model's metadata, OnnxRuntimeBackend refuses the export once the checkpoint
+changes. Needs the onnx package (requirements-onnx.txt). When onnxruntime is installed the export is checked
+against the PyTorch model on a random batch.
+"""
+import gc
+import os
+import time
+import torch
+import argparse
+from ingest.UploadIngest import file_sha256
+from config.detection import ONNX_MODEL_PATH
+from inference.impl.OnnxRuntimeBackend import CHECKPOINT_METADATA_KEY
+from inference.DeepfakeModel import MODEL_PATH, INPUT_SIZE, CLIP_LENGTH, load_model
+
+CLIP_SHAPE = (3, CLIP_LENGTH, *INPUT_SIZE)
+
+
+def export_onnx(model: torch.nn.Module, output_path: str, checkpoint_hash: str, opset: int = 17):
+    try:
+        import onnx
+    except ImportError as e:
+        raise RuntimeError("Exporting needs the onnx package (pip install -r requirements-onnx.txt)") from e
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    partial_path = f"{output_path}.partial"
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            torch.zeros(1, *CLIP_SHAPE),
+            partial_path,
+            input_names=["clips"],
+            output_names=["logits"],
+            dynamic_axes={"clips": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=opset,
+            do_constant_folding=True,
+        )
+    exported = onnx.load(partial_path)
+    onnx.helper.set_model_props(exported, {CHECKPOINT_METADATA_KEY: checkpoint_hash})
+    onnx.save(exported, partial_path)
+    del exported
+    os.replace(partial_path, output_path)
+    # The exporter leaves large graph structures behind, release them before the model is run again
+    gc.collect()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checkpoint", default=MODEL_PATH)
+    parser.add_argument("--output", default=ONNX_MODEL_PATH)
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    model = load_model(args.checkpoint, "cpu")
+    checkpoint_hash = file_sha256(args.checkpoint)
+    started = time.perf_counter()
+    export_onnx(model, args.output, checkpoint_hash, args.opset)
+    print(f"Exported {args.checkpoint} to {args.output} in {time.perf_counter() - started:.0f} s "
+          f"({os.path.getsize(args.output) / 1e6:.1f} MB)")
+
+    try:
+        from inference.impl.OnnxRuntimeBackend import OnnxRuntimeBackend
+        backend = OnnxRuntimeBackend(args.output, checkpoint_hash=checkpoint_hash)
+    except RuntimeError as e:
+        print(f"Export not checked: {e}")
+        return
+    batch = torch.randn(1, *CLIP_SHAPE)
+    with torch.no_grad():
+        expected = model(batch)
+    print(f"Largest logit difference from PyTorch: {(backend.forward(batch) - expected).abs().max().item():.2e}")
+
+
+if __name__ == "__main__":
+    main()
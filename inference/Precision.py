@@ -0,0 +1,39 @@
+import torch
+import warnings
+from torch.amp import autocast
+
+PRECISIONS = {"fp32": torch.float32, "bf16": torch.bfloat16, "fp16": torch.float16}
+
+
+class PrecisionPolicy:
+    """
+    Numeric format of the forward pass on device: autocast to bf16 or fp16 for that device's type (fp32 runs without
+    autocast), and optionally channels-last-3d (NDHWC) weights and clips, which lets oneDNN pick its blocked
+    convolution kernels.
+    "auto" keeps the historical behaviour: fp16 autocast on CUDA, fp32 on CPU.
+    """
+
+    def __init__(self, precision: str, device: str, channels_last: bool = False):
+        self.device_type = torch.device(device).type
+        if precision == "auto":
+            precision = "fp16" if self.device_type == "cuda" else "fp32"
+        if precision not in PRECISIONS:
+            raise ValueError(f"Unknown precision {precision}, expected auto or one of {', '.join(PRECISIONS)}")
+        if precision == "fp16" and self.device_type == "cpu":
+            # MViT's LayerNorm has no Half kernel on CPU
+            warnings.warn("fp16 is not supported on CPU, running in fp32, bf16 is the CPU alternative")
+            precision = "fp32"
+        if precision == "bf16" and self.device_type == "cpu" and not torch.ops.mkldnn._is_mkldnn_bf16_supported():
+            warnings.warn("This CPU has no native bf16 instructions (AVX512-BF16/AMX), bf16 will be slower than fp32")
+        self.precision = precision
+        self.dtype = PRECISIONS[precision]
+        self.channels_last = channels_last
+
+    def autocast(self):
+        return autocast(device_type=self.device_type, dtype=self.dtype, enabled=self.precision != "fp32")
+
+    def prepare_model(self, model: torch.nn.Module):
+        return model.to(memory_format=torch.channels_last_3d) if self.channels_last else model
+
+    def prepare_input(self, batch: torch.Tensor):
+        return batch.contiguous(memory_format=torch.channels_last_3d) if self.channels_last else batch
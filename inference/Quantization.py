@@ -0,0 +1,63 @@
+import os
+import copy
+import torch
+from torch.ao.quantization import get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+
+QUANTIZATION_MODES = ("none", "dynamic", "static")
+
+
+def quantize_dynamic(model: torch.nn.Module):
+    """
+    int8 weights for every Linear layer, activations quantized on the fly. Most of MViT's compute is in the
+    attention and MLP projections, so this covers the bulk of it without calibration.
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def quantize_static(model: torch.nn.Module, example_input: torch.Tensor, calibration_clips):
+    """
+    FX graph mode post-training quantization: observers record activation ranges over calibration_clips, an iterable
+    of [1, C, T, H, W] clips, then every supported op runs in int8.
+    """
+    prepared = prepare_fx(copy.deepcopy(model), get_default_qconfig_mapping(torch.backends.quantized.engine),
+                          (example_input,))
+    calibrated = 0
+    with torch.no_grad():
+        for clip in calibration_clips:
+            prepared(clip)
+            calibrated += 1
+    if calibrated == 0:
+        raise ValueError("Static quantization needs at least one calibration clip")
+    return convert_fx(prepared)
+
+
+def quantized_model_path(cache_dir: str, model_version: str, mode: str):
+    # Packed int8 weights are tied to the torch build, so the version is part of the name
+    return os.path.join(cache_dir, f"mvit_{mode}_int8_{model_version[:16]}_torch{torch.__version__}.pt")
+
+
+def load_quantized_model(model: torch.nn.Module, mode: str, example_input: torch.Tensor, cache_path: str,
+                         calibration_clips=None):
+    """
+    Frozen TorchScript of model quantized with mode ("dynamic" or "static"). Loaded from cache_path when it exists,
+    otherwise quantized, traced and saved there, so later boots skip quantization and calibration.
+    calibration_clips is a function returning the calibration clips, only called for "static".
+    """
+    if mode not in QUANTIZATION_MODES or mode == "none":
+        raise ValueError(f"Unknown quantization mode {mode}, expected dynamic or static")
+    if os.path.exists(cache_path):
+        return torch.jit.load(cache_path, map_location="cpu")
+
+    if mode == "dynamic":
+        quantized = quantize_dynamic(model)
+    else:
+        quantized = quantize_static(model, example_input, calibration_clips())
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(quantized, example_input))
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    partial_path = f"{cache_path}.{os.getpid()}.partial"
+    torch.jit.save(traced, partial_path)
+    os.replace(partial_path, cache_path)
+    return traced
@@ -0,0 +1,35 @@
+from inference.FaceDetector import FaceDetector
+
+
+class CascadeFaceDetector(FaceDetector):
+    """
+    A cheap detector first, the fallback (MTCNN) only on the frames where it found nothing. The cheap detector's
+    boxes are refined by the fallback, so faces are cropped as the fallback would crop them; a box it rejects (not a
+    face to it) has its frame detected by the fallback too. Tracking goes to the fallback as well.
+    """
+
+    name = "cascade"
+
+    def __init__(self, first: FaceDetector, fallback: FaceDetector):
+        super().__init__(fallback.image_size, fallback.margin)
+        self.first = first
+        self.fallback = fallback
+
+    def detect(self, frames: list) -> list:
+        boxes = self.first.detect(frames)
+        found = [i for i, box in enumerate(boxes) if box is not None]
+        if found:
+            for i, box in zip(found, self.fallback.refine([frames[i] for i in found], [boxes[i] for i in found])):
+                boxes[i] = box
+
+        missed = [i for i, box in enumerate(boxes) if box is None]
+        if missed:
+            for i, box in zip(missed, self.fallback.detect([frames[i] for i in missed])):
+                boxes[i] = box
+        return boxes
+
+    def refine(self, frames: list, boxes: list) -> list:
+        return self.fallback.refine(frames, boxes)
+
+    def extract(self, frames: list, boxes: list) -> list:
+        return self.fallback.extract(frames, boxes)
@@ -0,0 +1,45 @@
+import os
+import cv2
+import threading
+import numpy as np
+from inference.FaceDetector import FaceDetector
+
+
+class HaarFaceDetector(FaceDetector):
+    """
+    OpenCV's Viola-Jones cascade, haarcascade_frontalface_default.xml by default: it ships with opencv-python, so
+    nothing is downloaded. Frontal faces only, its boxes are tighter than MTCNN's and it finds faces where there are
+    none. Meant as CascadeFaceDetector's first stage, where MTCNN checks its boxes: on its own it crops false
+    positives and is hardly faster than MTCNN at the default scale_factor. scale_factor and min_neighbors trade
+    recall for speed and false positives.
+    """
+
+    name = "haar"
+
+    def __init__(self, image_size: int, margin: int, cascade: str = "haarcascade_frontalface_default.xml",
+                 min_face_size: int = 20, scale_factor: float = 1.1, min_neighbors: int = 5):
+        super().__init__(image_size, margin)
+        path = cascade if os.path.exists(cascade) else os.path.join(cv2.data.haarcascades, cascade)
+        self.classifier = cv2.CascadeClassifier(path)
+        if self.classifier.empty():
+            raise RuntimeError(f"Could not load the Haar cascade {cascade}")
+        self.min_face_size = min_face_size
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        # A CascadeClassifier is not safe to run from several threads at once
+        self.lock = threading.Lock()
+
+    def detect(self, frames: list) -> list:
+        boxes = []
+        for frame in frames:
+            gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+            with self.lock:
+                found = self.classifier.detectMultiScale(gray, scaleFactor=self.scale_factor,
+                                                         minNeighbors=self.min_neighbors,
+                                                         minSize=(self.min_face_size, self.min_face_size))
+            if len(found) == 0:
+                boxes.append(None)
+                continue
+            x, y, width, height = max(found, key=lambda face: face[2] * face[3])
+            boxes.append(np.array([[x, y, x + width, y + height]], dtype=np.float32))
+        return boxes
@@ -0,0 +1,58 @@
+import torch
+import numpy as np
+from facenet_pytorch import MTCNN
+from inference.FaceDetector import FaceDetector
+from facenet_pytorch.models.utils.detect_face import pad, rerec, bbreg, imresample
+
+
+class MtcnnFaceDetector(FaceDetector):
+    """
+    facenet-pytorch's MTCNN. min_face_size, thresholds (of its three stages) and factor (scale step of its image
+    pyramid) trade recall for speed: a larger minimum face, higher thresholds and a smaller factor are all cheaper.
+    """
+
+    name = "mtcnn"
+
+    def __init__(self, image_size: int, margin: int, device: str, min_face_size: int = 20,
+                 thresholds: tuple = (0.6, 0.7, 0.7), factor: float = 0.709):
+        super().__init__(image_size, margin)
+        self.device = device
+        self.mtcnn = MTCNN(image_size=image_size, margin=margin, min_face_size=min_face_size,
+                           thresholds=list(thresholds), factor=factor, keep_all=False, device=device)
+
+    def detect(self, frames: list) -> list:
+        # Equally sized frames are detected in one batched call
+        if all(frame.shape == frames[0].shape for frame in frames):
+            detected = zip(*self.mtcnn.detect(list(frames), landmarks=True))
+        else:
+            detected = (self.mtcnn.detect(frame, landmarks=True) for frame in frames)
+
+        # Selected frame by frame: MTCNN's batched selection fails when only some frames have a face
+        return [self.mtcnn.select_boxes(boxes, probs, points, frame, method=self.mtcnn.selection_method)[0]
+                for frame, (boxes, probs, points) in zip(frames, detected)]
+
+    def refine(self, frames: list, boxes: list) -> list:
+        """
+        MTCNN's last stage (ONet) run on the given boxes instead of on its own candidates: one 48x48 pass per frame,
+        a small part of a full detection. A box is regressed onto the face as detect would find it, or None when
+        the face probability is under the last threshold.
+        """
+        if any(frame.shape != frames[0].shape for frame in frames):
+            return [self.refine([frame], [box])[0] for frame, box in zip(frames, boxes)]
+
+        squares = rerec(torch.from_numpy(np.stack([box[0, :4] for box in boxes]).astype(np.float32)))
+        y, ey, x, ex = pad(squares.clone(), frames[0].shape[1], frames[0].shape[0])
+        crops = []
+        for i, frame in enumerate(frames):
+            if ey[i] > y[i] - 1 and ex[i] > x[i] - 1:
+                crop = torch.from_numpy(frame[y[i] - 1:ey[i], x[i] - 1:ex[i]].copy()).permute(2, 0, 1)
+            else:
+                # The box left the frame
+                crop = torch.zeros(3, 48, 48)
+            crops.append(imresample(crop.unsqueeze(0).float(), (48, 48)))
+
+        with torch.no_grad():
+            regression, _, probabilities = self.mtcnn.onet((torch.cat(crops).to(self.device) - 127.5) * 0.0078125)
+        refined = bbreg(squares.to(self.device), regression).cpu().numpy()
+        passed = probabilities[:, 1].cpu().numpy() >= self.mtcnn.thresholds[2]
+        return [refined[[i]] if passed[i] else None for i in range(len(frames))]
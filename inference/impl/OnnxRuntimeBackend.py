@@ -0,0 +1,47 @@
+import os
+import torch
+import numpy as np
+from inference.InferenceBackend import InferenceBackend
+
+# Metadata key inference.OnnxExport records the SHA-256 of the exported checkpoint under
+CHECKPOINT_METADATA_KEY = "checkpoint_sha256"
+
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """
+    The classifier exported by inference.OnnxExport, served by onnxruntime's CPU execution provider.
+    0 threads keeps onnxruntime's defaults (one intra-op thread per core, one inter-op thread).
+    With checkpoint_hash, an export of any other checkpoint (or one without it recorded) is refused, so a stale
+    export is never served under a newer checkpoint's version. checkpoint_hash is the recorded one either way.
+    """
+
+    name = "onnxruntime"
+
+    def __init__(self, onnx_path: str, intra_op_threads: int = 0, inter_op_threads: int = 0,
+                 checkpoint_hash: str | None = None):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError("INFERENCE_BACKEND=onnxruntime needs the onnxruntime package "
+                               "(pip install -r requirements-onnx.txt)") from e
+        if not os.path.exists(onnx_path):
+            raise RuntimeError(f"{onnx_path} does not exist, export it first with python -m inference.OnnxExport")
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads
+        options.inter_op_num_threads = inter_op_threads
+        self.session = onnxruntime.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+        recorded = self.session.get_modelmeta().custom_metadata_map.get(CHECKPOINT_METADATA_KEY)
+        if recorded is None or (checkpoint_hash is not None and recorded != checkpoint_hash):
+            raise RuntimeError(f"{onnx_path} was not exported from the current checkpoint, export it again with "
+                               f"python -m inference.OnnxExport")
+        self.checkpoint_hash = recorded
+
+    def forward(self, batch: torch.Tensor) -> torch.Tensor:
+        clips = batch.detach().to("cpu", torch.float32).numpy()
+        logits = self.session.run(None, {self.input_name: np.ascontiguousarray(clips)})[0]
+        return torch.from_numpy(logits)
@@ -0,0 +1,53 @@
+import os
+import cv2
+import threading
+import numpy as np
+from inference.FaceDetector import FaceDetector
+
+
+class OpenCvDnnFaceDetector(FaceDetector):
+    """
+    An SSD face detector run by OpenCV's DNN module, such as OpenCV's res10_300x300_ssd (model_path the .caffemodel,
+    config_path its deploy.prototxt). Any network cv2.dnn.readNet loads works if its output has the SSD
+    DetectionOutput layout: [1, 1, N, 7] rows of image, class, confidence and the box relative to the image. The
+    files are read from disk, nothing is downloaded.
+    """
+
+    name = "dnn"
+
+    def __init__(self, image_size: int, margin: int, model_path: str, config_path: str = "", confidence: float = 0.5,
+                 min_face_size: int = 20, input_size: int = 300, mean: tuple = (104.0, 177.0, 123.0)):
+        super().__init__(image_size, margin)
+        if not model_path or not os.path.exists(model_path):
+            raise RuntimeError(f"The DNN face detector needs its model file (FACE_DNN_MODEL), {model_path!r} not found")
+        self.net = cv2.dnn.readNet(model_path, config_path)
+        self.confidence = confidence
+        self.min_face_size = min_face_size
+        self.input_size = input_size
+        self.mean = mean
+        # A cv2.dnn.Net is not safe to run from several threads at once
+        self.lock = threading.Lock()
+
+    def detect(self, frames: list) -> list:
+        # The whole clip in one blob; swapRB because the frames are RGB and the res10 model expects BGR
+        blob = cv2.dnn.blobFromImages(list(frames), 1.0, (self.input_size, self.input_size), self.mean, swapRB=True)
+        with self.lock:
+            self.net.setInput(blob)
+            detections = self.net.forward()
+
+        boxes, areas = [None] * len(frames), [0.0] * len(frames)
+        for image, _, confidence, x1, y1, x2, y2 in detections.reshape(-1, 7):
+            if confidence < self.confidence:
+                continue
+            i = int(image)
+            height, width = frames[i].shape[:2]
+            box = np.clip([x1 * width, y1 * height, x2 * width, y2 * height], 0, [width, height, width, height])
+            box = box.astype(np.float32)
+            size = min(box[2] - box[0], box[3] - box[1])
+            if size < self.min_face_size:
+                continue
+            # The largest face, like MTCNN picks
+            area = (box[2] - box[0]) * (box[3] - box[1])
+            if area > areas[i]:
+                boxes[i], areas[i] = box[np.newaxis], area
+        return boxes
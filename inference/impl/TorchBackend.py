@@ -0,0 +1,38 @@
+import torch
+import warnings
+from inference.Precision import PrecisionPolicy
+from inference.CompiledModel import compile_model
+from inference.InferenceBackend import InferenceBackend
+from inference.Quantization import load_quantized_model
+
+
+class TorchBackend(InferenceBackend):
+    """
+    The PyTorch model, run eagerly, traced or compiled (compile_mode) in the precision's format, or its int8 variant
+    on CPU (quantization).
+    """
+
+    name = "torch"
+
+    def __init__(self, model: torch.nn.Module, device: str, clip_shape: tuple, compile_mode: str = "eager",
+                 quantization: str = "none", quantization_cache_path: str = None, calibration_clips=None,
+                 precision: PrecisionPolicy = None):
+        self.device = device
+        self.precision = precision or PrecisionPolicy("auto", device)
+        example_input = torch.zeros(1, *clip_shape, device=device)
+        if quantization != "none" and device == "cpu":
+            if self.precision.precision != "fp32" or self.precision.channels_last:
+                warnings.warn("INFERENCE_PRECISION and INFERENCE_CHANNELS_LAST do not apply to the int8 model")
+            self.precision = PrecisionPolicy("fp32", device)
+            self.forward_model = load_quantized_model(model, quantization, example_input, quantization_cache_path,
+                                                      calibration_clips)
+        else:
+            if quantization != "none":
+                warnings.warn("INFERENCE_QUANTIZATION only applies on CPU, running the fp32 model")
+            model = self.precision.prepare_model(model)
+            with self.precision.autocast():
+                self.forward_model = compile_model(model, compile_mode, self.precision.prepare_input(example_input))
+
+    def forward(self, batch: torch.Tensor) -> torch.Tensor:
+        with torch.inference_mode(), self.precision.autocast():
+            return self.forward_model(self.precision.prepare_input(batch))
@@ -0,0 +1,267 @@
+import os
+import time
+import httpx
+import asyncio
+import threading
+from collections import deque
+from starlette.concurrency import run_in_threadpool
+from ingest.UploadIngest import UploadWriter, UploadTooLarge, remove_partial, file_sha256
+from config.detection import DOWNLOAD_MAX_CONNECTIONS, DOWNLOAD_MAX_BYTES, DOWNLOAD_CHUNK_BYTES
+from config.detection import DOWNLOAD_RANGE_PARTS, DOWNLOAD_RANGE_MIN_BYTES, DOWNLOAD_RANGE_RETRIES
+from config.detection import DOWNLOAD_CONNECT_TIMEOUT_SECONDS, DOWNLOAD_READ_TIMEOUT_SECONDS, DOWNLOAD_TIMEOUT_SECONDS
+
+_client = None
+
+
+class DownloadTooLarge(Exception):
+    pass
+
+
+class DownloadFailed(Exception):
+    pass
+
+
+def get_client():
+    """
+    Long-lived client shared by every resolver call and download, so connections to the CDNs are kept alive.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=DOWNLOAD_MAX_CONNECTIONS,
+                                max_keepalive_connections=DOWNLOAD_MAX_CONNECTIONS),
+            timeout=httpx.Timeout(DOWNLOAD_READ_TIMEOUT_SECONDS, connect=DOWNLOAD_CONNECT_TIMEOUT_SECONDS),
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def close_client():
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+class DownloadStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.downloads = 0
+        self.failures = 0
+        self.too_large = 0
+        self.ranged = 0
+        self.range_fallbacks = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.throughputs = deque(maxlen=1024)
+
+    def record(self, size: int, seconds: float, ranged: bool = False):
+        with self.lock:
+            self.downloads += 1
+            self.ranged += ranged
+            self.bytes += size
+            self.seconds += seconds
+            self.throughputs.append(size / seconds if seconds > 0 else 0.0)
+
+    def record_failure(self, too_large: bool = False):
+        with self.lock:
+            self.failures += 1
+            self.too_large += too_large
+
+    def record_range_fallback(self):
+        with self.lock:
+            self.range_fallbacks += 1
+
+    def metrics(self) -> dict:
+        with self.lock:
+            throughputs = sorted(self.throughputs)
+            downloads, failures, too_large = self.downloads, self.failures, self.too_large
+            ranged, range_fallbacks = self.ranged, self.range_fallbacks
+            total_bytes, seconds = self.bytes, self.seconds
+
+        return {
+            "downloads": downloads,
+            "failures": failures,
+            "too_large": too_large,
+            "ranged": ranged,
+            "range_fallbacks": range_fallbacks,
+            "bytes": total_bytes,
+            "avg_bytes_per_second": round(total_bytes / seconds, 1) if seconds else 0.0,
+            "p50_bytes_per_second": round(throughputs[len(throughputs) // 2], 1) if throughputs else 0.0,
+            "p5_bytes_per_second": round(throughputs[int(len(throughputs) * 0.05)], 1) if throughputs else 0.0,
+        }
+
+
+download_stats = DownloadStats()
+
+
+class RangeNotSupported(Exception):
+    pass
+
+
+def ranges_usable(response: httpx.Response, size: int | None):
+    return (
+        DOWNLOAD_RANGE_PARTS > 1
+        and size is not None
+        and size >= DOWNLOAD_RANGE_MIN_BYTES
+        and response.headers.get("accept-ranges", "").lower() == "bytes"
+    )
+
+
+class RangedFile:
+    """
+    Preallocated file written at arbitrary offsets by concurrent range downloads. Without os.pwrite (Windows) the
+    writes seek and write under a lock instead.
+    """
+
+    def __init__(self, file_path: str, size: int):
+        self.fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        if hasattr(os, "posix_fallocate"):
+            os.posix_fallocate(self.fd, 0, size)
+        else:
+            os.ftruncate(self.fd, size)
+        self.lock = threading.Lock()
+
+    def write_at(self, chunk: bytes, offset: int):
+        while chunk:
+            if hasattr(os, "pwrite"):
+                written = os.pwrite(self.fd, chunk, offset)
+            else:
+                with self.lock:
+                    os.lseek(self.fd, offset, os.SEEK_SET)
+                    written = os.write(self.fd, chunk)
+            chunk, offset = chunk[written:], offset + written
+
+    def close(self):
+        os.close(self.fd)
+
+
+async def copy_range(response: httpx.Response, file: RangedFile, position: int, end: int):
+    """
+    Writes the body of a response covering bytes position..end (inclusive) at its offset, returns where it stopped.
+    """
+    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+        chunk = chunk[:end + 1 - position]
+        await run_in_threadpool(file.write_at, chunk, position)
+        position += len(chunk)
+        if position > end:
+            break
+    return position
+
+
+async def fetch_range(url: str, file: RangedFile, position: int, end: int):
+    """
+    Downloads bytes position..end, resuming from where the previous attempt stopped up to DOWNLOAD_RANGE_RETRIES
+    times. Raises RangeNotSupported when the server answers the Range request with the whole file.
+    """
+    for attempt in range(DOWNLOAD_RANGE_RETRIES + 1):
+        try:
+            async with get_client().stream("GET", url, headers={"Range": f"bytes={position}-{end}"}) as response:
+                if response.status_code == 200:
+                    raise RangeNotSupported()
+                if response.status_code != 206:
+                    raise DownloadFailed(f"Range request failed with status {response.status_code}")
+                if not response.headers.get("content-range", "").startswith(f"bytes {position}-"):
+                    raise RangeNotSupported()
+                position = await copy_range(response, file, position, end)
+            if position > end:
+                return
+            raise DownloadFailed(f"Range ended early at byte {position}")
+        except (httpx.HTTPError, DownloadFailed):
+            if attempt == DOWNLOAD_RANGE_RETRIES:
+                raise
+
+
+async def download_ranges(response: httpx.Response, url: str, file_path: str, size: int):
+    """
+    Splits the download into DOWNLOAD_RANGE_PARTS byte ranges fetched concurrently over the pooled client. The
+    first range is read from the already open response, the others are separate Range requests.
+    """
+    part_size = -(-size // DOWNLOAD_RANGE_PARTS)
+    bounds = [(start, min(start + part_size, size) - 1) for start in range(0, size, part_size)]
+    file = await run_in_threadpool(RangedFile, file_path, size)
+    try:
+        async def first_range():
+            start, end = bounds[0]
+            try:
+                position = await copy_range(response, file, start, end)
+            except httpx.HTTPError:
+                position = start
+            await response.aclose()
+            if position <= end:
+                await fetch_range(url, file, position, end)
+
+        tasks = [asyncio.ensure_future(first_range())]
+        tasks += [asyncio.ensure_future(fetch_range(url, file, start, end)) for start, end in bounds[1:]]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+    finally:
+        await run_in_threadpool(file.close)
+    # Ranges arrive out of order, so the hash is taken once the file is complete
+    return await run_in_threadpool(file_sha256, file_path)
+
+
+async def download_to_file(url: str, file_path: str, max_bytes: int = DOWNLOAD_MAX_BYTES,
+                           timeout: float = DOWNLOAD_TIMEOUT_SECONDS, on_chunk=None, ranged: bool = True):
+    """
+    Streams url to file_path in DOWNLOAD_CHUNK_BYTES chunks, hashing as it goes, and returns the SHA-256.
+    Large files from servers that accept byte ranges are fetched as DOWNLOAD_RANGE_PARTS concurrent ranges instead,
+    falling back to a single stream when the ranges turn out not to be honoured.
+    Raises DownloadTooLarge as soon as the Content-Length or the bytes received pass max_bytes, and DownloadFailed
+    on an error status, a network error or when the whole download takes longer than timeout. Nothing is left at
+    file_path when it fails.
+    on_chunk, when given, is called with every chunk of a single stream download once it has been written; ranged
+    downloads arrive out of order and never call it.
+    """
+    started = time.perf_counter()
+    writer = None
+    content_hash = None
+    try:
+        async with asyncio.timeout(timeout):
+            async with get_client().stream("GET", url) as response:
+                if response.status_code != 200:
+                    raise DownloadFailed(f"Download failed with status {response.status_code}")
+                content_length = response.headers.get("content-length")
+                size = int(content_length) if content_length is not None and content_length.isdigit() else None
+                if size is not None and size > max_bytes:
+                    raise DownloadTooLarge()
+
+                if ranged and ranges_usable(response, size):
+                    content_hash = await download_ranges(response, url, file_path, size)
+                else:
+                    writer = await run_in_threadpool(UploadWriter, file_path, max_bytes, False)
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_BYTES):
+                        await run_in_threadpool(writer.write, chunk)
+                        if on_chunk is not None:
+                            on_chunk(chunk)
+    except RangeNotSupported:
+        await run_in_threadpool(remove_partial, file_path)
+        download_stats.record_range_fallback()
+        return await download_to_file(url, file_path, max_bytes, timeout - (time.perf_counter() - started), on_chunk,
+                                      ranged=False)
+    except BaseException as e:
+        if writer is not None:
+            await run_in_threadpool(writer.close)
+        await run_in_threadpool(remove_partial, file_path)
+        too_large = isinstance(e, (DownloadTooLarge, UploadTooLarge))
+        download_stats.record_failure(too_large=too_large)
+        if too_large:
+            raise DownloadTooLarge() from e
+        if isinstance(e, TimeoutError):
+            raise DownloadFailed(f"Download took longer than {timeout:.0f}s") from e
+        if isinstance(e, httpx.HTTPError):
+            raise DownloadFailed(str(e)) from e
+        raise
+
+    if content_hash is not None:
+        download_stats.record(size, time.perf_counter() - started, ranged=True)
+        return content_hash
+
+    await run_in_threadpool(writer.close)
+    download_stats.record(writer.size, time.perf_counter() - started)
+    return writer.digest.hexdigest()
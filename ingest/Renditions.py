@@ -0,0 +1,58 @@
+import re
+from config.detection import MEDIA_MIN_SHORT_SIDE, MEDIA_MAX_RENDITIONS
+
+LABEL_KEYS = ("quality", "qualityLabel", "label", "resolution", "format")
+
+
+def rendition_short_side(media: dict):
+    """
+    Shorter side in pixels of a resolver media entry, from its width/height or a "720p"/"1280x720" style label.
+    None when the resolver does not say.
+    """
+    width, height = media.get("width"), media.get("height")
+    if isinstance(width, int) and isinstance(height, int) and width > 0 and height > 0:
+        return min(width, height)
+
+    label = " ".join(str(media.get(key) or "") for key in LABEL_KEYS)
+    match = re.search(r"(\d{3,4})\s*[xX×]\s*(\d{3,4})", label)
+    if match:
+        return min(int(match.group(1)), int(match.group(2)))
+    match = re.search(r"(\d{3,4})p", label)
+    if match:
+        return int(match.group(1))
+    if isinstance(height, int) and height > 0:
+        return height
+    return None
+
+
+def is_video_rendition(media: dict):
+    if not media.get("url"):
+        return False
+    return media.get("type") != "audio" and media.get("is_audio") is not True
+
+
+def order_renditions(medias, min_short_side: int = MEDIA_MIN_SHORT_SIDE, max_renditions: int = MEDIA_MAX_RENDITIONS,
+                     extensions=None):
+    """
+    Video renditions worth downloading, in order: the smallest one whose shorter side is at least min_short_side
+    first, then the next larger ones as fallbacks for when no face is found. Faces end up as 224x224 crops of
+    16 frames, so anything above that only costs download and decode time.
+    Renditions of unknown size come after the known adequate ones, and when none is large enough only the largest
+    is kept. min_short_side <= 0 keeps the resolver's own order.
+    extensions, when given, keeps only the renditions whose "extension" is one of them.
+    """
+    videos = [media for media in medias or [] if is_video_rendition(media)
+              and (extensions is None or media.get("extension") in extensions)]
+    if min_short_side <= 0:
+        return videos[:max_renditions]
+
+    known = sorted((media for media in videos if rendition_short_side(media) is not None), key=rendition_short_side)
+    unknown = [media for media in videos if rendition_short_side(media) is None]
+    adequate = [media for media in known if rendition_short_side(media) >= min_short_side]
+    if adequate:
+        ordered = adequate + unknown
+    elif known:
+        ordered = [known[-1]] + unknown
+    else:
+        ordered = unknown
+    return ordered[:max_renditions]
@@ -0,0 +1,164 @@
+import time
+import httpx
+import asyncio
+from collections import OrderedDict
+from config.detection import RESOLVER_CACHE_TTL_SECONDS, RESOLVER_NEGATIVE_TTL_SECONDS, RESOLVER_CACHE_SIZE
+from config.detection import RESOLVER_FAILURE_THRESHOLD, RESOLVER_RESET_SECONDS
+
+
+class ResolverUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling a provider after failure_threshold consecutive failures. Once reset_seconds have passed a
+    single probe call is let through (half-open): its success closes the circuit again, its failure re-opens it.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self):
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.probing = False
+
+    def release(self):
+        # The probe call was cancelled before it could tell anything, let the next one probe instead
+        self.probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class Provider:
+    def __init__(self):
+        self.breaker = CircuitBreaker(RESOLVER_FAILURE_THRESHOLD, RESOLVER_RESET_SECONDS)
+        # key -> (expires_at, resolved data or None for a cached failure)
+        self.cache = OrderedDict()
+        self.calls = 0
+        self.cache_hits = 0
+        self.negative_hits = 0
+        self.short_circuited = 0
+
+    def cached(self, key: str):
+        entry = self.cache.get(key)
+        if entry is None:
+            return False, None
+        expires_at, data = entry
+        if time.monotonic() > expires_at:
+            del self.cache[key]
+            return False, None
+        self.cache.move_to_end(key)
+        return True, data
+
+    def store(self, key: str, data, ttl: float):
+        if ttl <= 0:
+            return
+        self.cache[key] = (time.monotonic() + ttl, data)
+        self.cache.move_to_end(key)
+        while len(self.cache) > RESOLVER_CACHE_SIZE:
+            self.cache.popitem(last=False)
+
+    def metrics(self) -> dict:
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "negative_hits": self.negative_hits,
+            "short_circuited": self.short_circuited,
+        }
+
+
+providers = {}
+
+
+def get_provider(name: str):
+    if name not in providers:
+        providers[name] = Provider()
+    return providers[name]
+
+
+def provider_failed(response: httpx.Response):
+    # Rate limiting and server errors say the provider is unhealthy, other 4xx only that this URL is bad
+    return response.status_code == 429 or response.status_code >= 500
+
+
+async def resolve(provider_name: str, key: str, request):
+    """
+    JSON answer of a resolver (RapidAPI) provider for key, a canonical URL, or None when the provider failed.
+    Answers are cached for RESOLVER_CACHE_TTL_SECONDS and failures for RESOLVER_NEGATIVE_TTL_SECONDS. request is a
+    coroutine function making the actual call. Raises ResolverUnavailable without calling anything while the
+    provider's circuit is open.
+    """
+    provider = get_provider(provider_name)
+    hit, data = provider.cached(key)
+    if hit:
+        if data is None:
+            provider.negative_hits += 1
+        else:
+            provider.cache_hits += 1
+        return data
+
+    if not provider.breaker.allow():
+        provider.short_circuited += 1
+        raise ResolverUnavailable(provider_name)
+
+    provider.calls += 1
+    try:
+        response = await request()
+    except asyncio.CancelledError:
+        provider.breaker.release()
+        raise
+    except httpx.HTTPError:
+        provider.breaker.record_failure()
+        provider.store(key, None, RESOLVER_NEGATIVE_TTL_SECONDS)
+        return None
+    except Exception:
+        # Not an HTTPError (e.g. httpx.InvalidURL): still a failed call, which also ends a half-open probe
+        provider.breaker.record_failure()
+        raise
+
+    if not response.is_success:
+        if provider_failed(response):
+            provider.breaker.record_failure()
+        else:
+            provider.breaker.record_success()
+        provider.store(key, None, RESOLVER_NEGATIVE_TTL_SECONDS)
+        return None
+
+    try:
+        data = response.json()
+    except ValueError:
+        provider.breaker.record_failure()
+        provider.store(key, None, RESOLVER_NEGATIVE_TTL_SECONDS)
+        return None
+
+    provider.breaker.record_success()
+    provider.store(key, data, RESOLVER_CACHE_TTL_SECONDS)
+    return data
+
+
+def resolver_metrics() -> dict:
+    return {name: provider.metrics() for name, provider in providers.items()}
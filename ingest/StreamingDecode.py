@@ -0,0 +1,106 @@
+import os
+import threading
+
+FEED_CHUNK_BYTES = 256 * 1024
+
+# FIFOs are POSIX only, on Windows downloads are always decoded once they are complete
+FIFO_SUPPORTED = hasattr(os, "mkfifo")
+
+
+def is_faststart(head: bytes):
+    """
+    True when the top-level boxes of an MP4/MOV put moov before mdat, i.e. the file can be demuxed front to back
+    without seeking. head only needs to reach the first moov or mdat header.
+    """
+    position = 0
+    while position + 8 <= len(head):
+        size = int.from_bytes(head[position:position + 4], "big")
+        box_type = head[position + 4:position + 8]
+        if box_type == b"moov":
+            return True
+        if box_type == b"mdat":
+            return False
+        if size == 1:
+            if position + 16 > len(head):
+                return False
+            size = int.from_bytes(head[position + 8:position + 16], "big")
+        if size < 8:
+            return False
+        position += size
+    return False
+
+
+class GrowingFileFeed:
+    """
+    Copies a file that is still being downloaded into a FIFO, so a decoder can read it as one sequential stream
+    while the download goes on. The copy waits at the end of the file for more bytes until finish() is called.
+
+    The download itself never waits for the decoder: it keeps writing the file, only this thread blocks on the
+    FIFO. When the decoder stops reading the copy ends with a broken pipe; cancel() ends it from this side, the
+    decoder then reaches the end of the stream early.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.fifo_path = f"{file_path}.fifo"
+        self.condition = threading.Condition()
+        self.finished = False
+        self.cancelled = False
+        self.thread = None
+
+    def start(self):
+        if os.path.exists(self.fifo_path):
+            os.remove(self.fifo_path)
+        os.mkfifo(self.fifo_path)
+        self.thread = threading.Thread(target=self.run, name="growing-file-feed", daemon=True)
+        self.thread.start()
+
+    def notify(self):
+        with self.condition:
+            self.condition.notify()
+
+    def cancel(self):
+        with self.condition:
+            self.cancelled = True
+            self.condition.notify()
+
+    def finish(self):
+        with self.condition:
+            self.finished = True
+            self.condition.notify()
+
+    def run(self):
+        try:
+            # Blocks until the decoder opens the FIFO for reading
+            with open(self.fifo_path, "wb") as fifo, open(self.file_path, "rb") as source:
+                while not self.cancelled:
+                    chunk = source.read(FEED_CHUNK_BYTES)
+                    if chunk:
+                        fifo.write(chunk)
+                        continue
+                    with self.condition:
+                        if self.cancelled:
+                            break
+                        if self.finished:
+                            # A last read after finish() catches the bytes written just before it
+                            chunk = source.read()
+                            if chunk:
+                                fifo.write(chunk)
+                            break
+                        self.condition.wait(timeout=1.0)
+        except OSError:
+            # BrokenPipeError once the decoder has what it needs, or the file went away after a failed download
+            pass
+
+    def close(self):
+        self.finish()
+        if self.thread is not None and self.thread.is_alive():
+            # Nobody ever opened the FIFO: open and drop the read end so the blocked open() of the writer returns
+            try:
+                fd = os.open(self.fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+                os.close(fd)
+            except OSError:
+                pass
+            self.thread.join(timeout=5)
+        if os.path.exists(self.fifo_path):
+            os.remove(self.fifo_path)
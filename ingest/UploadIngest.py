@@ -0,0 +1,99 @@
+import os
+import hashlib
+from fastapi import UploadFile
+from starlette.concurrency import run_in_threadpool
+from config.detection import UPLOAD_MAX_BYTES, UPLOAD_CHUNK_BYTES
+
+# ISO base media (mp4/mov) files open with a box whose type sits at bytes 4-8
+ISO_BOX_TYPES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot"}
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UnsupportedContainer(Exception):
+    pass
+
+
+def sniff_container(head: bytes):
+    """
+    Container format from the first bytes of a file ("mp4", "mov", "avi" or "mkv"), None when it is none of them.
+    """
+    if len(head) >= 12 and head[4:8] in ISO_BOX_TYPES:
+        return "mov" if head[4:8] == b"ftyp" and head[8:12] == b"qt  " else "mp4"
+    if len(head) >= 12 and head[:4] == b"RIFF" and head[8:12] == b"AVI ":
+        return "avi"
+    if head[:4] == b"\x1a\x45\xdf\xa3":
+        return "mkv"
+    return None
+
+
+class UploadWriter:
+    """
+    Single pass over an upload: every chunk is size-checked, hashed and written, and the first one is sniffed.
+    """
+
+    def __init__(self, file_path: str, max_bytes: int, sniff: bool = True):
+        self.file = open(file_path, "wb")
+        self.max_bytes = max_bytes
+        self.sniff = sniff
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.container = None
+
+    def write(self, chunk: bytes):
+        if self.sniff and self.size == 0:
+            self.container = sniff_container(chunk[:12])
+            if self.container is None:
+                raise UnsupportedContainer()
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLarge()
+        self.digest.update(chunk)
+        self.file.write(chunk)
+        # Readers following the file while it is written (pipelined decoding) must see every chunk
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+async def ingest_upload(file: UploadFile, file_path: str, max_bytes: int = UPLOAD_MAX_BYTES):
+    """
+    Streams an upload to file_path in UPLOAD_CHUNK_BYTES chunks without blocking the event loop.
+    Returns (sha256 hex digest, size in bytes, container). Raises UploadTooLarge or UnsupportedContainer, in which
+    case nothing is left at file_path.
+
+    Known cost: Starlette has already spooled the request body to an anonymous temporary file (past 1 MB) by the
+    time the route runs, so every upload is written to disk twice. That file cannot be moved into place; avoiding
+    the second write would mean parsing the raw multipart body in the route instead of taking an UploadFile.
+    """
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge()
+
+    writer = await run_in_threadpool(UploadWriter, file_path, max_bytes)
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            await run_in_threadpool(writer.write, chunk)
+        if writer.size == 0:
+            raise UnsupportedContainer()
+    except BaseException:
+        await run_in_threadpool(writer.close)
+        await run_in_threadpool(remove_partial, file_path)
+        raise
+    await run_in_threadpool(writer.close)
+    return writer.digest.hexdigest(), writer.size, writer.container
+
+
+def file_sha256(path: str):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def remove_partial(file_path: str):
+    if os.path.exists(file_path):
+        os.remove(file_path)
@@ -0,0 +1,84 @@
+import json
+from dto.res.ErrorResDto import ErrorResDto
+from config.detection import UPLOAD_MAX_BYTES
+from ingest.UploadIngest import UploadTooLarge
+from dto.res.GeneralMsgResDto import GeneralMsgResDto
+
+# Multipart boundaries, part headers and the other form fields on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+UPLOAD_PATHS = {"/api/v1/detect/direct-upload", "/api/v1/detect/jobs"}
+
+
+def too_large_body():
+    return json.dumps(GeneralMsgResDto(
+        isSuccess=False,
+        hasException=True,
+        errorResDto=ErrorResDto(
+            code="payload_too_large",
+            message="The uploaded video is too large.",
+            details=f"Videos up to {UPLOAD_MAX_BYTES // (1024 * 1024)} MB are accepted.",
+        ),
+        message="Request could not be completed due to an error."
+    ).dict()).encode()
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Rejects oversized uploads with a 413 before the multipart body is spooled to disk: straight away when the
+    Content-Length says so, otherwise as soon as more bytes than allowed have been received.
+    """
+
+    def __init__(self, app, max_bytes: int = UPLOAD_MAX_BYTES):
+        self.app = app
+        self.max_body = max_bytes + MULTIPART_OVERHEAD_BYTES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in UPLOAD_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_body:
+            await self.reject(send)
+            return
+
+        received = 0
+        exceeded = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body:
+                    exceeded = True
+                    raise UploadTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal rejected
+            # Whatever the app answers once the body was cut off (usually a body parsing error) becomes the 413
+            if exceeded:
+                if not rejected:
+                    rejected = True
+                    await self.reject(send)
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except UploadTooLarge:
+            if not rejected:
+                await self.reject(send)
+
+    async def reject(self, send):
+        body = too_large_body()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode()),
+                        (b"connection", b"close")],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,37 @@
+from typing import Any
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from config.database import Base
+
+
+class DetectionJob(Base):
+    __tablename__ = 'detection_job'
+    job_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False)
+    username = Column(String, nullable=False)
+    source = Column(String, nullable=False)
+    url = Column(String, nullable=True)
+    filename = Column(String, nullable=True)
+    filepath = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True)
+    # queued -> downloading -> preprocessing -> inferring -> done | failed, back to queued when interrupted
+    state = Column(String, nullable=False, index=True)
+    pred_id = Column(Integer, ForeignKey("prediction.pred_id", ondelete="SET NULL"), nullable=True)
+    pred_label = Column(String, nullable=True)
+    confidence = Column(String, nullable=True)
+    error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __init__(self, user_id, username, source, url, filename, filepath, content_hash, **kw: Any):
+        super().__init__(**kw)
+        self.user_id = user_id
+        self.username = username
+        self.source = source
+        self.url = url
+        self.filename = filename
+        self.filepath = filepath
+        self.content_hash = content_hash
+        self.state = "queued"
+        self.created_at = datetime.now(timezone.utc)
+        self.updated_at = self.created_at
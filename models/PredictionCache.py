@@ -0,0 +1,21 @@
+from typing import Any
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime
+from config.database import Base
+
+
+class PredictionCache(Base):
+    __tablename__ = 'prediction_cache'
+    content_hash = Column(String(64), primary_key=True)
+    model_version = Column(String, nullable=False)
+    pred_label = Column(String, nullable=False)
+    confidence = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __init__(self, content_hash, model_version, pred_label, confidence, **kw: Any):
+        super().__init__(**kw)
+        self.content_hash = content_hash
+        self.model_version = model_version
+        self.pred_label = pred_label
+        self.confidence = confidence
+        self.created_at = datetime.now(timezone.utc)
@@ -0,0 +1,24 @@
+from typing import Any
+from datetime import datetime, timezone
+from sqlalchemy import Column, String, DateTime
+from config.database import Base
+
+
+class SourceCache(Base):
+    __tablename__ = 'source_cache'
+    # "<source>:<canonical id>", e.g. "ig-reel:C8xYz12AbCd" or "youtube-video:dQw4w9WgXcQ"
+    source_key = Column(String, primary_key=True)
+    model_version = Column(String, nullable=False)
+    extension = Column(String, nullable=False)
+    pred_label = Column(String, nullable=False)
+    confidence = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __init__(self, source_key, model_version, extension, pred_label, confidence, **kw: Any):
+        super().__init__(**kw)
+        self.source_key = source_key
+        self.model_version = model_version
+        self.extension = extension
+        self.pred_label = pred_label
+        self.confidence = confidence
+        self.created_at = datetime.now(timezone.utc)
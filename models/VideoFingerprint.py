@@ -0,0 +1,23 @@
+from typing import Any
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, DateTime
+from config.database import Base
+
+
+class VideoFingerprint(Base):
+    __tablename__ = 'video_fingerprint'
+    fp_id = Column(Integer, primary_key=True, autoincrement=True, index=True)
+    # Concatenated 16 hex digit dHash of every sampled frame
+    fingerprint = Column(String, nullable=False)
+    model_version = Column(String, nullable=False, index=True)
+    pred_label = Column(String, nullable=False)
+    confidence = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __init__(self, fingerprint, model_version, pred_label, confidence, **kw: Any):
+        super().__init__(**kw)
+        self.fingerprint = fingerprint
+        self.model_version = model_version
+        self.pred_label = pred_label
+        self.confidence = confidence
+        self.created_at = datetime.now(timezone.utc)
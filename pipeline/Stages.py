@@ -0,0 +1,75 @@
+import time
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from config.detection import STAGE_RESOLVE_CONCURRENCY, STAGE_DOWNLOAD_CONCURRENCY
+from config.detection import STAGE_ANALYSE_CONCURRENCY, STAGE_INFER_CONCURRENCY
+
+# Recent durations kept per stage for the percentiles
+WINDOW = 512
+
+
+class Stage:
+    """
+    One step of the detection pipeline: at most concurrency detections run it at once, the others wait. Records how
+    long detections waited for a slot and how long they spent in the stage.
+    """
+
+    def __init__(self, name: str, concurrency: int):
+        self.name = name
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.waiting = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.wait_seconds = deque(maxlen=WINDOW)
+        self.run_seconds = deque(maxlen=WINDOW)
+
+    @asynccontextmanager
+    async def slot(self):
+        queued_at = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        started_at = time.perf_counter()
+        self.wait_seconds.append(started_at - queued_at)
+        self.running += 1
+        try:
+            yield
+        except BaseException:
+            self.failed += 1
+            raise
+        else:
+            self.completed += 1
+        finally:
+            self.running -= 1
+            self.run_seconds.append(time.perf_counter() - started_at)
+            self.semaphore.release()
+
+    def metrics(self) -> dict:
+        run_seconds = sorted(self.run_seconds)
+        return {
+            "concurrency": self.concurrency,
+            "running": self.running,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_wait_ms": 1000 * sum(self.wait_seconds) / len(self.wait_seconds) if self.wait_seconds else 0.0,
+            "p50_ms": 1000 * run_seconds[len(run_seconds) // 2] if run_seconds else 0.0,
+            "p95_ms": 1000 * run_seconds[int(len(run_seconds) * 0.95)] if run_seconds else 0.0,
+        }
+
+
+stages = {
+    "resolve": Stage("resolve", STAGE_RESOLVE_CONCURRENCY),
+    "download": Stage("download", STAGE_DOWNLOAD_CONCURRENCY),
+    "analyse": Stage("analyse", STAGE_ANALYSE_CONCURRENCY),
+    "infer": Stage("infer", STAGE_INFER_CONCURRENCY),
+}
+
+
+def stage_metrics() -> dict:
+    return {name: stage.metrics() for name, stage in stages.items()}
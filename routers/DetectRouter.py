@@ -3,15 +3,23 @@ from config.database import db_dependency
 from fastapi.responses import JSONResponse
 from dto.res.ErrorResDto import ErrorResDto
 from routers.AuthRouter import user_dependency
-from fastapi import APIRouter, File, UploadFile, Query
+from sources.SourceRegistry import source_adapters
+from starlette.concurrency import run_in_threadpool
 from dto.res.GeneralMsgResDto import GeneralMsgResDto
+from dto.res.DetectionJobResDto import DetectionJobResDto
+from dto.res.DetectMetricsResDto import DetectMetricsResDto
+from fastapi import APIRouter, File, UploadFile, Query, Form
 from services.impl.DetectServiceImpl import DetectServiceImpl
 from dto.res.UnauthenticatedResDto import UnauthenticatedResDto
+from services.impl.DetectionJobServiceImpl import DetectionJobServiceImpl
 
 router = APIRouter(prefix="/api/v1/detect", tags=["Detect Deepfake"])
 
 os.makedirs(os.getenv("UPLOAD_DIR"), exist_ok=True)
 
+# URL prefixes accepted by each URL based detection source
+source_url_prefixes = {source: adapter.url_prefixes for source, adapter in source_adapters.items()}
+
 
 @router.post("/direct-upload",
              response_model=GeneralMsgResDto,
@@ -19,6 +27,7 @@ os.makedirs(os.getenv("UPLOAD_DIR"), exist_ok=True)
                  401: {"model": UnauthenticatedResDto, "description": "Unauthorised"},
                  404: {"model": GeneralMsgResDto, "description": "Not found"},
                  400: {"model": GeneralMsgResDto, "description": "Bad Request"},
+                 413: {"model": GeneralMsgResDto, "description": "Payload Too Large"},
                  500: {"model": GeneralMsgResDto, "description": "Internal Server Error"}
              }
              )
@@ -57,7 +66,7 @@ async def upload_video(
         return JSONResponse(content=error_res.dict(), status_code=400)
 
     detect_service = DetectServiceImpl(db)
-    return detect_service.detect_video(user["user_id"], user["username"], file)
+    return await detect_service.detect_video(user["user_id"], user["username"], file)
 
 
 @router.get("/ig-reel",
@@ -286,3 +295,139 @@ async def facebook(
 
     detect_service = DetectServiceImpl(db)
     return await detect_service.facebook(user["user_id"], user["username"], url)
+
+
+@router.get("/metrics",
+            response_model=DetectMetricsResDto,
+            responses={
+                401: {"model": UnauthenticatedResDto, "description": "Unauthorised"}
+            }
+            )
+async def detect_metrics(
+        user: user_dependency,
+        db: db_dependency
+):
+    if user is None:
+        error_res = GeneralMsgResDto(
+            isSuccess=False,
+            hasException=True,
+            errorResDto=ErrorResDto(
+                code="unauthorized",
+                message="Authentication failed, please log in to access this resource.",
+                details=f"Full authentication is required to access this resource.",
+            ),
+            message="Request could not be completed due to an error.",
+        )
+        return JSONResponse(content=error_res.dict(), status_code=401)
+
+    detect_service = DetectServiceImpl(db)
+    return detect_service.get_metrics()
+
+
+@router.post("/jobs",
+             status_code=202,
+             response_model=DetectionJobResDto,
+             responses={
+                 401: {"model": UnauthenticatedResDto, "description": "Unauthorised"},
+                 400: {"model": GeneralMsgResDto, "description": "Bad Request"},
+                 413: {"model": GeneralMsgResDto, "description": "Payload Too Large"},
+                 500: {"model": GeneralMsgResDto, "description": "Internal Server Error"}
+             }
+             )
+async def submit_detection_job(
+        user: user_dependency,
+        db: db_dependency,
+        source: str = Form(description="One of direct-upload, ig-reel, twitter-video, youtube-video, facebook"),
+        url: str | None = Form(None, description="Url of the video, required for every source but direct-upload"),
+        file: UploadFile | None = File(None)
+):
+    if user is None:
+        error_res = GeneralMsgResDto(
+            isSuccess=False,
+            hasException=True,
+            errorResDto=ErrorResDto(
+                code="unauthorized",
+                message="Authentication failed, please log in to access this resource.",
+                details=f"Full authentication is required to access this resource.",
+            ),
+            message="Request could not be completed due to an error.",
+        )
+        return JSONResponse(content=error_res.dict(), status_code=401)
+
+    job_service = DetectionJobServiceImpl(db)
+
+    if source == "direct-upload":
+        allowed_extensions = {"mp4", "avi", "mov", "mkv"}
+        file_extension = file.filename.split(".")[-1].lower() if file else None
+
+        if file_extension not in allowed_extensions:
+            error_res = GeneralMsgResDto(
+                isSuccess=False,
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="bad_request",
+                    message=f"Invalid file format: {file_extension}",
+                    details=f"Only {allowed_extensions} are allowed",
+                ),
+                message="Request could not be completed due to an error."
+            )
+            return JSONResponse(content=error_res.dict(), status_code=400)
+
+        return await job_service.submit_upload(user["user_id"], user["username"], file)
+
+    if source not in source_url_prefixes:
+        error_res = GeneralMsgResDto(
+            isSuccess=False,
+            hasException=True,
+            errorResDto=ErrorResDto(
+                code="bad_request",
+                message=f"Invalid source: {source}",
+                details=f"Source must be one of direct-upload, {', '.join(source_url_prefixes)}",
+            ),
+            message="Request could not be completed due to an error."
+        )
+        return JSONResponse(content=error_res.dict(), status_code=400)
+
+    if not url or not url.startswith(source_url_prefixes[source]):
+        error_res = GeneralMsgResDto(
+            isSuccess=False,
+            hasException=True,
+            errorResDto=ErrorResDto(
+                code="bad_request",
+                message=f"Please enter valid url for {source}",
+                details=f"Url must start with one of {source_url_prefixes[source]}"
+            ),
+            message="Request could not be completed due to an error."
+        )
+        return JSONResponse(content=error_res.dict(), status_code=400)
+
+    return await job_service.submit_url(user["user_id"], user["username"], source, url)
+
+
+@router.get("/jobs/{job_id}",
+            response_model=DetectionJobResDto,
+            responses={
+                401: {"model": UnauthenticatedResDto, "description": "Unauthorised"},
+                404: {"model": GeneralMsgResDto, "description": "Not found"}
+            }
+            )
+async def get_detection_job(
+        user: user_dependency,
+        db: db_dependency,
+        job_id: int
+):
+    if user is None:
+        error_res = GeneralMsgResDto(
+            isSuccess=False,
+            hasException=True,
+            errorResDto=ErrorResDto(
+                code="unauthorized",
+                message="Authentication failed, please log in to access this resource.",
+                details=f"Full authentication is required to access this resource.",
+            ),
+            message="Request could not be completed due to an error.",
+        )
+        return JSONResponse(content=error_res.dict(), status_code=401)
+
+    job_service = DetectionJobServiceImpl(db)
+    return await run_in_threadpool(job_service.get_job, user["user_id"], job_id)
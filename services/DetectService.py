@@ -5,7 +5,11 @@ from fastapi import File, UploadFile
 class DetectService(ABC):
 
     @abstractmethod
-    def detect_video(self, user_id: int, username: str, file: UploadFile = File(...)):
+    def get_metrics(self):
+        pass
+
+    @abstractmethod
+    async def detect_video(self, user_id: int, username: str, file: UploadFile = File(...)):
         pass
 
     @abstractmethod
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from fastapi import File, UploadFile
+
+
+class DetectionJobService(ABC):
+
+    @abstractmethod
+    async def submit_upload(self, user_id: int, username: str, file: UploadFile = File(...)):
+        pass
+
+    @abstractmethod
+    async def submit_url(self, user_id: int, username: str, source: str, url: str):
+        pass
+
+    @abstractmethod
+    def get_job(self, user_id: int, job_id: int):
+        pass
+
+    @abstractmethod
+    async def process_next_job(self):
+        pass
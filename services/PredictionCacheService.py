@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class PredictionCacheService(ABC):
+
+    @abstractmethod
+    def get_cached_prediction(self, content_hash: str, model_version: str):
+        pass
+
+    @abstractmethod
+    def cache_prediction(self, content_hash: str, model_version: str, pred_label: str, confidence: str):
+        pass
@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class SourceCacheService(ABC):
+
+    @abstractmethod
+    def get_cached_source(self, source_key: str, model_version: str):
+        pass
+
+    @abstractmethod
+    def cache_source(self, source_key: str, model_version: str, extension: str, pred_label: str, confidence: str):
+        pass
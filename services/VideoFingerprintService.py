@@ -0,0 +1,12 @@
+from abc import ABC, abstractmethod
+
+
+class VideoFingerprintService(ABC):
+
+    @abstractmethod
+    def refresh_index(self, index, model_version: str):
+        pass
+
+    @abstractmethod
+    def add_fingerprint(self, index, fingerprint, model_version: str, pred_label: str, confidence: str):
+        pass
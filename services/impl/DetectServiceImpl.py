@@ -1,621 +1,743 @@
 import os
+import uuid
 import cv2
 import torch
-import httpx
-import shutil
+import asyncio
+import threading
 import numpy as np
-from torch.amp import autocast
-from facenet_pytorch import MTCNN
 from sqlalchemy.orm import Session
-from torchvision import transforms
 from fastapi import UploadFile, File
 from torch.nn import functional as F
+from config.database import SessionLocal
 from fastapi.responses import JSONResponse
-from urllib.parse import urlparse, parse_qs
+from inference.CompiledModel import warm_up
 from dto.res.ErrorResDto import ErrorResDto
-from torchvision.models.video import mvit_v2_s
+from ingest.Renditions import order_renditions
+from inference.Precision import PrecisionPolicy
 from services.DetectService import DetectService
+from pipeline.Stages import stages, stage_metrics
+from sources.SourceRegistry import source_adapters
+from datetime import datetime, timezone, timedelta
+from starlette.concurrency import run_in_threadpool
+from inference.BatchScheduler import BatchScheduler
+from inference.impl.TorchBackend import TorchBackend
+from config.detection import FACE_DETECTION_MAX_SIDE
 from dto.res.GeneralMsgResDto import GeneralMsgResDto
+from inference.InferenceExecutor import run_inference
+from inference.Quantization import quantized_model_path
+from dto.res.StageMetricsResDto import StageMetricsResDto
+from dto.res.BatchMetricsResDto import BatchMetricsResDto
 from services.impl.VideoServiceImpl import VideoServiceImpl
+from dto.res.DetectMetricsResDto import DetectMetricsResDto
+from config.detection import QUANTIZATION_CALIBRATION_CLIPS
+from inference.impl.HaarFaceDetector import HaarFaceDetector
+from inference.FaceExtractor import track_faces, track_stream
+from inference.impl.MtcnnFaceDetector import MtcnnFaceDetector
+from inference.FrameSampler import sample_frames, stream_frames
+from dto.res.DownloadMetricsResDto import DownloadMetricsResDto
+from dto.res.ResolverMetricsResDto import ResolverMetricsResDto
+from inference.impl.OnnxRuntimeBackend import OnnxRuntimeBackend
+from ingest.Resolver import resolver_metrics, ResolverUnavailable
+from inference.impl.CascadeFaceDetector import CascadeFaceDetector
 from services.impl.PredictionServiceImpl import PredictionServiceImpl
+from inference.Fingerprint import FingerprintIndex, video_fingerprint
+from inference.impl.OpenCvDnnFaceDetector import OpenCvDnnFaceDetector
+from services.impl.SourceCacheServiceImpl import SourceCacheServiceImpl
+from config.detection import INFERENCE_PRECISION, INFERENCE_CHANNELS_LAST
+from inference.ClipTensor import ClipBufferPool, face_pixels, clip_tensor
+from services.impl.PredictionCacheServiceImpl import PredictionCacheServiceImpl
+from ingest.StreamingDecode import is_faststart, GrowingFileFeed, FIFO_SUPPORTED
+from config.detection import MTCNN_THRESHOLDS, MTCNN_FACTOR, FACE_DNN_CONFIDENCE
+from config.detection import HAAR_CASCADE, HAAR_SCALE_FACTOR, HAAR_MIN_NEIGHBORS
+from services.impl.VideoFingerprintServiceImpl import VideoFingerprintServiceImpl
+from inference.DeepfakeModel import MODEL_PATH, INPUT_SIZE, CLIP_LENGTH, load_model
+from config.detection import UPLOAD_MAX_BYTES, DOWNLOAD_MAX_BYTES, PIPELINED_DOWNLOADS
+from config.detection import CLIP_BUFFER_POOL_SIZE, FACE_KEYFRAME_INTERVAL, FACE_TRACK_MIN_IOU
+from ingest.UploadIngest import ingest_upload, file_sha256, UploadTooLarge, UnsupportedContainer
+from ingest.Downloader import download_to_file, download_stats, DownloadTooLarge, DownloadFailed
+from config.detection import INFERENCE_COMPILE, INFERENCE_WARMUP_PASSES, INFERENCE_WARMUP_BATCH_SIZES
+from config.detection import INFERENCE_QUANTIZATION, QUANTIZATION_CACHE_DIR, QUANTIZATION_CALIBRATION_DIR
+from config.detection import INFERENCE_BACKEND, ONNX_MODEL_PATH, ORT_INTRA_OP_THREADS, ORT_INTER_OP_THREADS
+from config.detection import FACE_DETECTOR, FACE_CASCADE_DETECTOR, FACE_MIN_SIZE, FACE_DNN_MODEL, FACE_DNN_CONFIG
+from config.detection import BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, FINGERPRINT_MAX_DISTANCE, FINGERPRINT_REFRESH_SECONDS
 
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-MODEL_PATH = os.path.join("trained_model", "best_multi_6k_allaugs_mvit_mtcnn.pth")
-INPUT_SIZE = (224, 224)
-CLIP_LENGTH = 16
-
-face_detector = MTCNN(image_size=INPUT_SIZE[0], margin=20, keep_all=False, device=DEVICE)
-
-# Define transforms consistent with training
-transform = transforms.Compose([
-    transforms.ToPILImage(),
-    transforms.Resize(INPUT_SIZE),
-    transforms.ToTensor(),
-    transforms.Normalize(mean=[0.45, 0.45, 0.45], std=[0.225, 0.225, 0.225])  # Match training normalization
-])
-
-
-def get_youtube_video_id(url):
-    parsed_url = urlparse(url)
-    if "youtube.com" in parsed_url.netloc:
-        return parse_qs(parsed_url.query).get("v", [None])[0]
-    elif "youtu.be" in parsed_url.netloc:
-        return parsed_url.path.lstrip('/')
-    return None
-
-
-def get_facebook_share_id(url):
-    parsed_url = urlparse(url)
-    unique_id = parsed_url.path.strip('/').split('/')[-1]
-    return unique_id
-
-
-# Model class consistent with training
-class MViTForDeepfakes(torch.nn.Module):
-    def __init__(self, num_classes=2):
-        super().__init__()
-        self.backbone = mvit_v2_s(weights="DEFAULT")  # Use pretrained weights as in training
-        self.backbone.head = torch.nn.Sequential(
-            torch.nn.Dropout(0.5),
-            torch.nn.Linear(self.backbone.head[-1].in_features, num_classes)
-        )
-
-    def forward(self, x):
-        return self.backbone(x)
 
+# Created on first use or by warm_up_model, like the inference backend, so importing this module stays cheap
+face_detector = None
+face_detector_lock = threading.Lock()
+
+# Pixels of context kept around each face crop
+FACE_MARGIN = 20
+
+# Match training normalization
+CLIP_MEAN = [0.45, 0.45, 0.45]
+CLIP_STD = [0.225, 0.225, 0.225]
+
+# Model inputs are written into reused buffers, given back once the batch scheduler has scored them
+clip_buffers = ClipBufferPool((1, 3, CLIP_LENGTH, *INPUT_SIZE), CLIP_BUFFER_POOL_SIZE, DEVICE)
+
+
+def create_face_detector(name: str):
+    if name == "mtcnn":
+        return MtcnnFaceDetector(INPUT_SIZE[0], FACE_MARGIN, DEVICE, FACE_MIN_SIZE, MTCNN_THRESHOLDS, MTCNN_FACTOR)
+    if name == "haar":
+        return HaarFaceDetector(INPUT_SIZE[0], FACE_MARGIN, HAAR_CASCADE, FACE_MIN_SIZE, HAAR_SCALE_FACTOR,
+                                HAAR_MIN_NEIGHBORS)
+    if name == "dnn":
+        return OpenCvDnnFaceDetector(INPUT_SIZE[0], FACE_MARGIN, FACE_DNN_MODEL, FACE_DNN_CONFIG, FACE_DNN_CONFIDENCE,
+                                     FACE_MIN_SIZE)
+    if name == "cascade" and FACE_CASCADE_DETECTOR in ("haar", "dnn"):
+        return CascadeFaceDetector(create_face_detector(FACE_CASCADE_DETECTOR), create_face_detector("mtcnn"))
+    raise ValueError(f"Unknown FACE_DETECTOR {name} (FACE_CASCADE_DETECTOR {FACE_CASCADE_DETECTOR}), expected mtcnn, "
+                     f"haar, dnn or cascade")
+
+
+def get_face_detector():
+    global face_detector
+    with face_detector_lock:
+        if face_detector is None:
+            face_detector = create_face_detector(FACE_DETECTOR)
+    return face_detector
+
+
+def upload_path(filename: str):
+    """
+    Where a video is stored while it is detected: unique per detection, so that two detections of files with the
+    same name never overwrite each other's video (and cache one's result under the other's hash).
+    """
+    return os.path.join(os.getenv("UPLOAD_DIR"), f"{uuid.uuid4().hex}_{filename}")
+
+
+def get_source_video_id(source: str, url: str):
+    """
+    Canonical id of the post behind a social media URL, so that tracking parameters, mobile hosts, short links and
+    trailing slashes all map to the same cache entry. None when the URL is not recognised.
+    """
+    adapter = source_adapters.get(source)
+    if adapter is None or not url:
+        return None
+    try:
+        return adapter.canonicalize(url.strip())
+    except ValueError:
+        return None
 
-# Load model with proper checkpoint handling
-model = MViTForDeepfakes()
-checkpoint = torch.load(MODEL_PATH, map_location=DEVICE)
-
-# Extract state_dict from checkpoint (training saved it as a dict with 'model_state_dict')
-if 'model_state_dict' in checkpoint:
-    state_dict = checkpoint['model_state_dict']
-else:
-    state_dict = checkpoint
 
-# Remove 'module.' prefix if present (due to DataParallel in training)
-if list(state_dict.keys())[0].startswith("module."):
-    state_dict = {k.replace("module.", ""): v for k, v in state_dict.items()}
+def source_key(source: str, url: str):
+    video_id = get_source_video_id(source, url)
+    return f"{source}:{video_id}" if video_id else None
 
-model.load_state_dict(state_dict, strict=False)  # Use strict=False to handle potential mismatches
 
-if torch.cuda.device_count() > 1:
-    model = torch.nn.DataParallel(model)
+# Built on first use (warm_up_model at startup), so that process pool workers, which only preprocess, never load it
+backend = None
+backend_lock = threading.Lock()
 
-model.to(DEVICE).eval()
+# SHA-256 of the checkpoint, hashed on first use (see model_version)
+checkpoint_hash = None
+checkpoint_hash_lock = threading.Lock()
 
 allowed_extensions = {"mp4", "avi", "mov", "mkv"}
 
+# Detection source (as used in the API paths) -> Video.source
+source_labels = {
+    "direct-upload": "direct upload",
+    **{source: adapter.label for source, adapter in source_adapters.items()},
+}
+
 
 def preprocess_video(video_path):
-    cap = cv2.VideoCapture(video_path)
-    frames = []
+    return preprocess_frames(sample_frames(video_path, CLIP_LENGTH))
 
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frames.append(frame)
-    cap.release()
 
-    if len(frames) > CLIP_LENGTH:
-        idxs = np.linspace(0, len(frames) - 1, CLIP_LENGTH, dtype=int)
-        frames = [frames[i] for i in idxs]
+def preprocess_frames(frames):
+    frames = list(frames)
 
     while len(frames) < CLIP_LENGTH:
         frames.append(frames[-1] if frames else np.zeros((*INPUT_SIZE, 3), dtype=np.uint8))
 
-    processed_frames = []
-    face_detected = False
+    faces = track_faces(get_face_detector(), frames, FACE_KEYFRAME_INTERVAL, FACE_TRACK_MIN_IOU,
+                        FACE_DETECTION_MAX_SIDE)
+    return face_clip(frames, faces)
 
-    for frame in frames:
-        face = face_detector(frame)
-        if face is not None:
-            face_detected = True
-            face = face.permute(1, 2, 0).cpu().numpy()
-        else:
-            face = cv2.resize(frame, INPUT_SIZE)
-        face_tensor = transform(face)
-        processed_frames.append(face_tensor)
 
-    if not face_detected:
+def face_clip(frames, faces):
+    """
+    Model input of a clip from its frames and the face found in each of them (or None), None when there is no face.
+    """
+    detected = [i for i, face in enumerate(faces) if face is not None]
+    if not detected:
         return None
 
-    clip = torch.stack(processed_frames).permute(1, 0, 2, 3).unsqueeze(0).to(DEVICE)
-    return clip
+    # One [T, H, W, C] uint8 clip: the face where one was found, the whole frame resized elsewhere
+    crops = np.empty((len(frames), *INPUT_SIZE, 3), dtype=np.uint8)
+    crops[detected] = face_pixels(np.stack([faces[i] for i in detected]))
+    for i, (frame, face) in enumerate(zip(frames, faces)):
+        if face is None:
+            crops[i] = cv2.resize(frame, INPUT_SIZE)
 
+    return clip_tensor(crops, clip_buffers.acquire(), CLIP_MEAN, CLIP_STD)
 
-class DetectServiceImpl(DetectService):
-    def __init__(self, db: Session):
-        self.db = db
 
-    def detect_video(self, user_id: int, username: str, file: UploadFile = File(...)):
-        file_path = os.path.join(os.getenv("UPLOAD_DIR"), f"{username}_{file.filename}")
+def ensure_fingerprint_index():
+    loaded_at = fingerprint_index.loaded_at
+    if loaded_at is None or datetime.now(timezone.utc) - loaded_at > timedelta(seconds=FINGERPRINT_REFRESH_SECONDS):
+        db = SessionLocal()
         try:
-            with open(file_path, "wb") as buffer:
-                shutil.copyfileobj(file.file, buffer)
-        except Exception as e:
-            return JSONResponse(content=GeneralMsgResDto(
-                isSuccess=False,
-                hasException=True,
-                errorResDto=ErrorResDto(
-                    code="internal_server_error",
-                    message="Failed to save video file.",
-                    details=str(e),
-                ),
-                message="Error occurred while saving the video."
-            ).dict(), status_code=500)
+            VideoFingerprintServiceImpl(db).refresh_index(fingerprint_index, model_version())
+        finally:
+            db.close()
+
+
+def analyse_video(video_path):
+    """
+    Executor job: samples the clip once, looks its perceptual fingerprint up among already scored videos and only
+    runs face detection when there is no near-duplicate.
+    Returns (clip or None, fingerprint or None, (label, confidence) of the near-duplicate or None).
+    """
+    return analyse_frames(sample_frames(video_path, CLIP_LENGTH))
+
+
+def analyse_stream(fifo_path):
+    """
+    Executor job for pipelined downloads: analyse_video on a FIFO fed while the file is still downloading. Faces
+    are detected frame by frame as the stream is decoded, so here the near-duplicate lookup only comes after them.
+    Returns None when the stream could not be sampled completely, the downloaded file is analysed instead then.
+    """
+    tracked = track_stream(get_face_detector(), stream_frames(fifo_path, CLIP_LENGTH), CLIP_LENGTH,
+                           FACE_KEYFRAME_INTERVAL, FACE_TRACK_MIN_IOU, FACE_DETECTION_MAX_SIDE)
+    if tracked is None:
+        return None
+    frames, faces = tracked
+    fingerprint = video_fingerprint(frames)
+    match = near_duplicate(fingerprint)
+    if match is not None:
+        return None, fingerprint, match[0]
+    return face_clip(frames, faces), fingerprint, None
 
-        video_service = VideoServiceImpl(self.db)
-        new_video = video_service.add_video(f"{username}_{file.filename}", file_path, user_id, "direct upload", "NA")
 
-        if isinstance(new_video, JSONResponse):
-            return new_video
+def analyse_frames(frames):
+    fingerprint = video_fingerprint(frames)
+    match = near_duplicate(fingerprint)
+    if match is not None:
+        return None, fingerprint, match[0]
 
-        input_tensor = preprocess_video(file_path)
+    return preprocess_frames(frames), fingerprint, None
 
-        if input_tensor is None:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            return JSONResponse(content=GeneralMsgResDto(
-                isSuccess=False,
-                hasException=False,
-                message="Sorry, we are unable to detect sufficient face frames in the video. Please upload a different video."
-            ).dict(), status_code=400)
 
-        with torch.no_grad():
-            with autocast(device_type='cuda', enabled=True):
-                output = model(input_tensor)
-            probabilities = F.softmax(output, dim=1)
-            confidence, predicted_class = torch.max(probabilities, 1)
+def near_duplicate(fingerprint):
+    """
+    (result, distance) of an already scored video close enough to fingerprint, None when there is none or the
+    lookup is off.
+    """
+    if fingerprint is None or fingerprint_index.max_distance < 0:
+        return None
+    ensure_fingerprint_index()
+    return fingerprint_index.lookup(fingerprint)
+
+
+def calibration_clips():
+    """
+    Face clips of the QUANTIZATION_CALIBRATION_DIR videos, QUANTIZATION_CALIBRATION_CLIPS at most.
+    """
+    if not QUANTIZATION_CALIBRATION_DIR:
+        return
+    count = 0
+    for name in sorted(os.listdir(QUANTIZATION_CALIBRATION_DIR)):
+        if count >= QUANTIZATION_CALIBRATION_CLIPS:
+            return
+        clip = preprocess_video(os.path.join(QUANTIZATION_CALIBRATION_DIR, name))
+        if clip is not None:
+            count += 1
+            yield clip
+
+
+def create_backend(name: str):
+    if name == "torch":
+        cache_path = quantized_model_path(QUANTIZATION_CACHE_DIR, model_version(), INFERENCE_QUANTIZATION)
+        precision = PrecisionPolicy(INFERENCE_PRECISION, DEVICE, bool(INFERENCE_CHANNELS_LAST))
+        return TorchBackend(load_model(MODEL_PATH, DEVICE), DEVICE, (3, CLIP_LENGTH, *INPUT_SIZE), INFERENCE_COMPILE,
+                            INFERENCE_QUANTIZATION, cache_path, calibration_clips, precision)
+    if name == "onnxruntime":
+        # Without the checkpoint at hand the export is served as is, model_version() then comes from it
+        checkpoint_hash = model_version() if os.path.exists(MODEL_PATH) else None
+        return OnnxRuntimeBackend(ONNX_MODEL_PATH, ORT_INTRA_OP_THREADS, ORT_INTER_OP_THREADS, checkpoint_hash)
+    raise ValueError(f"Unknown INFERENCE_BACKEND {name}, expected torch or onnxruntime")
+
+
+def get_backend():
+    global backend
+    with backend_lock:
+        if backend is None:
+            backend = create_backend(INFERENCE_BACKEND)
+    return backend
+
+
+def model_version():
+    """
+    Cached predictions are only reused while they were produced by this exact checkpoint. Hashed once per process,
+    on first use rather than at import: the checkpoint is large and the model itself is loaded lazily too. An ONNX
+    export served without its checkpoint on disk gives the hash recorded at export time.
+    """
+    global checkpoint_hash
+    with checkpoint_hash_lock:
+        if checkpoint_hash is None:
+            if INFERENCE_BACKEND == "onnxruntime" and not os.path.exists(MODEL_PATH):
+                checkpoint_hash = get_backend().checkpoint_hash
+            else:
+                checkpoint_hash = file_sha256(MODEL_PATH)
+    return checkpoint_hash
 
-        result = "FAKE" if predicted_class.item() == 1 else "REAL"
-        confidence_score = f"{(confidence.item()*100):.2f}"
 
-        if os.path.exists(file_path):
-            os.remove(file_path)
+def forward_clips(batch):
+    return F.softmax(get_backend().forward(batch).float(), dim=1).cpu()
 
-        prediction_service = PredictionServiceImpl(self.db)
-        prediction_service.add_prediction(user_id, new_video.video_id, result)
 
-        return JSONResponse(content=GeneralMsgResDto(
-            isSuccess=True,
-            hasException=False,
-            message=f"Detection Result: {result} (Confidence: {confidence_score}%)."
-        ).dict(), status_code=200)
+def warm_up_model():
+    """
+    Loads the face detector and the INFERENCE_BACKEND model and runs the warm-up passes, before the API or a worker
+    takes detections (or next to them with INFERENCE_WARMUP_BACKGROUND).
+    """
+    get_face_detector()
+    get_backend()
+    return warm_up(forward_clips, (3, CLIP_LENGTH, *INPUT_SIZE), INFERENCE_WARMUP_BATCH_SIZES,
+                   INFERENCE_WARMUP_PASSES, DEVICE)
 
-    async def ig_reel(self, user_id: int, username: str, url: str):
-        callurl = f"https://instagram-reels-downloader-api.p.rapidapi.com/download?url={url}"
-        headers = {
-            "x-rapidapi-host": os.getenv("IG_H"),
-            "x-rapidapi-key": os.getenv("RKEY")
-        }
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(callurl, headers=headers)
-            if response:
-                data = response.json()
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="internal_server_error",
-                        message="No response from IG reel download server.",
-                        details="No response from IG reel download server. Try after some time.",
-                    ),
-                    message="Error occurred while downloading the reel download server."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-
-        if data["data"]["medias"][0]["url"]:
-            download_url = data["data"]["medias"][0]["url"]
-            extension = data["data"]["medias"][0]["extension"]
-            filename = f"{username}_{data["data"]["shortcode"]}.{extension}"
-        else:
-            error_res = GeneralMsgResDto(
-                isSuccess=False,
-                hasException=True,
-                errorResDto=ErrorResDto(
-                    code="not_found",
-                    message="We are unable to download this reel.",
-                    details="We are unable to download this reel. Try with another reel.",
-                ),
-                message="Error occurred while downloading the reel download server."
-            )
-            return JSONResponse(content=error_res.dict(), status_code=500)
 
-        if extension not in allowed_extensions:
-            error_res = GeneralMsgResDto(
-                isSuccess=False,
-                hasException=True,
-                errorResDto=ErrorResDto(
-                    code="bad_request",
-                    message=f"The downloaded file has extension {extension} which is currently not supported.",
-                    details=f"Only {allowed_extensions} are allowed",
-                ),
-                message="Request could not be completed due to an error."
-            )
-            return JSONResponse(content=error_res.dict(), status_code=400)
+batch_scheduler = BatchScheduler(forward_clips, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS)
+fingerprint_index = FingerprintIndex(FINGERPRINT_MAX_DISTANCE, CLIP_LENGTH)
 
-        file_path = os.path.join(os.getenv("UPLOAD_DIR"), filename)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(download_url)
-            if response.status_code == 200:
-                with open(file_path, "wb") as file:
-                    file.write(response.content)
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="not_found",
-                        message="We are unable to save this reel on our server.",
-                        details="We are unable to download this reel. Try with another reel.",
-                    ),
-                    message="Error occurred while downloading the reel download server."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
+def resolver_unavailable(label: str):
+    return JSONResponse(content=GeneralMsgResDto(
+        isSuccess=False,
+        hasException=True,
+        errorResDto=ErrorResDto(
+            code="service_unavailable",
+            message=f"The {label} download server is currently unavailable.",
+            details=f"The {label} download server failed repeatedly. Try after some time.",
+        ),
+        message="Request could not be completed due to an error."
+    ).dict(), status_code=503)
 
-        video_service = VideoServiceImpl(self.db)
-        new_video = video_service.add_video(filename, file_path, user_id, "instagram reel", url)
 
-        if isinstance(new_video, JSONResponse):
-            return new_video
+def video_too_large(max_bytes: int):
+    return JSONResponse(content=GeneralMsgResDto(
+        isSuccess=False,
+        hasException=True,
+        errorResDto=ErrorResDto(
+            code="payload_too_large",
+            message="The video is too large.",
+            details=f"Videos up to {max_bytes // (1024 * 1024)} MB are accepted.",
+        ),
+        message="Request could not be completed due to an error."
+    ).dict(), status_code=413)
 
-        input_tensor = preprocess_video(file_path)
 
-        if input_tensor is None:
+class DetectServiceImpl(DetectService):
+    def __init__(self, db: Session):
+        self.db = db
+        # file_path -> analysis started while that file was downloading, picked up by score_file
+        self.stream_analyses = {}
+
+    async def detect_file(self, user_id: int, filename: str, file_path: str, content_hash: str | None, source: str,
+                          url: str, on_stage=None, source_key: str | None = None, fallbacks=()):
+        """
+        Registers the video, runs the model on it and stores the prediction.
+        Returns (prediction, label, confidence_score) or a JSONResponse describing why it failed.
+        on_stage, when given, is awaited with the name of each stage as it starts.
+        source_key, when given, is the canonical key of the social media post the file was downloaded from.
+        fallbacks are (url, extension) of larger renditions of the same video, downloaded in turn while no face is
+        found.
+        """
+        video_service = VideoServiceImpl(self.db)
+        new_video = await run_in_threadpool(video_service.add_video, filename, file_path, user_id, source, url)
+
+        if isinstance(new_video, JSONResponse):
             if os.path.exists(file_path):
                 os.remove(file_path)
+            return new_video
+
+        scored = await self.score_file(file_path, content_hash, on_stage)
+        extension = os.path.splitext(filename)[1].lstrip(".")
+        for fallback_url, fallback_extension in fallbacks:
+            if scored is not None:
+                break
+            fallback_path = f"{os.path.splitext(file_path)[0]}.{fallback_extension}"
+            try:
+                content_hash = await self.download_video(fallback_url, fallback_path)
+                scored = await self.score_file(fallback_path, content_hash, on_stage)
+            except (DownloadTooLarge, DownloadFailed):
+                break
+            except asyncio.CancelledError:
+                # Only file_path is cleaned up by the callers
+                if os.path.exists(fallback_path):
+                    os.remove(fallback_path)
+                raise
+            extension = fallback_extension
+
+        if scored is None:
             return JSONResponse(content=GeneralMsgResDto(
                 isSuccess=False,
                 hasException=False,
                 message="Sorry, we are unable to detect sufficient face frames in the video. Please upload a different video."
             ).dict(), status_code=400)
 
-        with torch.no_grad():
-            with autocast(device_type='cuda', enabled=True):
-                output = model(input_tensor)
-            probabilities = F.softmax(output, dim=1)
-            confidence, predicted_class = torch.max(probabilities, 1)
-
-        result = "FAKE" if predicted_class.item() == 1 else "REAL"
-        confidence_score = f"{(confidence.item()*100):.2f}"
+        result, confidence_score = scored
+        if source_key:
+            await run_in_threadpool(SourceCacheServiceImpl(self.db).cache_source, source_key, model_version(),
+                                    extension, result, confidence_score)
+
+        return await self.record_prediction(user_id, new_video, result, confidence_score)
+
+    async def score_file(self, file_path: str, content_hash: str | None, on_stage=None):
+        """
+        Label and confidence of the video at file_path, from the caches when possible, None when it has no faces.
+        The file is removed either way, unless this is cancelled while analysing it.
+        """
+        stream_analysis = self.stream_analyses.pop(file_path, None)
+        cache_service = PredictionCacheServiceImpl(self.db)
+        cached = None
+        if content_hash:
+            cached = await run_in_threadpool(cache_service.get_cached_prediction, content_hash, model_version())
+
+        if cached is not None:
+            if stream_analysis is not None:
+                stream_analysis.cancel()
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            return cached.pred_label, cached.confidence
 
+        try:
+            if on_stage:
+                await on_stage("preprocessing")
+            analysed = None
+            if stream_analysis is not None:
+                # Holds an analyse slot of its own, taken while the file was downloading
+                try:
+                    analysed = await stream_analysis
+                except Exception:
+                    analysed = None
+            if analysed is None:
+                async with stages["analyse"].slot():
+                    analysed = await run_inference(analyse_video, file_path)
+            input_tensor, fingerprint, near_duplicate = analysed
+        except asyncio.CancelledError:
+            # Left to the caller: an interrupted detection job is queued again with it
+            raise
+        except BaseException:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
         if os.path.exists(file_path):
             os.remove(file_path)
 
-        prediction_service = PredictionServiceImpl(self.db)
-        prediction_service.add_prediction(user_id, new_video.video_id, result)
-
-        return JSONResponse(content=GeneralMsgResDto(
-            isSuccess=True,
-            hasException=False,
-            message=f"Detection Result: {result} (Confidence: {confidence_score}%)."
-        ).dict(), status_code=200)
-
-    async def twitter_video(self, user_id: int, username: str, url: str):
-        callurl = f"https://twitter-video-and-image-downloader.p.rapidapi.com/twitter?url={url}"
-        headers = {
-            "x-rapidapi-host": os.getenv("TWITTER_H"),
-            "x-rapidapi-key": os.getenv("RKEY")
-        }
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(callurl, headers=headers)
-            if response:
-                data = response.json()
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="internal_server_error",
-                        message="No response from Twitter video download server.",
-                        details="No response from Twitter video download server. Try after some time.",
-                    ),
-                    message="Error occurred while downloading the Twitter video."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-
-        if data["media"][0]["url"]:
-            download_url = data["media"][0]["url"]
-            extension = "mp4"
-            filename = f"{username}_{data["id"]}.{extension}"
+        if near_duplicate is not None:
+            result, confidence_score = near_duplicate
         else:
-            error_res = GeneralMsgResDto(
-                isSuccess=False,
-                hasException=True,
-                errorResDto=ErrorResDto(
-                    code="not_found",
-                    message="We are unable to download this Twitter video.",
-                    details="We are unable to download this Twitter video. Try with another Twitter video.",
-                ),
-                message="Error occurred while downloading the Twitter video."
-            )
-            return JSONResponse(content=error_res.dict(), status_code=500)
+            if input_tensor is None:
+                return None
+
+            if on_stage:
+                await on_stage("inferring")
+            async with stages["infer"].slot():
+                probabilities = await batch_scheduler.infer(input_tensor)
+            clip_buffers.release(input_tensor)
+            confidence, predicted_class = torch.max(probabilities, 0)
+
+            result = "FAKE" if predicted_class.item() == 1 else "REAL"
+            confidence_score = f"{(confidence.item()*100):.2f}"
+
+            if fingerprint is not None:
+                fingerprint_service = VideoFingerprintServiceImpl(self.db)
+                await run_in_threadpool(fingerprint_service.add_fingerprint, fingerprint_index, fingerprint,
+                                        model_version(), result, confidence_score)
+
+        if content_hash:
+            await run_in_threadpool(cache_service.cache_prediction, content_hash, model_version(), result,
+                                    confidence_score)
+        return result, confidence_score
+
+    async def download_video(self, download_url: str, file_path: str):
+        """
+        Downloads a rendition to file_path and returns its SHA-256. With PIPELINED_DOWNLOADS a faststart MP4 is
+        sampled and face-detected from a FIFO while it is still downloading, score_file then uses that analysis.
+        """
+        async with stages["download"].slot():
+            return await self.fetch_video(download_url, file_path)
+
+    async def fetch_video(self, download_url: str, file_path: str):
+        if not PIPELINED_DOWNLOADS or not FIFO_SUPPORTED:
+            return await download_to_file(download_url, file_path)
+
+        feed = None
+        analysis = None
+        first_chunk = True
+
+        async def analyse_while_downloading():
+            try:
+                async with stages["analyse"].slot():
+                    return await run_inference(analyse_stream, feed.fifo_path)
+            except asyncio.CancelledError:
+                # The exact cache answered: stop feeding, the executor job gives up at the end of the stream
+                feed.cancel()
+                raise
+            finally:
+                await run_in_threadpool(feed.close)
+
+        def on_chunk(chunk):
+            nonlocal feed, analysis, first_chunk
+            if first_chunk:
+                first_chunk = False
+                if is_faststart(chunk):
+                    feed = GrowingFileFeed(file_path)
+                    try:
+                        feed.start()
+                    except OSError:
+                        # No FIFO here (e.g. a filesystem without them): the file is analysed once downloaded
+                        feed = None
+                        return
+                    analysis = asyncio.ensure_future(analyse_while_downloading())
+                    # Never awaited when the download fails or the exact cache answers first
+                    analysis.add_done_callback(lambda done: done.cancelled() or done.exception())
+            elif feed is not None:
+                feed.notify()
 
+        try:
+            content_hash = await download_to_file(download_url, file_path, on_chunk=on_chunk)
+        except BaseException:
+            if feed is not None:
+                await run_in_threadpool(feed.close)
+            raise
+
+        if feed is not None:
+            feed.finish()
+            self.stream_analyses[file_path] = analysis
+        return content_hash
+
+    async def record_prediction(self, user_id: int, new_video, result: str, confidence_score: str):
+        prediction_service = PredictionServiceImpl(self.db)
+        prediction = await run_in_threadpool(prediction_service.add_prediction, user_id, new_video.video_id, result)
+
+        if isinstance(prediction, JSONResponse):
+            return prediction
+
+        return prediction, result, confidence_score
+
+    async def detect_cached_source(self, user_id: int, username: str, source: str, url: str):
+        """
+        Answers a social media detection from an earlier result for the same post, without resolving or downloading
+        it. Returns None on a cache miss, otherwise the same as detect_file.
+        """
+        video_id = get_source_video_id(source, url)
+        if video_id is None:
+            return None
+        cached = await run_in_threadpool(SourceCacheServiceImpl(self.db).get_cached_source, f"{source}:{video_id}",
+                                         model_version())
+        if cached is None:
+            return None
+
+        filename = f"{username}_{video_id}.{cached.extension}"
         file_path = os.path.join(os.getenv("UPLOAD_DIR"), filename)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(download_url)
-            if response.status_code == 200:
-                with open(file_path, "wb") as file:
-                    file.write(response.content)
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="not_found",
-                        message="We are unable to save this Twitter video on our server.",
-                        details="We are unable to download this Twitter video. Try with another Twitter video.",
-                    ),
-                    message="Error occurred while downloading the Twitter video."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-
         video_service = VideoServiceImpl(self.db)
-        new_video = video_service.add_video(filename, file_path, user_id, "twitter video", url)
-
+        new_video = await run_in_threadpool(video_service.add_video, filename, file_path, user_id,
+                                            source_labels[source], url)
         if isinstance(new_video, JSONResponse):
             return new_video
 
-        input_tensor = preprocess_video(file_path)
+        return await self.record_prediction(user_id, new_video, cached.pred_label, cached.confidence)
 
-        if input_tensor is None:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            return JSONResponse(content=GeneralMsgResDto(
-                isSuccess=False,
-                hasException=False,
-                message="Sorry, we are unable to detect sufficient face frames in the video. Please upload a different video."
-            ).dict(), status_code=400)
+    async def detect_source(self, user_id: int, username: str, source: str, url: str):
+        detected = await self.detect_cached_source(user_id, username, source, url)
+        if detected is not None:
+            return detected
 
-        with torch.no_grad():
-            with autocast(device_type='cuda', enabled=True):
-                output = model(input_tensor)
-            probabilities = F.softmax(output, dim=1)
-            confidence, predicted_class = torch.max(probabilities, 1)
+        fetched = await self.fetch_source(source, username, url)
+        if isinstance(fetched, JSONResponse):
+            return fetched
 
-        result = "FAKE" if predicted_class.item() == 1 else "REAL"
-        confidence_score = f"{(confidence.item()*100):.2f}"
+        filename, file_path, content_hash, fallbacks = fetched
+        try:
+            return await self.detect_file(user_id, filename, file_path, content_hash, source_labels[source], url,
+                                          source_key=source_key(source, url), fallbacks=fallbacks)
+        except asyncio.CancelledError:
+            # Unlike a job's, nothing runs this detection again
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
 
-        if os.path.exists(file_path):
-            os.remove(file_path)
+    async def run_detection(self, user_id: int, filename: str, file_path: str, content_hash: str | None, source: str,
+                            url: str):
+        try:
+            detected = await self.detect_file(user_id, filename, file_path, content_hash, source, url)
+        except asyncio.CancelledError:
+            # Unlike a job's, nothing runs this detection again
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        return self.detection_response(detected)
 
-        prediction_service = PredictionServiceImpl(self.db)
-        prediction_service.add_prediction(user_id, new_video.video_id, result)
+    def detection_response(self, detected):
+        if isinstance(detected, JSONResponse):
+            return detected
 
+        _, result, confidence_score = detected
         return JSONResponse(content=GeneralMsgResDto(
             isSuccess=True,
             hasException=False,
             message=f"Detection Result: {result} (Confidence: {confidence_score}%)."
         ).dict(), status_code=200)
 
-    async def youtube_video(self, user_id: int, username: str, url: str):
-        callurl = f"https://social-download-all-in-one.p.rapidapi.com/v1/social/autolink"
-        headers = {
-            "x-rapidapi-host": os.getenv("YT_H"),
-            "x-rapidapi-key": os.getenv("RKEY")
-        }
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(callurl, json={"url": url}, headers=headers)
-            if response:
-                data = response.json()
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="internal_server_error",
-                        message="No response from YouTube video download server.",
-                        details="No response from YouTube video download server. Try after some time.",
-                    ),
-                    message="Error occurred while downloading the YouTube video."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-
-        if data["medias"][0]["url"]:
-            download_url = data["medias"][0]["url"]
-            extension = data["medias"][0]["ext"]
-            videoid = get_youtube_video_id(url)
-            if videoid is None:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="not_found",
-                        message="We are unable to extract video id for this YouTube video.",
-                        details="We are unable to extract video id for this YouTube video. Try with another YouTube video.",
-                    ),
-                    message="Request could not be completed due to an error."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-            filename = f"{username}_{videoid}.{extension}"
-        else:
+    async def fetch_source(self, source: str, username: str, url: str):
+        """
+        Resolves a social media URL through its source adapter and downloads the first rendition, in an allowed
+        container for the sources that check it. Returns (filename, file_path, content_hash, fallbacks) or a JSONResponse describing why it failed.
+        """
+        adapter = source_adapters[source]
+        name = adapter.name
+        try:
+            async with stages["resolve"].slot():
+                resolved = await adapter.resolve(url)
+        except ResolverUnavailable:
+            return resolver_unavailable(name)
+        if resolved is None:
             error_res = GeneralMsgResDto(
                 isSuccess=False,
                 hasException=True,
                 errorResDto=ErrorResDto(
-                    code="not_found",
-                    message="We are unable to download this YouTube video.",
-                    details="We are unable to download this YouTube video. Try with another YouTube video.",
+                    code="internal_server_error",
+                    message=f"No response from {name} download server.",
+                    details=f"No response from {name} download server. Try after some time.",
                 ),
-                message="Error occurred while downloading the YouTube video."
+                message=f"Error occurred while downloading the {name}."
             )
             return JSONResponse(content=error_res.dict(), status_code=500)
 
-        file_path = os.path.join(os.getenv("UPLOAD_DIR"), filename)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(download_url)
-            if response.status_code in (200, 302):  # Handle redirect or success
-                with open(file_path, "wb") as file:
-                    file.write(response.content)
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="not_found",
-                        message="We are unable to save this YouTube video on our server.",
-                        details="We are unable to download this YouTube video. Try with another YouTube video.",
-                    ),
-                    message="Error occurred while downloading the YouTube video."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-
-        video_service = VideoServiceImpl(self.db)
-        new_video = video_service.add_video(filename, file_path, user_id, "youtube video", url)
-
-        if isinstance(new_video, JSONResponse):
-            return new_video
-
-        input_tensor = preprocess_video(file_path)
-
-        if input_tensor is None:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-            return JSONResponse(content=GeneralMsgResDto(
+        video_id, medias = resolved
+        renditions = order_renditions(medias, extensions=allowed_extensions if adapter.checks_extension else None)
+        unsupported = order_renditions(medias) if not renditions else []
+        if not renditions and not unsupported:
+            error_res = GeneralMsgResDto(
                 isSuccess=False,
-                hasException=False,
-                message="Sorry, we are unable to detect sufficient face frames in the video. Please upload a different video."
-            ).dict(), status_code=400)
-
-        with torch.no_grad():
-            with autocast(device_type='cuda', enabled=True):
-                output = model(input_tensor)
-            probabilities = F.softmax(output, dim=1)
-            confidence, predicted_class = torch.max(probabilities, 1)
-
-        result = "FAKE" if predicted_class.item() == 1 else "REAL"
-        confidence_score = f"{(confidence.item()*100):.2f}"
-
-        if os.path.exists(file_path):
-            os.remove(file_path)
-
-        prediction_service = PredictionServiceImpl(self.db)
-        prediction_service.add_prediction(user_id, new_video.video_id, result)
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="not_found",
+                    message=f"We are unable to download this {name}.",
+                    details=f"We are unable to download this {name}. Try with another {name}.",
+                ),
+                message=f"Error occurred while downloading the {name}."
+            )
+            return JSONResponse(content=error_res.dict(), status_code=500)
 
-        return JSONResponse(content=GeneralMsgResDto(
-            isSuccess=True,
-            hasException=False,
-            message=f"Detection Result: {result} (Confidence: {confidence_score}%)."
-        ).dict(), status_code=200)
+        if not renditions:
+            extension = unsupported[0].get("extension")
+            error_res = GeneralMsgResDto(
+                isSuccess=False,
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="bad_request",
+                    message=f"The downloaded file has extension {extension} which is currently not supported.",
+                    details=f"Only {allowed_extensions} are allowed",
+                ),
+                message="Request could not be completed due to an error."
+            )
+            return JSONResponse(content=error_res.dict(), status_code=400)
 
-    async def facebook(self, user_id: int, username: str, url: str):
-        callurl = f"https://social-download-all-in-one.p.rapidapi.com/v1/social/autolink"
-        headers = {
-            "x-rapidapi-host": os.getenv("YT_H"),
-            "x-rapidapi-key": os.getenv("RKEY")
-        }
-
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(callurl, json={"url": url}, headers=headers)
-            if response:
-                data = response.json()
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="internal_server_error",
-                        message="No response from Facebook video download server.",
-                        details="No response from Facebook video download server. Try after some time.",
-                    ),
-                    message="Error occurred while downloading the Facebook video."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-
-        if data["medias"][0]["url"]:
-            download_url = data["medias"][0]["url"]
-            extension = data["medias"][0]["extension"]
-            videoid = get_facebook_share_id(url)
-            if videoid is None:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="not_found",
-                        message="We are unable to extract video id for this Facebook video.",
-                        details="We are unable to extract video id for this Facebook video. Try with another Facebook video.",
-                    ),
-                    message="Request could not be completed due to an error."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
-            filename = f"{username}_{videoid}.{extension}"
-        else:
+        if video_id is None:
             error_res = GeneralMsgResDto(
                 isSuccess=False,
                 hasException=True,
                 errorResDto=ErrorResDto(
                     code="not_found",
-                    message="We are unable to download this Facebook video.",
-                    details="We are unable to download this Facebook video. Try with another Facebook video.",
+                    message=f"We are unable to extract video id for this {name}.",
+                    details=f"We are unable to extract video id for this {name}. Try with another {name}.",
                 ),
-                message="Error occurred while downloading the Facebook video."
+                message="Request could not be completed due to an error."
             )
             return JSONResponse(content=error_res.dict(), status_code=500)
 
-        file_path = os.path.join(os.getenv("UPLOAD_DIR"), filename)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(download_url)
-            if response.status_code == 200:
-                with open(file_path, "wb") as file:
-                    file.write(response.content)
-            else:
-                error_res = GeneralMsgResDto(
-                    isSuccess=False,
-                    hasException=True,
-                    errorResDto=ErrorResDto(
-                        code="not_found",
-                        message="We are unable to save this Facebook video on our server.",
-                        details="We are unable to download this Facebook video. Try with another Facebook video.",
-                    ),
-                    message="Error occurred while downloading the Facebook video."
-                )
-                return JSONResponse(content=error_res.dict(), status_code=500)
+        download_url, extension = renditions[0]["url"], renditions[0]["extension"]
+        fallbacks = [(media["url"], media["extension"]) for media in renditions[1:]]
+        filename = f"{username}_{video_id}.{extension}"
+        file_path = upload_path(filename)
 
-        video_service = VideoServiceImpl(self.db)
-        new_video = video_service.add_video(filename, file_path, user_id, "facebook video", url)
+        try:
+            content_hash = await self.download_video(download_url, file_path)
+        except DownloadTooLarge:
+            return video_too_large(DOWNLOAD_MAX_BYTES)
+        except DownloadFailed:
+            error_res = GeneralMsgResDto(
+                isSuccess=False,
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="not_found",
+                    message=f"We are unable to save this {name} on our server.",
+                    details=f"We are unable to download this {name}. Try with another {name}.",
+                ),
+                message=f"Error occurred while downloading the {name}."
+            )
+            return JSONResponse(content=error_res.dict(), status_code=500)
 
-        if isinstance(new_video, JSONResponse):
-            return new_video
+        return filename, file_path, content_hash, fallbacks
 
-        input_tensor = preprocess_video(file_path)
+    def get_metrics(self):
+        return DetectMetricsResDto(
+            stages={name: StageMetricsResDto(**metrics) for name, metrics in stage_metrics().items()},
+            batching=BatchMetricsResDto(**batch_scheduler.metrics()),
+            downloads=DownloadMetricsResDto(**download_stats.metrics()),
+            resolvers={name: ResolverMetricsResDto(**metrics) for name, metrics in resolver_metrics().items()},
+        )
 
-        if input_tensor is None:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+    async def save_upload(self, file: UploadFile, file_path: str):
+        """
+        Streams the upload to file_path. Returns its SHA-256 or a JSONResponse when it is too large, is not a
+        video container or could not be written.
+        """
+        try:
+            content_hash, _, _ = await ingest_upload(file, file_path)
+        except UploadTooLarge:
+            return video_too_large(UPLOAD_MAX_BYTES)
+        except UnsupportedContainer:
             return JSONResponse(content=GeneralMsgResDto(
                 isSuccess=False,
-                hasException=False,
-                message="Sorry, we are unable to detect sufficient face frames in the video. Please upload a different video."
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="bad_request",
+                    message="The uploaded file is not a supported video.",
+                    details=f"Only {allowed_extensions} are allowed",
+                ),
+                message="Request could not be completed due to an error."
             ).dict(), status_code=400)
+        except Exception as e:
+            return JSONResponse(content=GeneralMsgResDto(
+                isSuccess=False,
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="internal_server_error",
+                    message="Failed to save video file.",
+                    details=str(e),
+                ),
+                message="Error occurred while saving the video."
+            ).dict(), status_code=500)
 
-        with torch.no_grad():
-            with autocast(device_type='cuda', enabled=True):
-                output = model(input_tensor)
-            probabilities = F.softmax(output, dim=1)
-            confidence, predicted_class = torch.max(probabilities, 1)
+        return content_hash
 
-        result = "FAKE" if predicted_class.item() == 1 else "REAL"
-        confidence_score = f"{(confidence.item()*100):.2f}"
+    async def detect_video(self, user_id: int, username: str, file: UploadFile = File(...)):
+        filename = f"{username}_{file.filename}"
+        file_path = upload_path(filename)
+        content_hash = await self.save_upload(file, file_path)
+        if isinstance(content_hash, JSONResponse):
+            return content_hash
 
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        return await self.run_detection(user_id, filename, file_path, content_hash, "direct upload", "NA")
 
-        prediction_service = PredictionServiceImpl(self.db)
-        prediction_service.add_prediction(user_id, new_video.video_id, result)
+    async def ig_reel(self, user_id: int, username: str, url: str):
+        return self.detection_response(await self.detect_source(user_id, username, "ig-reel", url))
 
-        return JSONResponse(content=GeneralMsgResDto(
-            isSuccess=True,
-            hasException=False,
-            message=f"Detection Result: {result} (Confidence: {confidence_score}%)."
-        ).dict(), status_code=200)
+    async def twitter_video(self, user_id: int, username: str, url: str):
+        return self.detection_response(await self.detect_source(user_id, username, "twitter-video", url))
+
+    async def youtube_video(self, user_id: int, username: str, url: str):
+        return self.detection_response(await self.detect_source(user_id, username, "youtube-video", url))
+
+    async def facebook(self, user_id: int, username: str, url: str):
+        return self.detection_response(await self.detect_source(user_id, username, "facebook", url))
@@ -0,0 +1,202 @@
+import os
+import json
+import asyncio
+import traceback
+from sqlalchemy.orm import Session
+from fastapi import UploadFile, File
+from config.database import SessionLocal
+from fastapi.responses import JSONResponse
+from dto.res.ErrorResDto import ErrorResDto
+from models.DetectionJob import DetectionJob
+from dao.DetectionJobDAO import DetectionJobDAO
+from datetime import datetime, timezone, timedelta
+from starlette.concurrency import run_in_threadpool
+from config.detection import DETECT_JOB_LEASE_SECONDS
+from dto.res.GeneralMsgResDto import GeneralMsgResDto
+from dto.res.PredictionResDto import PredictionResDto
+from dto.res.DetectionJobResDto import DetectionJobResDto
+from services.DetectionJobService import DetectionJobService
+from services.impl.PredictionServiceImpl import PredictionServiceImpl
+from services.impl.DetectServiceImpl import DetectServiceImpl, source_key, source_labels, upload_path
+
+
+def error_message(response: JSONResponse):
+    body = json.loads(response.body)
+    if body.get("errorResDto"):
+        return body["errorResDto"]["message"]
+    return body.get("message")
+
+
+def requeue_fields(job: DetectionJob):
+    """
+    Fields putting an interrupted job back in the queue. A social media job is fetched again from the start, an
+    upload job only goes back when its video is still there (analysis removes it).
+    """
+    if job.source != "direct-upload":
+        if job.filepath and os.path.exists(job.filepath):
+            os.remove(job.filepath)
+        return {"state": "queued", "filename": None, "filepath": None, "content_hash": None}
+    if job.filepath and os.path.exists(job.filepath):
+        return {"state": "queued"}
+    return {"state": "failed", "error": "Detection was interrupted after the uploaded video was removed, please "
+                                        "upload it again."}
+
+
+def renew_lease(job_id: int):
+    # Own session: the job's is in use by the detection, from other threads
+    db = SessionLocal()
+    try:
+        DetectionJobDAO(db).renew_lease(job_id)
+    finally:
+        db.close()
+
+
+async def keep_lease(job_id: int):
+    """
+    Renews the lease of a running job every third of DETECT_JOB_LEASE_SECONDS until cancelled, so that only jobs
+    whose worker is gone are requeued, however long the detection waits for its stages.
+    """
+    while True:
+        await asyncio.sleep(DETECT_JOB_LEASE_SECONDS / 3)
+        try:
+            await run_in_threadpool(renew_lease, job_id)
+        except Exception:
+            traceback.print_exc()
+
+
+class DetectionJobServiceImpl(DetectionJobService):
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dao = DetectionJobDAO(db)
+
+    def create_job(self, job: DetectionJob):
+        try:
+            new_job = self.dao.create_job(job)
+        except Exception as e:
+            error_res = GeneralMsgResDto(
+                isSuccess=False,
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="internal_server_error",
+                    message="Error occurred while creating detection job.",
+                    details=f"Error occurred while creating detection job: {e}",
+                ),
+                message="Request could not be completed due to an error.",
+            )
+            return JSONResponse(content=error_res.dict(), status_code=500)
+
+        return JSONResponse(content=self.to_dto(new_job).model_dump(mode="json"), status_code=202)
+
+    async def submit_upload(self, user_id: int, username: str, file: UploadFile = File(...)):
+        filename = f"{username}_{file.filename}"
+        file_path = upload_path(filename)
+        content_hash = await DetectServiceImpl(self.db).save_upload(file, file_path)
+        if isinstance(content_hash, JSONResponse):
+            return content_hash
+
+        job = DetectionJob(user_id, username, "direct-upload", None, filename, file_path, content_hash)
+        return await run_in_threadpool(self.create_job, job)
+
+    async def submit_url(self, user_id: int, username: str, source: str, url: str):
+        job = DetectionJob(user_id, username, source, url, None, None, None)
+        return await run_in_threadpool(self.create_job, job)
+
+    def get_job(self, user_id: int, job_id: int):
+        job = self.dao.get_job_by_id(job_id)
+        if job is None or job.user_id != user_id:
+            error_res = GeneralMsgResDto(
+                isSuccess=False,
+                hasException=True,
+                errorResDto=ErrorResDto(
+                    code="not_found",
+                    message="Detection job not found",
+                    details=f"Detection job not found with job_id: {job_id}",
+                ),
+                message="Request could not be completed due to an error.",
+            )
+            return JSONResponse(content=error_res.dict(), status_code=404)
+        return self.to_dto(job)
+
+    def to_dto(self, job: DetectionJob):
+        prediction = None
+        message = None
+        if job.pred_id is not None:
+            row = PredictionServiceImpl(self.db).get_prediction_by_prediction_id(job.pred_id)
+            if not isinstance(row, JSONResponse):
+                prediction = PredictionResDto(**row._mapping)
+        if job.state == "done":
+            message = f"Detection Result: {job.pred_label} (Confidence: {job.confidence}%)."
+
+        return DetectionJobResDto(
+            job_id=job.job_id,
+            source=job.source,
+            url=job.url,
+            state=job.state,
+            message=message,
+            error=job.error,
+            prediction=prediction,
+            created_at=job.created_at,
+            updated_at=job.updated_at,
+        )
+
+    async def process_next_job(self):
+        """
+        Claims the oldest queued job and runs it to completion, renewing its lease meanwhile. Returns False when the
+        queue was empty. Jobs whose worker died first go back to the queue.
+        """
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=DETECT_JOB_LEASE_SECONDS)
+        await run_in_threadpool(self.dao.requeue_stale_jobs, stale_before, requeue_fields)
+        job = await run_in_threadpool(self.dao.claim_next_job)
+        if job is None:
+            return False
+
+        lease = asyncio.create_task(keep_lease(job.job_id))
+        try:
+            await self.process_job(job)
+        except asyncio.CancelledError:
+            # Worker stopped (shutdown): the job goes back to the queue for the next one
+            await run_in_threadpool(self.db.rollback)
+            await run_in_threadpool(self.dao.requeue_job, job, **requeue_fields(job))
+            raise
+        except Exception as e:
+            await run_in_threadpool(self.db.rollback)
+            await run_in_threadpool(self.dao.update_job, job, state="failed", error=str(e))
+        finally:
+            lease.cancel()
+        return True
+
+    async def process_job(self, job: DetectionJob):
+        detect_service = DetectServiceImpl(self.db)
+
+        async def on_stage(state: str):
+            await run_in_threadpool(self.dao.update_job, job, state=state)
+
+        fallbacks = []
+        if job.filepath is None:
+            detected = await detect_service.detect_cached_source(job.user_id, job.username, job.source, job.url)
+            if detected is not None:
+                await self.finish_job(job, detected)
+                return
+
+            fetched = await detect_service.fetch_source(job.source, job.username, job.url)
+            if isinstance(fetched, JSONResponse):
+                await run_in_threadpool(self.dao.update_job, job, state="failed", error=error_message(fetched))
+                return
+            filename, file_path, content_hash, fallbacks = fetched
+            await run_in_threadpool(self.dao.update_job, job, filename=filename, filepath=file_path,
+                                    content_hash=content_hash)
+
+        detected = await detect_service.detect_file(job.user_id, job.filename, job.filepath, job.content_hash,
+                                                    source_labels[job.source], job.url or "NA", on_stage,
+                                                    source_key(job.source, job.url), fallbacks)
+        await self.finish_job(job, detected)
+
+    async def finish_job(self, job: DetectionJob, detected):
+        if isinstance(detected, JSONResponse):
+            await run_in_threadpool(self.dao.update_job, job, state="failed", error=error_message(detected))
+            return
+
+        prediction, result, confidence_score = detected
+        await run_in_threadpool(self.dao.update_job, job, state="done", pred_id=prediction.pred_id,
+                                pred_label=result, confidence=confidence_score)
@@ -0,0 +1,29 @@
+from sqlalchemy.orm import Session
+from models.PredictionCache import PredictionCache
+from dao.PredictionCacheDAO import PredictionCacheDAO
+from services.PredictionCacheService import PredictionCacheService
+
+
+class PredictionCacheServiceImpl(PredictionCacheService):
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dao = PredictionCacheDAO(db)
+
+    def get_cached_prediction(self, content_hash: str, model_version: str):
+        entry = self.dao.get_by_hash(content_hash)
+        if entry is None:
+            return None
+        if entry.model_version != model_version:
+            # Scored by a previous checkpoint, the current model may disagree
+            self.dao.delete(entry)
+            return None
+        return entry
+
+    def cache_prediction(self, content_hash: str, model_version: str, pred_label: str, confidence: str):
+        try:
+            return self.dao.save(PredictionCache(content_hash, model_version, pred_label, confidence))
+        except Exception:
+            # A cache write must never fail the detection that produced it
+            self.db.rollback()
+            return None
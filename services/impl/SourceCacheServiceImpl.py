@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+from models.SourceCache import SourceCache
+from dao.SourceCacheDAO import SourceCacheDAO
+from datetime import datetime, timezone, timedelta
+from config.detection import SOURCE_CACHE_TTL_SECONDS
+from services.SourceCacheService import SourceCacheService
+
+
+class SourceCacheServiceImpl(SourceCacheService):
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dao = SourceCacheDAO(db)
+
+    def get_cached_source(self, source_key: str, model_version: str):
+        if SOURCE_CACHE_TTL_SECONDS <= 0:
+            return None
+        entry = self.dao.get_by_key(source_key)
+        if entry is None:
+            return None
+        created_at = entry.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        # The post behind a URL can be edited or replaced, so unlike content hashes these entries expire
+        expired = datetime.now(timezone.utc) - created_at > timedelta(seconds=SOURCE_CACHE_TTL_SECONDS)
+        if expired or entry.model_version != model_version:
+            self.dao.delete(entry)
+            return None
+        return entry
+
+    def cache_source(self, source_key: str, model_version: str, extension: str, pred_label: str, confidence: str):
+        if SOURCE_CACHE_TTL_SECONDS <= 0:
+            return None
+        try:
+            return self.dao.save(SourceCache(source_key, model_version, extension, pred_label, confidence))
+        except Exception:
+            # A cache write must never fail the detection that produced it
+            self.db.rollback()
+            return None
@@ -0,0 +1,40 @@
+from sqlalchemy.orm import Session
+from datetime import datetime, timezone
+from models.VideoFingerprint import VideoFingerprint
+from dao.VideoFingerprintDAO import VideoFingerprintDAO
+from services.VideoFingerprintService import VideoFingerprintService
+from inference.Fingerprint import FingerprintIndex, encode_fingerprint, decode_fingerprint
+
+
+class VideoFingerprintServiceImpl(VideoFingerprintService):
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dao = VideoFingerprintDAO(db)
+
+    def refresh_index(self, index: FingerprintIndex, model_version: str):
+        """
+        Pulls fingerprints stored since the last refresh (possibly by other processes) into the in-memory index.
+        """
+        rows = self.dao.get_fingerprints_after(index.last_loaded_id, model_version)
+        index.add_many([
+            (row.fp_id, decode_fingerprint(row.fingerprint), (row.pred_label, row.confidence)) for row in rows
+        ])
+        if rows:
+            index.last_loaded_id = rows[-1].fp_id
+        index.loaded_at = datetime.now(timezone.utc)
+
+    def add_fingerprint(self, index: FingerprintIndex, fingerprint, model_version: str, pred_label: str,
+                        confidence: str):
+        try:
+            row = self.dao.create_fingerprint(
+                VideoFingerprint(encode_fingerprint(fingerprint), model_version, pred_label, confidence)
+            )
+        except Exception:
+            # Like the exact-hash cache, failing to index a video must not fail its detection
+            self.db.rollback()
+            return None
+        # Still stored while the lookup is off, so turning it on starts from every video scored until then
+        if index.max_distance >= 0:
+            index.add(row.fp_id, fingerprint, (pred_label, confidence))
+        return row
@@ -0,0 +1,47 @@
+from abc import ABC, abstractmethod
+from ingest.Resolver import resolve
+
+
+class SourceAdapter(ABC):
+    """
+    What is specific to one social media source: recognising its URLs and asking its resolver API for the media.
+
+    Everything else, from the result caches and resolver circuit breaking to rendition choice, download, detection
+    and per-stage limits and timings, is shared by DetectServiceImpl.fetch_source / detect_source.
+    """
+
+    # Source as used in the API paths and detection jobs, e.g. "ig-reel"
+    source: str
+    # Video.source
+    label: str
+    # How the video is called in error messages, e.g. "Instagram reel"
+    name: str
+    # Resolver provider, sources sharing one also share its cache and circuit breaker
+    provider: str
+    url_prefixes: tuple
+    # Whether media in containers other than DetectServiceImpl's allowed_extensions are refused, otherwise the
+    # renditions are taken in whatever container the resolver gives
+    checks_extension: bool = False
+
+    @abstractmethod
+    def canonicalize(self, url: str):
+        """
+        Canonical id of the post behind url, None when the URL is not recognised.
+        """
+        pass
+
+    @abstractmethod
+    async def resolve(self, url: str):
+        """
+        Returns (video id, media entries) or None when the resolver failed. Every media entry has a "url" and an
+        "extension", plus whatever size hints the resolver gives (see ingest.Renditions).
+        Raises ResolverUnavailable while the provider's circuit is open.
+        """
+        pass
+
+    def cache_key(self, url: str):
+        video_id = self.canonicalize(url)
+        return f"{self.source}:{video_id}" if video_id else None
+
+    async def call_resolver(self, url: str, request):
+        return await resolve(self.provider, self.cache_key(url) or url, request)
@@ -0,0 +1,10 @@
+from sources.impl.TwitterVideoAdapter import TwitterVideoAdapter
+from sources.impl.YouTubeVideoAdapter import YouTubeVideoAdapter
+from sources.impl.FacebookVideoAdapter import FacebookVideoAdapter
+from sources.impl.InstagramReelAdapter import InstagramReelAdapter
+
+# Source (as used in the API paths and detection jobs) -> adapter, a new source only needs an entry here
+source_adapters = {
+    adapter.source: adapter
+    for adapter in (InstagramReelAdapter(), TwitterVideoAdapter(), YouTubeVideoAdapter(), FacebookVideoAdapter())
+}
@@ -0,0 +1,39 @@
+import os
+from ingest.Downloader import get_client
+from urllib.parse import urlparse, parse_qs
+from sources.SourceAdapter import SourceAdapter
+from config.detection import RESOLVER_TIMEOUT_SECONDS
+
+
+def get_facebook_share_id(url):
+    parsed_url = urlparse(url)
+    # facebook.com/watch/?v=<id> and video.php?v=<id> carry the id in the query string
+    video_id = parse_qs(parsed_url.query).get("v", [None])[0]
+    if video_id:
+        return video_id
+    unique_id = parsed_url.path.strip('/').split('/')[-1]
+    return unique_id or None
+
+
+class FacebookVideoAdapter(SourceAdapter):
+    source = "facebook"
+    label = "facebook video"
+    name = "Facebook video"
+    provider = "social-download-all-in-one"
+    url_prefixes = ("https://www.facebook.com/share",)
+
+    def canonicalize(self, url: str):
+        return get_facebook_share_id(url)
+
+    async def resolve(self, url: str):
+        callurl = f"https://social-download-all-in-one.p.rapidapi.com/v1/social/autolink"
+        headers = {
+            "x-rapidapi-host": os.getenv("YT_H"),
+            "x-rapidapi-key": os.getenv("RKEY")
+        }
+        data = await self.call_resolver(
+            url, lambda: get_client().post(callurl, json={"url": url}, headers=headers,
+                                           timeout=RESOLVER_TIMEOUT_SECONDS))
+        if data is None:
+            return None
+        return self.canonicalize(url), data["medias"]
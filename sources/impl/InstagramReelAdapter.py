@@ -0,0 +1,40 @@
+import os
+from urllib.parse import urlparse
+from ingest.Downloader import get_client
+from sources.SourceAdapter import SourceAdapter
+from config.detection import RESOLVER_TIMEOUT_SECONDS
+
+
+def get_instagram_shortcode(url):
+    parsed_url = urlparse(url)
+    if "instagram.com" not in parsed_url.netloc:
+        return None
+    segments = parsed_url.path.strip('/').split('/')
+    for i, segment in enumerate(segments[:-1]):
+        if segment in ("reel", "reels", "p", "tv"):
+            return segments[i + 1] or None
+    return None
+
+
+class InstagramReelAdapter(SourceAdapter):
+    source = "ig-reel"
+    label = "instagram reel"
+    name = "Instagram reel"
+    provider = "instagram-reels-downloader"
+    url_prefixes = ("https://www.instagram.com/reels", "https://www.instagram.com/p")
+    checks_extension = True
+
+    def canonicalize(self, url: str):
+        return get_instagram_shortcode(url)
+
+    async def resolve(self, url: str):
+        callurl = f"https://instagram-reels-downloader-api.p.rapidapi.com/download?url={url}"
+        headers = {
+            "x-rapidapi-host": os.getenv("IG_H"),
+            "x-rapidapi-key": os.getenv("RKEY")
+        }
+        data = await self.call_resolver(
+            url, lambda: get_client().get(callurl, headers=headers, timeout=RESOLVER_TIMEOUT_SECONDS))
+        if data is None:
+            return None
+        return data["data"]["shortcode"], data["data"]["medias"]
@@ -0,0 +1,40 @@
+import os
+from urllib.parse import urlparse
+from ingest.Downloader import get_client
+from sources.SourceAdapter import SourceAdapter
+from config.detection import RESOLVER_TIMEOUT_SECONDS
+
+
+def get_tweet_id(url):
+    parsed_url = urlparse(url)
+    if not any(host in parsed_url.netloc for host in ("twitter.com", "x.com")):
+        return None
+    segments = parsed_url.path.strip('/').split('/')
+    for i, segment in enumerate(segments[:-1]):
+        if segment == "status" and segments[i + 1].isdigit():
+            return segments[i + 1]
+    return None
+
+
+class TwitterVideoAdapter(SourceAdapter):
+    source = "twitter-video"
+    label = "twitter video"
+    name = "Twitter video"
+    provider = "twitter-video-and-image-downloader"
+    url_prefixes = ("https://x.com",)
+
+    def canonicalize(self, url: str):
+        return get_tweet_id(url)
+
+    async def resolve(self, url: str):
+        callurl = f"https://twitter-video-and-image-downloader.p.rapidapi.com/twitter?url={url}"
+        headers = {
+            "x-rapidapi-host": os.getenv("TWITTER_H"),
+            "x-rapidapi-key": os.getenv("RKEY")
+        }
+        data = await self.call_resolver(
+            url, lambda: get_client().get(callurl, headers=headers, timeout=RESOLVER_TIMEOUT_SECONDS))
+        if data is None:
+            return None
+        # The Twitter resolver only serves mp4
+        return data["id"], [{**media, "extension": "mp4"} for media in data["media"]]
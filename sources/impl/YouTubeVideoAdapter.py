@@ -0,0 +1,41 @@
+import os
+from ingest.Downloader import get_client
+from urllib.parse import urlparse, parse_qs
+from sources.SourceAdapter import SourceAdapter
+from config.detection import RESOLVER_TIMEOUT_SECONDS
+
+
+def get_youtube_video_id(url):
+    parsed_url = urlparse(url)
+    if "youtube.com" in parsed_url.netloc:
+        segments = parsed_url.path.strip('/').split('/')
+        if len(segments) == 2 and segments[0] in ("shorts", "embed", "live"):
+            return segments[1]
+        return parse_qs(parsed_url.query).get("v", [None])[0]
+    elif "youtu.be" in parsed_url.netloc:
+        return parsed_url.path.strip('/') or None
+    return None
+
+
+class YouTubeVideoAdapter(SourceAdapter):
+    source = "youtube-video"
+    label = "youtube video"
+    name = "YouTube video"
+    provider = "social-download-all-in-one"
+    url_prefixes = ("https://youtu.be",)
+
+    def canonicalize(self, url: str):
+        return get_youtube_video_id(url)
+
+    async def resolve(self, url: str):
+        callurl = f"https://social-download-all-in-one.p.rapidapi.com/v1/social/autolink"
+        headers = {
+            "x-rapidapi-host": os.getenv("YT_H"),
+            "x-rapidapi-key": os.getenv("RKEY")
+        }
+        data = await self.call_resolver(
+            url, lambda: get_client().post(callurl, json={"url": url}, headers=headers,
+                                           timeout=RESOLVER_TIMEOUT_SECONDS))
+        if data is None:
+            return None
+        return self.canonicalize(url), [{**media, "extension": media.get("ext")} for media in data["medias"]]
@@ -0,0 +1,53 @@
+"""
+Drains the detection_job table.
+
+Runs inside the API process (DETECT_JOB_WORKERS tasks started from the app lifespan) or standalone, any number of
+processes next to the API: python -m workers.DetectionWorker --concurrency 2
+Upload jobs point at files in UPLOAD_DIR, so standalone workers need the same UPLOAD_DIR as the API.
+"""
+import os
+import asyncio
+import argparse
+import traceback
+from config.database import SessionLocal
+from config.detection import DETECT_JOB_POLL_SECONDS
+from services.impl.DetectServiceImpl import warm_up_model
+from services.impl.DetectionJobServiceImpl import DetectionJobServiceImpl
+
+
+async def run_worker(poll_seconds: float = DETECT_JOB_POLL_SECONDS):
+    while True:
+        db = SessionLocal()
+        try:
+            processed = await DetectionJobServiceImpl(db).process_next_job()
+        except Exception:
+            traceback.print_exc()
+            processed = False
+        finally:
+            db.close()
+
+        if not processed:
+            await asyncio.sleep(poll_seconds)
+
+
+def start_workers(count: int):
+    return [asyncio.create_task(run_worker()) for _ in range(count)]
+
+
+async def stop_workers(tasks: list):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=1, help="jobs processed at the same time")
+    args = parser.parse_args()
+    os.makedirs(os.getenv("UPLOAD_DIR"), exist_ok=True)
+    warm_up_model()
+    await asyncio.gather(*start_workers(args.concurrency))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,156 @@
+"""
+Serves the API from several worker processes that share one copy of the model weights.
+
+The master imports the app, loads the face detector and the torch model once (like gunicorn --preload) and then
+forks the uvicorn workers, which all accept on the same listening socket. Forked workers share the weight pages
+copy-on-write and, since inference never writes to them, they stay shared. Every worker still runs the app
+lifespan, so the warm-up passes (and INFERENCE_WARMUP_BACKGROUND) happen per worker, on the preloaded model. A
+worker that dies is forked again from the master, without reloading anything.
+
+The master loads with a single torch thread and never runs inference: OpenMP thread pools do not survive a fork
+and a child using one started by its parent hangs. Each worker then uses TORCH_NUM_THREADS intra-op threads, or its
+share of the cores when that is 0. The onnxruntime backend starts its own thread pools when loading, so with
+INFERENCE_BACKEND=onnxruntime only the face detector is preloaded.
+
+Usage: python -m workers.PreforkServer [--workers 4] [--host 0.0.0.0] [--port 8000] [--no-preload]
+                                       [--memory-report-seconds 60]
+"""
+import os
+import gc
+import time
+import torch
+import signal
+import uvicorn
+import logging
+import argparse
+import warnings
+from uvicorn.importer import import_from_string
+from config.detection import INFERENCE_BACKEND, TORCH_NUM_THREADS
+from services.impl.DetectServiceImpl import get_face_detector, get_backend
+
+logger = logging.getLogger("uvicorn.error")
+
+
+def process_memory(pid: int):
+    """
+    Resident memory of a process in bytes: rss counts the pages shared with other processes in full, pss splits
+    them between their users (summed over processes it is the real footprint) and private only counts pages
+    nobody else maps.
+    """
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0]) * 1024
+    return {
+        "rss": fields.get("Rss", 0),
+        "pss": fields.get("Pss", 0),
+        "private": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def preload_models():
+    torch.set_num_threads(1)
+    get_face_detector()
+    if INFERENCE_BACKEND == "torch":
+        get_backend()
+    else:
+        warnings.warn(f"INFERENCE_BACKEND {INFERENCE_BACKEND} is loaded by every worker, only the face detector "
+                      f"is shared")
+
+
+def run_worker(config: uvicorn.Config, sock, threads: int):
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, signal.SIG_DFL)
+    torch.set_num_threads(threads)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(config: uvicorn.Config, sock, threads: int):
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(config, sock, threads)
+        except BaseException:
+            logger.exception("Worker failed")
+            code = 1
+        finally:
+            os._exit(code)
+    logger.info("Started worker [%d]", pid)
+    return pid
+
+
+def report_memory(workers: list):
+    master = process_memory(os.getpid())
+    logger.info("Master [%d] rss %.0f MB, pss %.0f MB", os.getpid(), master["rss"] / 2 ** 20, master["pss"] / 2 ** 20)
+    total_pss = master["pss"]
+    for pid in workers:
+        try:
+            memory = process_memory(pid)
+        except OSError:
+            continue
+        total_pss += memory["pss"]
+        logger.info("Worker [%d] rss %.0f MB, pss %.0f MB, private %.0f MB", pid, memory["rss"] / 2 ** 20,
+                    memory["pss"] / 2 ** 20, memory["private"] / 2 ** 20)
+    logger.info("Total pss %.0f MB", total_pss / 2 ** 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--app", default="Main:app")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--no-preload", action="store_true", help="let every worker load its own model")
+    parser.add_argument("--memory-report-seconds", type=float, default=0, help="log per-worker memory, 0 is off")
+    args = parser.parse_args()
+
+    config = uvicorn.Config(args.app, host=args.host, port=args.port)
+    import_from_string(args.app)
+    if not args.no_preload:
+        preload_models()
+    # Keeps the objects loaded so far out of the garbage collector, whose bookkeeping writes would unshare them
+    gc.freeze()
+    sock = config.bind_socket()
+    threads = TORCH_NUM_THREADS or max(1, (os.cpu_count() or 1) // args.workers)
+
+    workers = []
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    workers.extend(spawn_worker(config, sock, threads) for _ in range(args.workers))
+    next_report = time.monotonic() + args.memory_report_seconds
+
+    while workers:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid == 0:
+            if args.memory_report_seconds > 0 and time.monotonic() >= next_report:
+                report_memory(workers)
+                next_report = time.monotonic() + args.memory_report_seconds
+            time.sleep(0.5)
+            continue
+        if pid not in workers:
+            continue
+        workers.remove(pid)
+        if not stopping:
+            logger.warning("Worker [%d] exited with status %d, starting a new one", pid,
+                           os.waitstatus_to_exitcode(status))
+            time.sleep(1)
+            workers.append(spawn_worker(config, sock, threads))
+    sock.close()
+
+
+if __name__ == "__main__":
+    main()